@@ -0,0 +1,74 @@
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+try:
+    import torch
+except ImportError:  # sentence-transformers가 있으면 보통 함께 설치됨
+    torch = None
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:  # optimum[onnxruntime]는 선택 사항 (onnx 백엔드에서만 필요)
+    ORTModelForFeatureExtraction = None
+    AutoTokenizer = None
+
+# ---------------------------------------------------------
+# 임베딩 백엔드 (EMBEDDING_BACKEND로 선택)
+#   torch : SentenceTransformer fp32 (기본값, 기준 모델)
+#   int8  : Linear 레이어 동적 양자화 (torch.quantization.quantize_dynamic, CPU 전용)
+#   onnx  : ONNX Runtime (optimum으로 export, EMBEDDING_ONNX_PATH가 있으면 그 경로를 로드)
+# 모든 백엔드는 encode(texts, batch_size, convert_to_numpy) → (n, 768) 배열로 같은 인터페이스를 가진다.
+# ---------------------------------------------------------
+
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx")
+
+def load_torch(model_name: str) -> SentenceTransformer:
+    return SentenceTransformer(model_name)
+
+def load_int8(model_name: str) -> SentenceTransformer:
+    if torch is None:
+        raise RuntimeError("int8 백엔드는 torch가 필요합니다.")
+    model = SentenceTransformer(model_name, device="cpu")
+    # Transformer 본체의 Linear 가중치만 int8로 (활성값은 실행 시 동적 양자화)
+    model[0].auto_model = torch.quantization.quantize_dynamic(
+        model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return model
+
+class OnnxEncoder:
+    """ONNX Runtime 세션 + mean pooling (ko-sbert-nli의 SentenceTransformer 풀링과 동일)"""
+
+    def __init__(self, model_name: str, onnx_path: str = None, max_seq_length: int = 128):
+        if ORTModelForFeatureExtraction is None:
+            raise RuntimeError("onnx 백엔드는 optimum[onnxruntime] 패키지가 필요합니다. (uv add 'optimum[onnxruntime]')")
+        source = onnx_path or model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(source)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(source, export=onnx_path is None)
+        self.max_seq_length = max_seq_length
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[i:i + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np"
+            )
+            hidden = self.model(**tokens).last_hidden_state
+            hidden = hidden.numpy() if hasattr(hidden, "numpy") else np.asarray(hidden)
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            outputs.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        vectors = np.concatenate(outputs).astype(np.float32) if outputs else np.zeros((0, 768), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+def load_backend(backend: str, model_name: str, onnx_path: str = None):
+    if backend == "torch":
+        return load_torch(model_name)
+    if backend == "int8":
+        return load_int8(model_name)
+    if backend == "onnx":
+        return OnnxEncoder(model_name, onnx_path)
+    raise ValueError(f"지원하지 않는 임베딩 백엔드: {backend} (가능: {', '.join(EMBEDDING_BACKENDS)})")
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models import EmbeddingCache
+from ai_models.sbert import model_manager
+from ai_models.embedding_service import EmbeddingService
+
+load_dotenv()
+
+# ---------------------------------------------------------
+# 임베딩 캐시 (프로세스 내 LRU → embedding_cache 테이블 → 모델 인코딩 순으로 조회)
+# 키는 (모델 이름, 정규화 텍스트 sha256). "수학 공부"처럼 반복되는 제목은
+# 한 번만 인코딩하고 이후에는 캐시에서 꺼내 쓴다.
+# ---------------------------------------------------------
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))     # LRU 최대 항목 수
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC + 연속 공백 정리 (같은 의미의 입력이 같은 키를 갖도록)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+def text_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class EmbeddingCacheStore:
+    """LRU + DB 2단 임베딩 캐시 (인코딩은 EmbeddingService에 위임)"""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.lru_hits = 0
+        self.db_hits = 0
+        self.encoded = 0
+
+    # ------------------------------
+    # LRU
+    # ------------------------------
+    def _lru_get(self, key):
+        with self._lock:
+            vec = self._data.get(key)
+            if vec is not None:
+                self._data.move_to_end(key)
+                self.lru_hits += 1
+            return vec
+
+    def _lru_put(self, key, vec):
+        with self._lock:
+            self._data[key] = vec
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _count(self, name: str, amount: int):
+        if amount:
+            with self._lock:
+                setattr(self, name, getattr(self, name) + amount)
+
+    # ------------------------------
+    # 조회 단계
+    # ------------------------------
+    def _lookup_lru(self, texts: List[str]):
+        """LRU에서 먼저 찾고, DB에서 찾아야 할 해시 집합을 돌려준다"""
+        model_name = model_manager.model_name
+        normalized = [normalize_text(t) for t in texts]
+        hashes = [text_hash(n) for n in normalized]
+        found = {}
+
+        for h in hashes:
+            if h not in found:
+                vec = self._lru_get((model_name, h))
+                if vec is not None:
+                    found[h] = vec
+
+        missing = {h for h in hashes if h not in found}
+        return normalized, hashes, found, missing
+
+    def _db_query(self, missing: set):
+        return select(EmbeddingCache.text_hash, EmbeddingCache.embedding).filter(
+            EmbeddingCache.model_name == model_manager.model_name,
+            EmbeddingCache.text_hash.in_(missing)
+        )
+
+    def _apply_db_rows(self, found: dict, rows):
+        model_name = model_manager.model_name
+        for h, embedding in rows:
+            vec = np.asarray(embedding, dtype=np.float32)
+            found[h] = vec
+            self._lru_put((model_name, h), vec)
+        self._count("db_hits", len(rows))
+
+    @staticmethod
+    def _pending(normalized: list, hashes: list, found: dict) -> OrderedDict:
+        """캐시 어디에도 없는 (해시 → 정규화 텍스트), 입력 순서 유지"""
+        pending = OrderedDict()
+        for n, h in zip(normalized, hashes):
+            if h not in found:
+                pending[h] = n
+        return pending
+
+    def _store_rows(self, found: dict, pending: OrderedDict, vectors) -> list:
+        model_name = model_manager.model_name
+        rows = []
+        for (h, _), vec in zip(pending.items(), vectors):
+            vec = np.asarray(vec, dtype=np.float32)
+            found[h] = vec
+            self._lru_put((model_name, h), vec)
+            rows.append({"model_name": model_name, "text_hash": h, "embedding": vec.tolist()})
+        self._count("encoded", len(rows))
+        return rows
+
+    @staticmethod
+    def _insert_stmt(rows: list):
+        # 같은 문장을 다른 요청이 먼저 저장했으면 그대로 둔다 (commit은 호출한 쪽에서)
+        return insert(EmbeddingCache).values(rows).on_conflict_do_nothing()
+
+    # ------------------------------
+    # 공개 API: 텍스트 목록 → 임베딩 리스트(list[float]) 목록
+    # ------------------------------
+    def embed(self, db: Session, embedder: EmbeddingService, texts: List[str]) -> List[list]:
+        """동기 엔드포인트용 (캐시에 없는 문장만 한 번에 인코딩)"""
+        normalized, hashes, found, missing = self._lookup_lru(texts)
+        if missing:
+            self._apply_db_rows(found, db.execute(self._db_query(missing)).all())
+        pending = self._pending(normalized, hashes, found)
+        if pending:
+            rows = self._store_rows(found, pending, embedder.encode(list(pending.values())))
+            db.execute(self._insert_stmt(rows))
+        return [found[h].tolist() for h in hashes]
+
+    async def aembed(self, db: AsyncSession, embedder: EmbeddingService, texts: List[str]) -> List[list]:
+        """async 엔드포인트용 (AsyncSession 조회/저장, 인코딩은 임베딩 스레드에서 기다리기만 함)"""
+        normalized, hashes, found, missing = self._lookup_lru(texts)
+        if missing:
+            self._apply_db_rows(found, (await db.execute(self._db_query(missing))).all())
+        pending = self._pending(normalized, hashes, found)
+        if pending:
+            rows = self._store_rows(found, pending, await embedder.aencode(list(pending.values())))
+            await db.execute(self._insert_stmt(rows))
+        return [found[h].tolist() for h in hashes]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lru_hits, db_hits, encoded, size = self.lru_hits, self.db_hits, self.encoded, len(self._data)
+        total = lru_hits + db_hits + encoded
+        return {
+            "size": size,
+            "lru_hits": lru_hits,
+            "db_hits": db_hits,
+            "encoded": encoded,
+            "hit_rate": round((lru_hits + db_hits) / total, 4) if total else 0.0,
+        }
+
+# 전역 임베딩 캐시 인스턴스
+embedding_cache = EmbeddingCacheStore()
@@ -0,0 +1,238 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from ai_models.sbert import model_manager, STATE_FAILED
+from utils.metrics import LatencyHistogram
+
+load_dotenv()
+
+# ---------------------------------------------------------
+# 임베딩 서비스 (SBERT 인코딩 전담 스레드 + 마이크로 배치)
+# 여러 요청이 동시에 들어오면 짧게 모아서 model.encode 한 번으로 처리하고,
+# 결과는 요청별로 나눠 돌려준다. 이벤트 루프와 요청 스레드는 인코딩을 기다리기만 한다.
+# ---------------------------------------------------------
+
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))          # 한 번에 인코딩할 최대 문장 수
+EMBEDDING_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5"))     # 배치를 모으기 위해 기다리는 최대 시간 (ms)
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "30"))            # 동기 호출 대기 한도 (초)
+EMBEDDING_READY_WAIT = float(os.getenv("EMBEDDING_READY_WAIT", "3"))       # 모델 준비 전 요청이 기다리는 최대 시간 (초)
+
+# 배치 크기 분포 (문장 수 기준 상한)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+class _EncodeRequest:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class EmbeddingMetrics:
+    """배치 크기 / 대기시간 / 인코딩 시간 (응답한 워커 프로세스 기준 누적)"""
+
+    def __init__(self):
+        self.queue_wait = LatencyHistogram()
+        self.encode_time = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch_size = 0
+        self.batch_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    def observe_batch(self, requests: int, texts: int):
+        idx = next((i for i, b in enumerate(BATCH_SIZE_BUCKETS) if texts <= b), len(BATCH_SIZE_BUCKETS))
+        with self._lock:
+            self.requests += requests
+            self.texts += texts
+            self.batches += 1
+            self.batch_sizes[idx] += 1
+            if texts > self.max_batch_size:
+                self.max_batch_size = texts
+
+    def incr_errors(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            sizes = {f"le_{b}": c for b, c in zip(BATCH_SIZE_BUCKETS, self.batch_sizes)}
+            sizes["le_inf"] = self.batch_sizes[-1]
+            result = {
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "errors": self.errors,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "batch_sizes": sizes,
+            }
+        result["queue_wait"] = self.queue_wait.snapshot()
+        result["encode_time"] = self.encode_time.snapshot()
+        return result
+
+class EmbeddingService:
+    """
+    model_manager의 임베딩 모델을 전담 스레드에서 실행하는 인코딩 서비스.
+    encode(동기) / aencode(비동기) 모두 문장 리스트를 받아 (n, dim) float32 배열을 돌려준다.
+    """
+
+    def __init__(self, max_batch: int = EMBEDDING_MAX_BATCH, max_wait_ms: float = EMBEDDING_MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = EmbeddingMetrics()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopping = threading.Event()
+
+    # ------------------------------
+    # 수명 주기 (lifespan에서 호출)
+    # ------------------------------
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="embedding-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------
+    # 인코딩 API
+    # ------------------------------
+    def submit(self, texts: List[str]) -> Future:
+        if not self.running:
+            raise RuntimeError("임베딩 서비스가 시작되지 않았습니다.")
+        request = _EncodeRequest(list(texts))
+        if not request.texts:
+            request.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return request.future
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """동기 엔드포인트(스레드풀)용: 배치 처리가 끝날 때까지 대기"""
+        return self.submit(texts).result(timeout=EMBEDDING_TIMEOUT)
+
+    async def aencode(self, texts: List[str]) -> np.ndarray:
+        """async 엔드포인트용: 이벤트 루프를 막지 않고 결과를 기다림"""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def encode_one(self, text: str) -> list:
+        return self.encode([text])[0].tolist()
+
+    async def aencode_one(self, text: str) -> list:
+        return (await self.aencode([text]))[0].tolist()
+
+    # ------------------------------
+    # 전담 스레드
+    # ------------------------------
+    def _collect(self, first: _EncodeRequest) -> list:
+        """첫 요청 이후 max_wait 동안(또는 max_batch가 찰 때까지) 들어온 요청을 모은다"""
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)   # 종료 신호는 이번 배치 처리 후 다시 꺼낸다
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                if self._stopping.is_set():
+                    break
+                continue
+
+            batch = [r for r in self._collect(first) if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for request in batch:
+                self.metrics.queue_wait.observe((started - request.enqueued_at) * 1000)
+
+            texts = [text for request in batch for text in request.texts]
+            try:
+                model = model_manager.embedding_model
+                if model is None:
+                    raise RuntimeError("임베딩 모델이 로드되지 않았습니다.")
+                vectors = model.encode(texts, batch_size=self.max_batch, convert_to_numpy=True)
+            except Exception as e:
+                self.metrics.incr_errors()
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            self.metrics.encode_time.observe((time.perf_counter() - started) * 1000)
+            self.metrics.observe_batch(len(batch), len(texts))
+
+            offset = 0
+            for request in batch:
+                n = len(request.texts)
+                request.future.set_result(vectors[offset:offset + n])
+                offset += n
+
+        # 종료 시 남은 요청은 실패 처리
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("임베딩 서비스가 종료되었습니다."))
+
+# 전역 임베딩 서비스 인스턴스
+embedding_service = EmbeddingService()
+
+def get_embedding_service() -> EmbeddingService:
+    """
+    FastAPI Dependency로 사용할 임베딩 서비스 getter
+    모델이 아직 로드 중이면 EMBEDDING_READY_WAIT초까지 기다린 뒤, 그래도 안 되면 503 (warming up)
+
+    Usage:
+        @router.post("/endpoint")
+        async def endpoint(embedder: EmbeddingService = Depends(get_embedding_service)):
+            vectors = await embedder.aencode(["title", "description"])
+    """
+    if not model_manager.wait_ready(EMBEDDING_READY_WAIT):
+        status = model_manager.status()
+        if status["state"] == STATE_FAILED:
+            raise HTTPException(status_code=503, detail=f"임베딩 모델 로드에 실패했습니다: {status['error']}")
+        raise HTTPException(
+            status_code=503,
+            detail="AI 플래너 모델을 준비하고 있습니다. 잠시 후 다시 시도해주세요. (warming up)",
+            headers={"Retry-After": "10"}
+        )
+    if not embedding_service.running:
+        raise RuntimeError("임베딩 서비스가 시작되지 않았습니다.")
+    return embedding_service
@@ -0,0 +1,268 @@
+import asyncio
+import os
+import random
+import re
+import threading
+from typing import Optional
+import numpy as np
+from dotenv import load_dotenv
+from ai_models.sbert import model_manager
+from ai_models.embedding_service import EmbeddingService
+
+load_dotenv()
+
+# ---------------------------------------------------------
+# 플래너 라우터 fast-path (search / direct 판단을 로컬에서)
+# 1) 규칙: 인사/감사, 입력 전체가 "전체 삭제"인 경우 → direct
+# 2) 이미 로드된 SBERT 임베딩으로 라벨 예시 문장의 클래스 중심(centroid)과 비교
+# 확신이 부족하거나 날짜/지시어처럼 라우터 LLM이 뽑아야 할 정보가 있으면 LLM 라우터로 넘긴다.
+# ---------------------------------------------------------
+
+INTENT_FAST_PATH = os.getenv("INTENT_FAST_PATH", "true").lower() == "true"
+INTENT_MIN_SIMILARITY = float(os.getenv("INTENT_MIN_SIMILARITY", "0.45"))   # 가장 가까운 중심과의 최소 코사인 유사도
+INTENT_MIN_MARGIN = float(os.getenv("INTENT_MIN_MARGIN", "0.08"))           # 1, 2위 중심 유사도 차이 최소값
+INTENT_SHADOW_RATE = float(os.getenv("INTENT_SHADOW_RATE", "0.1"))          # fast-path 결과 중 LLM 라우터로 일치 여부를 확인할 비율
+
+DECISION_SEARCH = "search"
+DECISION_DIRECT = "direct"
+
+# 라벨 예시 (라우터 프롬프트의 판단 기준과 같은 의미)
+INTENT_EXAMPLES = {
+    DECISION_SEARCH: [
+        "수학 공부 언제 했지?",
+        "가장 오래 공부한 일정 알려줘",
+        "영어 관련 일정 찾아줘",
+        "토익 공부한 기록 있어?",
+        "코딩 공부 몇 시간 했는지 알려줘",
+        "프로젝트 회의가 언제였는지 찾아줘",
+        "독서 일정 보여줘",
+        "운동 일정이 언제였지?",
+        "내가 제일 많이 한 공부가 뭐야?",
+        "과학 공부 일정 좀 찾아봐",
+        "면접 준비 일정 어디 있었지",
+        "스터디 모임 기록 보여줘",
+    ],
+    DECISION_DIRECT: [
+        "수학 공부 일정 추가해줘",
+        "영어 공부 일정 만들어줘",
+        "코딩 공부 일정 두 개 잡아줘",
+        "독서 일정 빨간색으로 넣어줘",
+        "랜덤으로 일정 5개 생성해줘",
+        "운동 일정 하나 등록해줘",
+        "오늘 할 일 추천해줘",
+        "공부 잘하는 방법 알려줘",
+        "집중이 안 될 때 어떻게 해?",
+        "너는 누구야?",
+        "좋아 그렇게 해줘",
+        "응 알겠어",
+    ],
+}
+
+# 규칙 (확실한 경우만)
+_GREETING = re.compile(r"^\s*(안녕|하이|ㅎㅇ|hello\b|hi\b|반가워|고마워|감사|ㄱㅅ|땡큐|thank)", re.IGNORECASE)
+# 입력 전체가 "(일정) 전체/모든/전부 (일정) 삭제(해줘)" 형태일 때만 (기간/제목이 붙은 부분 삭제는 제외)
+_DELETE_ALL = re.compile(
+    r"^\s*(일정\s*(을|를)?\s*)?(전체|모든|모두|전부|싹\s*다)\s*(일정)?\s*(을|를|다)?\s*"
+    r"(삭제|지워|지우|없애)\s*(해\s*)?(줘|주세요|줘요|해|버려|해\s*줘)?\s*[.!~]*\s*$"
+)
+_NEGATION = re.compile(r"(하지\s*마|말아|않|안\s*돼|취소|잠깐)")
+# 수정/삭제는 대상이 모호하면 검색이 필요하므로 LLM 라우터가 판단 (전체 삭제 규칙만 예외)
+_MODIFY_HINT = re.compile(r"(삭제|지워|지우|없애|수정|바꿔|바꾸|변경|옮겨|옮기|미뤄|미루|당겨|늘려|줄여)")
+# 새 일정 생성 (날짜가 있어도 검색이 필요 없음)
+_CREATE_HINT = re.compile(r"(추가|만들|생성|넣어|등록|잡아)")
+# 라우터 LLM이 date_from/date_to를 뽑아야 하는 날짜 표현
+_DATE_HINT = re.compile(r"(오늘|어제|그제|그저께|내일|모레|이번|지난|저번|다음|주말|평일|요일|\d+\s*(월|일|주))")
+# 이전 대화를 가리키는 표현 (대화 기록을 보는 LLM이 판단)
+_REFERENCE_HINT = re.compile(r"(그거|그것|그 일정|아까|방금|위에|앞에서|이전)")
+GREETING_MAX_LENGTH = 15
+
+# fast-path search 검색어: 입력 문장에서 질문/요청 표현을 빼고 키워드만 남긴다
+# (문장 전체를 넘기면 트라이그램 word_similarity / %> 가 거의 맞지 않아 벡터 검색만 남음)
+_QUERY_STOPWORDS = {
+    "언제", "어디", "뭐", "뭐야", "뭐였지", "무슨", "어떤", "몇", "얼마나", "가장", "제일", "많이", "오래", "좀", "혹시",
+    "내가", "제가", "나", "내", "한", "했던", "하는", "일정", "기록", "관련", "관련된", "시간", "했는지", "있는지",
+}
+_QUERY_PREDICATE = re.compile(
+    r"^(알려|찾아|보여|말해|검색|확인|있어|있었|있나|없어|했|하였|였|이었)"
+    r"|(했지|했어|했니|했나|했는지|였지|였어|였는지|인지|이야|야|니)$"
+)
+_QUERY_JOSA = ("에서", "으로", "이랑", "까지", "부터", "에게", "을", "를", "이", "가", "은", "는", "에", "의", "도", "로", "와", "과", "랑")
+_QUERY_ATTRIBUTIVE = ("했던", "하던", "하는", "한", "할")
+
+def _strip_suffix(token: str, suffixes: tuple) -> str:
+    for suffix in suffixes:
+        # 한 글자 명사가 잘리지 않도록 남는 부분이 두 글자 이상일 때만
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)]
+    return token
+
+def keyword_query(user_input: str) -> str:
+    """질문 문장 → 어휘 검색용 키워드 ("수학 공부 언제 했지?" → "수학 공부"), 남는 게 없으면 빈 문자열"""
+    keywords = []
+    for token in re.sub(r"[^\w\s]", " ", user_input or "").split():
+        if token in _QUERY_STOPWORDS or _QUERY_PREDICATE.search(token):
+            continue
+        token = _strip_suffix(_strip_suffix(token, _QUERY_JOSA), _QUERY_ATTRIBUTIVE)
+        if token not in _QUERY_STOPWORDS:
+            keywords.append(token)
+    return " ".join(keywords)
+
+class IntentPrediction:
+    __slots__ = ("decision", "confidence", "source", "vector")
+
+    def __init__(self, decision: Optional[str], confidence: float, source: str, vector: Optional[list] = None):
+        self.decision = decision
+        self.confidence = confidence
+        self.source = source            # "rule" / "centroid" / "fallback"
+        self.vector = vector            # 입력 문장 임베딩 (fast-path search의 벡터 검색에 재사용)
+
+    @property
+    def confident(self) -> bool:
+        return self.source != "fallback"
+
+    def router_result(self, user_input: str) -> dict:
+        """LLM 라우터 응답과 같은 형태 (fast-path search는 입력에서 뽑은 키워드를 검색어로 사용)"""
+        return {
+            "decision": self.decision,
+            "search_query": keyword_query(user_input) if self.decision == DECISION_SEARCH else "",
+            "date_from": None,
+            "date_to": None,
+        }
+
+class IntentMetrics:
+    """fast-path 적중률, LLM 라우터와의 일치율 (응답한 워커 프로세스 기준 누적)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.rule_hits = 0
+        self.centroid_hits = 0
+        self.llm_calls = 0
+        # fast-path 결과를 LLM 라우터로 샘플 검증
+        self.shadow_compared = 0
+        self.shadow_agreed = 0
+        # 확신 부족으로 LLM을 부른 경우, 로컬 예측이 맞았는지 (임계값 조정용)
+        self.fallback_compared = 0
+        self.fallback_agreed = 0
+
+    def observe(self, source: str):
+        with self._lock:
+            self.total += 1
+            if source == "rule":
+                self.rule_hits += 1
+            elif source == "centroid":
+                self.centroid_hits += 1
+            else:
+                self.llm_calls += 1
+
+    def observe_agreement(self, shadow: bool, agreed: bool):
+        prefix = "shadow" if shadow else "fallback"
+        with self._lock:
+            setattr(self, f"{prefix}_compared", getattr(self, f"{prefix}_compared") + 1)
+            if agreed:
+                setattr(self, f"{prefix}_agreed", getattr(self, f"{prefix}_agreed") + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hits = self.rule_hits + self.centroid_hits
+            return {
+                "total": self.total,
+                "rule_hits": self.rule_hits,
+                "centroid_hits": self.centroid_hits,
+                "llm_calls": self.llm_calls,
+                "fast_path_rate": round(hits / self.total, 4) if self.total else 0.0,
+                "shadow_compared": self.shadow_compared,
+                "shadow_agreement": round(self.shadow_agreed / self.shadow_compared, 4) if self.shadow_compared else None,
+                "fallback_compared": self.fallback_compared,
+                "fallback_agreement": round(self.fallback_agreed / self.fallback_compared, 4) if self.fallback_compared else None,
+            }
+
+class IntentClassifier:
+    """규칙 + SBERT nearest-centroid 라우터 (워커 프로세스당 하나, 중심은 모델별로 처음 쓸 때 계산)"""
+
+    def __init__(self, examples: dict = INTENT_EXAMPLES):
+        self.examples = examples
+        self.metrics = IntentMetrics()
+        self._labels = list(examples)
+        self._centroids = None          # (클래스 수, dim), 정규화됨
+        self._centroid_model = None
+        self._lock = None               # 이벤트 루프 안에서 처음 쓸 때 생성
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    async def _ensure_centroids(self, embedder: EmbeddingService):
+        model_name = model_manager.model_name
+        if self._centroids is not None and self._centroid_model == model_name:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._centroids is not None and self._centroid_model == model_name:
+                return
+            texts = [text for label in self._labels for text in self.examples[label]]
+            vectors = self._normalize(np.asarray(await embedder.aencode(texts), dtype=np.float32))
+            centroids, offset = [], 0
+            for label in self._labels:
+                n = len(self.examples[label])
+                centroids.append(vectors[offset:offset + n].mean(axis=0))
+                offset += n
+            self._centroids = self._normalize(np.stack(centroids))
+            self._centroid_model = model_name
+
+    @staticmethod
+    def _rule(text: str) -> Optional[str]:
+        if _DELETE_ALL.search(text) and not _NEGATION.search(text) and not _DATE_HINT.search(text):
+            return DECISION_DIRECT
+        if len(text) <= GREETING_MAX_LENGTH and _GREETING.search(text) and not _DATE_HINT.search(text):
+            return DECISION_DIRECT
+        return None
+
+    async def classify(self, embedder: EmbeddingService, user_input: str) -> IntentPrediction:
+        text = (user_input or "").strip()
+        if not INTENT_FAST_PATH or not text:
+            prediction = IntentPrediction(None, 0.0, "fallback")
+            self.metrics.observe(prediction.source)
+            return prediction
+
+        decision = self._rule(text)
+        if decision is not None:
+            prediction = IntentPrediction(decision, 1.0, "rule")
+            self.metrics.observe(prediction.source)
+            return prediction
+
+        await self._ensure_centroids(embedder)
+        vector = (await embedder.aencode([text]))[0]
+        similarities = self._centroids @ self._normalize(np.asarray(vector, dtype=np.float32))
+        order = np.argsort(similarities)[::-1]
+        best, second = float(similarities[order[0]]), float(similarities[order[1]])
+        decision = self._labels[int(order[0])]
+
+        confident = best >= INTENT_MIN_SIMILARITY and best - second >= INTENT_MIN_MARGIN
+        # 수정/삭제 요청은 대상 검색 여부를 LLM 라우터가 판단
+        if _MODIFY_HINT.search(text):
+            confident = False
+        # 날짜 범위 / 이전 대화 참조는 LLM 라우터만 뽑을 수 있다 (날짜가 붙은 새 일정 생성은 예외)
+        if (_DATE_HINT.search(text) or _REFERENCE_HINT.search(text)) and not (
+            decision == DECISION_DIRECT and _CREATE_HINT.search(text) and not _REFERENCE_HINT.search(text)
+        ):
+            confident = False
+
+        prediction = IntentPrediction(decision, round(best - second, 4), "centroid" if confident else "fallback",
+                                      vector.tolist())
+        self.metrics.observe(prediction.source)
+        return prediction
+
+    def record_llm_decision(self, prediction: IntentPrediction, router_res: dict, shadow: bool = False):
+        if prediction.decision is None:
+            return
+        self.metrics.observe_agreement(shadow, prediction.decision == router_res.get("decision", DECISION_DIRECT))
+
+    @staticmethod
+    def should_shadow() -> bool:
+        return INTENT_SHADOW_RATE > 0 and random.random() < INTENT_SHADOW_RATE
+
+# 전역 인텐트 분류기 (플래너 라우터 fast-path)
+intent_classifier = IntentClassifier()
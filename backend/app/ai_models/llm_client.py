@@ -0,0 +1,212 @@
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import JsonOutputParser
+from utils.metrics import LatencyHistogram
+
+load_dotenv()
+
+# ---------------------------------------------------------
+# LLM 클라이언트 관리 (플래너용 Copilot 토큰 + ChatOpenAI + 프롬프트 체인)
+# - 교환한 Copilot 토큰은 만료 직전까지 재사용하고, refresh_in이 지나면 백그라운드에서 미리 갱신
+# - HTTP 커넥션 풀(httpx)과 ChatOpenAI / 체인은 토큰이 바뀔 때만 다시 만든다
+# ---------------------------------------------------------
+
+COPILOT_TOKEN_URL = "https://api.github.com/copilot_internal/v2/token"
+COPILOT_HEADERS = {
+    "Editor-Version": "vscode/1.85.0",
+    "Editor-Plugin-Version": "copilot/1.143.0",
+    "User-Agent": "GitHubCopilot/1.143.0"
+}
+LLM_MODEL = os.getenv("PLANNER_LLM_MODEL", "gpt-4.1")
+TOKEN_EXPIRY_MARGIN = 120       # 만료 이 시간(초) 전부터는 만료된 것으로 보고 새로 받는다
+TOKEN_DEFAULT_TTL = 25 * 60     # 응답에 만료 시각이 없을 때 가정하는 유효 시간 (초)
+
+# 토큰 교환 / LLM 호출 지연시간 버킷 (ms)
+LLM_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 3000, 5000, 10000, 20000, 60000)
+
+class LLMMetrics:
+    """토큰 갱신 횟수/지연시간, 체인별 LLM 호출 지연시간 (응답한 워커 프로세스 기준 누적)"""
+
+    def __init__(self):
+        self.token_refresh = LatencyHistogram(LLM_BUCKETS_MS)
+        self.calls = defaultdict(lambda: LatencyHistogram(LLM_BUCKETS_MS))
+        self._lock = threading.Lock()
+        self.token_hits = 0
+        self.token_refreshes = 0
+        self.background_refreshes = 0
+        self.token_failures = 0
+        self.call_errors = defaultdict(int)
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def call_histogram(self, chain: str) -> LatencyHistogram:
+        with self._lock:
+            return self.calls[chain]
+
+    def call_failed(self, chain: str):
+        with self._lock:
+            self.call_errors[chain] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = dict(self.calls)
+            errors = dict(self.call_errors)
+            counters = {
+                "token_hits": self.token_hits,
+                "token_refreshes": self.token_refreshes,
+                "background_refreshes": self.background_refreshes,
+                "token_failures": self.token_failures,
+            }
+        counters["token_refresh_latency"] = self.token_refresh.snapshot()
+        counters["llm_calls"] = {
+            chain: {**hist.snapshot(), "errors": errors.get(chain, 0)} for chain, hist in calls.items()
+        }
+        return counters
+
+class LLMClientManager:
+    """
+    플래너 LLM 클라이언트 관리자 (워커 프로세스당 하나)
+    체인은 register_chain(이름, 프롬프트)로 한 번 등록해 두고 await chain(이름)으로 꺼내 쓴다.
+    """
+
+    def __init__(self, github_token: str, base_url: str):
+        self.github_token = github_token
+        self.base_url = base_url
+        self.metrics = LLMMetrics()
+
+        self._token = None
+        self._expires_at = 0.0          # time.time() 기준
+        self._refresh_at = 0.0          # 이 시각이 지나면 백그라운드 갱신
+        self._refresh_lock = None       # 이벤트 루프 안에서 처음 쓸 때 생성
+        self._background_task = None
+
+        self._prompts = {}
+        self._llm = None
+        self._llm_token = None
+        self._chains = {}
+
+        # 커넥션 풀 공유 (토큰 교환 + OpenAI 호환 API 호출)
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        self._http = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0), limits=limits)
+        self._http_sync = httpx.Client(timeout=httpx.Timeout(60.0, connect=10.0), limits=limits)
+
+    # ------------------------------
+    # Copilot 토큰
+    # ------------------------------
+    def _token_valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - TOKEN_EXPIRY_MARGIN
+
+    async def _fetch_token(self):
+        start = time.perf_counter()
+        try:
+            response = await self._http.get(
+                COPILOT_TOKEN_URL,
+                headers={"Authorization": f"token {self.github_token}", **COPILOT_HEADERS}
+            )
+        except httpx.HTTPError as e:
+            self.metrics.incr("token_failures")
+            raise Exception(f"토큰 발급 실패: {e}") from e
+        finally:
+            self.metrics.token_refresh.observe((time.perf_counter() - start) * 1000)
+
+        if response.status_code != 200:
+            self.metrics.incr("token_failures")
+            raise Exception(f"토큰 발급 실패: {response.status_code} {response.text}")
+
+        data = response.json()
+        now = time.time()
+        self._token = data.get("token")
+        self._expires_at = float(data.get("expires_at") or now + TOKEN_DEFAULT_TTL)
+        refresh_in = data.get("refresh_in")
+        self._refresh_at = now + refresh_in if refresh_in else self._expires_at - TOKEN_EXPIRY_MARGIN * 2
+        self.metrics.incr("token_refreshes")
+
+    async def _refresh(self, force: bool = False):
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            # 기다리는 동안 다른 요청이 이미 갱신했으면 그대로 사용
+            if not force and self._token_valid() and time.time() < self._refresh_at:
+                return
+            await self._fetch_token()
+
+    async def _refresh_in_background(self):
+        try:
+            await self._refresh()
+            self.metrics.incr("background_refreshes")
+        except Exception as e:
+            print(f"[LLM] 백그라운드 토큰 갱신 실패: {e}")
+
+    async def get_token(self) -> str:
+        if self._token_valid():
+            self.metrics.incr("token_hits")
+            if time.time() >= self._refresh_at and (self._background_task is None or self._background_task.done()):
+                # 아직 유효하므로 응답은 기존 토큰으로, 갱신은 뒤에서
+                self._background_task = asyncio.create_task(self._refresh_in_background())
+            return self._token
+        await self._refresh()
+        return self._token
+
+    # ------------------------------
+    # ChatOpenAI / 체인
+    # ------------------------------
+    def register_chain(self, name: str, prompt):
+        self._prompts[name] = prompt
+        self._chains.pop(name, None)
+
+    def _build_llm(self, token: str) -> ChatOpenAI:
+        return ChatOpenAI(
+            api_key=token,
+            model=LLM_MODEL,
+            base_url=self.base_url,
+            temperature=0,
+            default_headers={"Authorization": f"Bearer {token}", **COPILOT_HEADERS},
+            http_client=self._http_sync,
+            http_async_client=self._http,
+        )
+
+    async def get_llm(self) -> ChatOpenAI:
+        token = await self.get_token()
+        if self._llm is None or self._llm_token != token:
+            self._llm = self._build_llm(token)
+            self._llm_token = token
+            self._chains = {}
+        return self._llm
+
+    async def chain(self, name: str):
+        llm = await self.get_llm()
+        chain = self._chains.get(name)
+        if chain is None:
+            chain = self._prompts[name] | llm | JsonOutputParser()
+            self._chains[name] = chain
+        return chain
+
+    @contextmanager
+    def track(self, chain: str):
+        """LLM 호출 지연시간 측정: with llm_manager.track("router"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.metrics.call_failed(chain)
+            raise
+        finally:
+            self.metrics.call_histogram(chain).observe((time.perf_counter() - start) * 1000)
+
+    async def aclose(self):
+        if self._background_task is not None and not self._background_task.done():
+            self._background_task.cancel()
+        await self._http.aclose()
+        self._http_sync.close()
+
+# 전역 LLM 클라이언트 관리자 (플래너)
+llm_manager = LLMClientManager(os.getenv("OPENAI_API_KEY"), os.getenv("OPENAI_API_BASE_URL"))
@@ -1,37 +1,118 @@
-from sentence_transformers import SentenceTransformer
+import os
+import threading
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from ai_models.embedding_backends import load_backend
+
+load_dotenv()
+
+EMBEDDING_MODEL_NAME = 'jhgan/ko-sbert-nli'
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")        # torch | int8 | onnx
+EMBEDDING_ONNX_PATH = os.getenv("EMBEDDING_ONNX_PATH")             # 미리 export한 ONNX 모델 경로 (없으면 시작 시 export)
+# true: 서버 시작 직후 백그라운드에서 로드 / false: 첫 플래너 요청 때 로드
+EMBEDDING_PRELOAD = os.getenv("EMBEDDING_PRELOAD", "true").lower() == "true"
+
+# 모델 상태
+STATE_IDLE = "idle"
+STATE_LOADING = "loading"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
 
 class ModelManager:
-    """ML 모델을 관리하는 클래스"""
+    """
+    ML 모델을 관리하는 클래스
+    로드는 별도 스레드에서 진행되어 서버 시작을 막지 않고, 상태(state)와 준비 이벤트(ready)로 추적한다.
+    """
 
-    def __init__(self):
+    def __init__(self, backend: str = EMBEDDING_BACKEND):
         self.embedding_model = None
+        self.backend = backend
+        # 임베딩 캐시 키 (모델/백엔드가 바뀌면 캐시도 분리, fp32 기본값은 모델 이름 그대로)
+        self.model_name = EMBEDDING_MODEL_NAME if backend == "torch" else f"{EMBEDDING_MODEL_NAME}:{backend}"
+
+        self.state = STATE_IDLE
+        self.error = None
+        self.load_started_at = None
+        self.load_seconds = None
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
 
     def load_models(self):
-        """서버 시작 시 모델 로드"""
-        print("📦 임베딩 모델 로딩 중...")
-        self.embedding_model = SentenceTransformer('jhgan/ko-sbert-nli')
-        print("✅ 임베딩 모델 로드 완료!")
+        """모델 로드 (호출한 스레드에서 끝날 때까지 실행, 보통은 start_loading으로 백그라운드 실행)"""
+        print(f"📦 임베딩 모델 로딩 중... (backend={self.backend})")
+        start = time.perf_counter()
+        try:
+            model = load_backend(self.backend, EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_PATH)
+        except Exception as e:
+            with self._lock:
+                self.state = STATE_FAILED
+                self.error = str(e)
+                self.load_seconds = round(time.perf_counter() - start, 2)
+            print(f"❌ 임베딩 모델 로드 실패: {e}")
+            return
+
+        with self._lock:
+            self.embedding_model = model
+            self.state = STATE_READY
+            self.error = None
+            self.load_seconds = round(time.perf_counter() - start, 2)
+        self.ready.set()
+        print(f"✅ 임베딩 모델 로드 완료! ({self.load_seconds}s)")
+
+    def start_loading(self) -> bool:
+        """백그라운드 로드 시작 (이미 로드 중이거나 완료면 무시, 실패 상태면 재시도)"""
+        with self._lock:
+            if self.state in (STATE_LOADING, STATE_READY):
+                return False
+            self.state = STATE_LOADING
+            self.error = None
+            self.load_started_at = datetime.now()
+        threading.Thread(target=self.load_models, name="embedding-model-loader", daemon=True).start()
+        return True
+
+    def wait_ready(self, timeout: float) -> bool:
+        """준비될 때까지 최대 timeout초 대기 (준비 안 됐으면 로드를 시작시킨다)"""
+        if self.ready.is_set():
+            return True
+        self.start_loading()
+        return self.ready.wait(timeout)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "backend": self.backend,
+                "model": EMBEDDING_MODEL_NAME,
+                "load_started_at": self.load_started_at.isoformat() if self.load_started_at else None,
+                "load_seconds": self.load_seconds,
+                "error": self.error,
+            }
 
     def unload_models(self):
         """서버 종료 시 모델 언로드"""
         if self.embedding_model is not None:
             print("🗑️ 임베딩 모델 언로드 중...")
-            del self.embedding_model
-            self.embedding_model = None
+            with self._lock:
+                self.ready.clear()
+                del self.embedding_model
+                self.embedding_model = None
+                self.state = STATE_IDLE
             print("✅ 임베딩 모델 언로드 완료!")
 
 # 전역 모델 매니저 인스턴스
 model_manager = ModelManager()
 
-def get_embedding_model() -> SentenceTransformer:
+def get_embedding_model():
     """
     FastAPI Dependency로 사용할 임베딩 모델 getter
+    (백엔드와 무관하게 encode(texts) → numpy 배열 인터페이스)
 
     Usage:
         @router.post("/endpoint")
-        def endpoint(model: SentenceTransformer = Depends(get_embedding_model)):
+        def endpoint(model = Depends(get_embedding_model)):
             embedding = model.encode("text")
     """
     if model_manager.embedding_model is None:
         raise RuntimeError("임베딩 모델이 로드되지 않았습니다.")
-    return model_manager.embedding_model
\ No newline at end of file
+    return model_manager.embedding_model
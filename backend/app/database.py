@@ -1,7 +1,9 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from utils.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, register_pool_events
 
 load_dotenv()
 
@@ -12,10 +14,28 @@ DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
 DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DB_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# 커넥션 풀 설정 (기본값은 SQLAlchemy 기본값과 같음,
+# 워커 수 x 엔진 수(동기/비동기) x (pool_size + max_overflow) 가 DB max_connections를 넘지 않도록 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))           # 커넥션 대기 최대 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))           # 커넥션 재생성 주기 (초, -1이면 재생성 안 함)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+# API 요청 세션(get_db / get_async_db)에만 적용하는 쿼리 제한 시간 (스케줄러 작업/스크립트는 제한 없음, 0이면 끄기)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
 
 engine = create_engine(
-    DB_URL
+    DB_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
 )
+register_pool_events(engine, InstrumentedQueuePool.metrics)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -23,15 +43,65 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# 비동기 엔진 (조회 트래픽이 많은 엔드포인트용, 스레드풀을 거치지 않음)
+async_engine = create_async_engine(
+    ASYNC_DB_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+register_pool_events(async_engine.sync_engine, InstrumentedAsyncQueuePool.metrics)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
 
+# 요청 세션 표시 (트랜잭션마다 SET LOCAL로 제한 시간 적용, 커밋/롤백 후 원래 값으로 돌아감)
+STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    timeout_ms = session.info.get(STATEMENT_TIMEOUT_KEY)
+    if timeout_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(info={STATEMENT_TIMEOUT_KEY: DB_STATEMENT_TIMEOUT_MS})
     try:
         yield db
     finally:
         db.close()
 
-def create_tables():
-    import models
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+async def get_async_db():
+    async with AsyncSessionLocal(info={STATEMENT_TIMEOUT_KEY: DB_STATEMENT_TIMEOUT_MS}) as db:
+        yield db
+
+# 스키마는 Alembic 마이그레이션으로만 만든다 (create_all은 시드/백필 없이 빈 테이블을 만들고
+# 이후 upgrade의 create_table과 충돌하므로 사용하지 않음)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def check_schema_version():
+    """DB에 적용된 Alembic 리비전이 코드의 head와 같은지 확인 (다르면 서버를 띄우지 않음)"""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+
+    if current != head:
+        raise RuntimeError(
+            f"DB 스키마 리비전({current})이 최신({head})이 아닙니다. "
+            "backend 디렉터리에서 `uv run alembic upgrade head`를 먼저 실행하세요."
+        )
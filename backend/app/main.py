@@ -4,16 +4,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from database import create_tables, SessionLocal
-from ai_models.sbert import model_manager
-from database import create_tables
+from database import check_schema_version, SessionLocal
+from ai_models.sbert import model_manager, EMBEDDING_PRELOAD
+from ai_models.embedding_service import embedding_service
+from ai_models.llm_client import llm_manager
 from routers.kiosk import kiosk
 from routers.web import auth, ticket, mypage, plan
 from routers.admin import admin
 from routers.ml import detect, statics
-from datetime import datetime
+from datetime import datetime, timedelta
 from models import SeatUsage, Seat
-from apscheduler.schedulers.background import BackgroundScheduler
+from utils.scheduler import add_exclusive_job, start_scheduler, shutdown_scheduler
+from utils.todo_progress import rebuild_todo_progress
+from utils.usage_rollup import rebuild_usage_rollup
+from utils.sales_cube import rebuild_daily_sales
+from utils.seat_profile import rebuild_member_profiles
+from utils.checkout_hooks import after_checkout, claim_checkout
+from utils.seat_layout import fill_missing_layouts
 from zoneinfo import ZoneInfo # 시간대 처리
 
 # ---------------------------------------------------------
@@ -37,13 +44,17 @@ def auto_checkout_job():
             print(f"[Auto Checkout] 만료된 사용자 {len(expired_usages)}명 퇴실 처리 진행")
             
             for usage in expired_usages:
-                # 1. 퇴실 시간 기록
-                usage.check_out_time = now
+                # 1. 퇴실 시간 기록 (그 사이 키오스크/관리자 퇴실이 먼저 처리했으면 건너뜀)
+                if not claim_checkout(db, usage, now):
+                    continue
                 
                 # 2. 좌석 상태 변경 (사용 가능으로)
                 seat = db.query(Seat).filter(Seat.seat_id == usage.seat_id).first()
                 if seat:
                     seat.is_status = True
+
+                # 3. 도전 누적치 / 일일 이용 집계 반영
+                after_checkout(db, usage, seat)
             
             db.commit()
             print(" -> DB 업데이트 완료")
@@ -51,6 +62,57 @@ def auto_checkout_job():
     except Exception as e:
         print(f"[Scheduler Error] {e}")
         db.rollback()
+        raise
+    finally:
+        db.close()
+
+def rebuild_todo_progress_job():
+    """매일 새벽 도전 누적치를 이용 기록 원본 기준으로 보정"""
+    db = SessionLocal()
+    try:
+        rebuild_todo_progress(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def rebuild_usage_rollup_job():
+    """매일 새벽 최근 이틀치 일일 이용 집계를 원본 기준으로 다시 생성 (늦게 도착한 집중 시간 등 보정)"""
+    db = SessionLocal()
+    try:
+        since = datetime.now(ZoneInfo("Asia/Seoul")).date() - timedelta(days=2)
+        rebuild_usage_rollup(db, since=since)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def rebuild_daily_sales_job():
+    """매일 새벽 최근 이틀치 일일 매출 집계를 주문 원본 기준으로 다시 생성"""
+    db = SessionLocal()
+    try:
+        since = datetime.now(ZoneInfo("Asia/Seoul")).date() - timedelta(days=2)
+        rebuild_daily_sales(db, since=since)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def rebuild_member_profiles_job():
+    """매일 새벽 좌석 추천 프로필을 이용 기록 원본 기준으로 다시 생성 (누적치 보정)"""
+    db = SessionLocal()
+    try:
+        rebuild_member_profiles(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -60,24 +122,35 @@ def auto_checkout_job():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 서버 시작 중...")
-    create_tables()
+    # 테이블은 만들지 않고 마이그레이션 적용 여부만 확인 (uv run alembic upgrade head)
+    check_schema_version()
+    # 배치 정보가 없는 좌석(새로 추가된 좌석 등)에 기본 구역 지정
+    fill_missing_layouts()
 
+    # 스케줄러 시작 (워커가 여러 개여도 각 작업은 클러스터 전체에서 한 번만 실행됨)
+    add_exclusive_job(auto_checkout_job, 'interval', lease_seconds=25, seconds=30)
+    add_exclusive_job(ticket.reset_seat_status, 'cron', lease_seconds=3600, hour=0, minute=0)
+    add_exclusive_job(rebuild_todo_progress_job, 'cron', lease_seconds=3600, hour=3, minute=0)
+    add_exclusive_job(rebuild_usage_rollup_job, 'cron', lease_seconds=3600, hour=3, minute=10)
+    add_exclusive_job(rebuild_daily_sales_job, 'cron', lease_seconds=3600, hour=3, minute=20)
+    add_exclusive_job(rebuild_member_profiles_job, 'cron', lease_seconds=3600, hour=3, minute=30)
+    start_scheduler()
     print("✅ 시스템 및 자동 퇴실 스케줄러가 시작되었습니다.")
-    # 스케줄러 시작
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(auto_checkout_job, 'interval', seconds=30)
-    scheduler.start()
 
-    model_manager.load_models()
-    ticket.start_scheduler()
+    # 임베딩 모델은 백그라운드에서 로드 (플래너 외 API는 바로 응답, 준비 상태: GET /api/web/plan/ready)
+    embedding_service.start()
+    if EMBEDDING_PRELOAD:
+        model_manager.start_loading()
 
     print("✅ 서버 시작 완료!\n")
     yield  # 서버 실행 중
     print("\n🛑 서버 종료 중...")
     print("🛑 시스템 종료, 스케줄러 셧다운...")
 
-    scheduler.shutdown()
+    shutdown_scheduler()
+    embedding_service.stop()
     model_manager.unload_models()
+    await llm_manager.aclose()
 
     print("✅ 서버 종료 완료!")
 
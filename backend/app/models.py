@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, BigInteger, Text, Date, Time
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, BigInteger, Text, Date, Time, Index, text, Float
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
@@ -37,6 +38,29 @@ class Seat(Base):
 
     seat_usages = relationship("SeatUsage", back_populates="seat")
 
+# ----------------------------------------------------------------------------------------------------------------------
+# SEAT LAYOUT (좌석 구역 / 층 / 좌표 / 카메라 매핑)
+# ----------------------------------------------------------------------------------------------------------------------
+class SeatZone(Base):
+    __tablename__ = "seat_zones"
+
+    zone_key = Column(String(20), primary_key=True)         # 'fix', 'view', 'island' ...
+    name = Column(String(50), nullable=False)               # 화면 표시명
+    floor = Column(Integer, nullable=False, server_default="1")
+    sort_order = Column(Integer, nullable=False, server_default="0")
+    is_fixed = Column(Boolean, nullable=False, server_default="false")   # 고정석 구역 (자리 추천 제외)
+
+class SeatLayout(Base):
+    __tablename__ = "seat_layouts"
+
+    seat_id = Column(BigInteger, ForeignKey("seats.seat_id", ondelete="CASCADE"), primary_key=True)
+    zone_key = Column(String(20), ForeignKey("seat_zones.zone_key"), nullable=False, index=True)
+    floor = Column(Integer, nullable=False, server_default="1")
+    pos_x = Column(Integer, nullable=True)                  # 배치도 좌표
+    pos_y = Column(Integer, nullable=True)
+    camera_id = Column(String(50), nullable=True)           # 좌석을 비추는 카메라
+    camera_slot = Column(Integer, nullable=True)            # 카메라 화면 내 좌석 위치 번호
+
 # ----------------------------------------------------------------------------------------------------------------------
 # MEMBERS
 # ----------------------------------------------------------------------------------------------------------------------
@@ -85,6 +109,10 @@ class Token(Base):
 
     member = relationship("Member", back_populates="tokens")
 
+    __table_args__ = (
+        Index("ix_tokens_token", "token"),
+    )
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ORDERS
 # ----------------------------------------------------------------------------------------------------------------------
@@ -100,11 +128,18 @@ class Order(Base):
     period_start_date = Column(DateTime, nullable=True)
     period_end_date = Column(DateTime, nullable=True)
     fixed_seat_id = Column(BigInteger, nullable=True)
+    used_mileage = Column(Integer, nullable=True)           # 결제 시 사용한 마일리지 (매출 집계용)
 
     member = relationship("Member", back_populates="orders")
     product = relationship("Product", back_populates="orders")
     seat_usage = relationship("SeatUsage", back_populates="order", uselist=False)
 
+    __table_args__ = (
+        Index("ix_orders_fixed_seat_period", "fixed_seat_id", "period_end_date", postgresql_where=text("fixed_seat_id IS NOT NULL")),
+        Index("ix_orders_member_period", "member_id", "period_end_date"),
+        Index("ix_orders_created_at", "created_at"),
+    )
+
 # ----------------------------------------------------------------------------------------------------------------------
 # SEAT_USAGE
 # ----------------------------------------------------------------------------------------------------------------------
@@ -125,6 +160,15 @@ class SeatUsage(Base):
     seat = relationship("Seat", back_populates="seat_usages")
     member = relationship("Member", back_populates="seat_usages")
 
+    __table_args__ = (
+        Index("ix_seat_usage_member_checkout", "member_id", "check_out_time"),
+        Index("ix_seat_usage_member_checkin", "member_id", "check_in_time"),
+        # 좌석당/회원당 입실 중 기록은 하나만 허용 (비회원은 member_id 2를 공유하므로 제외)
+        Index("uq_seat_usage_open_seat", "seat_id", unique=True, postgresql_where=text("check_out_time IS NULL")),
+        Index("uq_seat_usage_open_member", "member_id", unique=True, postgresql_where=text("check_out_time IS NULL AND member_id <> 2")),
+        Index("ix_seat_usage_open_expired", "ticket_expired_time", postgresql_where=text("check_out_time IS NULL")),
+    )
+
 # ----------------------------------------------------------------------------------------------------------------------
 # MILEAGE_HISTORY
 # ----------------------------------------------------------------------------------------------------------------------
@@ -170,10 +214,17 @@ class UserTODO(Base):
     is_achieved = Column(Boolean, server_default="false")
     started_at = Column(DateTime, server_default=func.now())
     achieved_at = Column(DateTime, onupdate=func.now())
+    progress_seconds = Column(BigInteger, nullable=False, server_default="0") # 도전 시작 이후 누적 이용 시간 (초)
+    attended_days = Column(Integer, nullable=False, server_default="0")       # 도전 시작 이후 출석 일수
 
     member = relationship("Member", back_populates="user_todos")
     todos = relationship("TODO", back_populates="user_todos")
 
+    __table_args__ = (
+        Index("ix_user_todos_member_achieved", "member_id", "is_achieved"),
+        Index("ix_user_todos_todo_achieved", "todo_id", "is_achieved"),
+    )
+
 # ----------------------------------------------------------------------------------------------------------------------
 # AI CHAT LOGS
 # ----------------------------------------------------------------------------------------------------------------------
@@ -189,6 +240,10 @@ class AIChatLog(Base):
     member = relationship("Member", back_populates="ai_chat_logs")
     schedule_events = relationship("ScheduleEvent", back_populates="ai_chat_logs")
 
+    __table_args__ = (
+        Index("ix_ai_chat_logs_member_created", "member_id", "created_at"),
+    )
+
 # ----------------------------------------------------------------------------------------------------------------------
 # SCHEDULE EVENTS
 # ----------------------------------------------------------------------------------------------------------------------
@@ -208,4 +263,124 @@ class ScheduleEvent(Base):
     description_embedding = Column(Vector(768))
 
     member = relationship("Member", back_populates="schedule_events")
-    ai_chat_logs = relationship("AIChatLog", back_populates="schedule_events")
\ No newline at end of file
+    ai_chat_logs = relationship("AIChatLog", back_populates="schedule_events")
+
+    __table_args__ = (
+        Index("ix_schedule_events_member_date", "member_id", "schedule_date"),
+        Index("ix_schedule_events_title_hnsw", "title_embedding", postgresql_using="hnsw",
+              postgresql_with={"m": 16, "ef_construction": 64},
+              postgresql_ops={"title_embedding": "vector_cosine_ops"}),
+        Index("ix_schedule_events_desc_hnsw", "description_embedding", postgresql_using="hnsw",
+              postgresql_with={"m": 16, "ef_construction": 64},
+              postgresql_ops={"description_embedding": "vector_cosine_ops"}),
+        Index("ix_schedule_events_title_trgm", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_schedule_events_desc_trgm", "description", postgresql_using="gin",
+              postgresql_ops={"description": "gin_trgm_ops"}),
+    )
+# ----------------------------------------------------------------------------------------------------------------------
+# SCHEDULER LEASES (다중 워커 환경에서 주기 작업 단일 실행 보장)
+# ----------------------------------------------------------------------------------------------------------------------
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    job_name = Column(String(100), primary_key=True)
+    owner = Column(String(100))
+    lease_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+# ----------------------------------------------------------------------------------------------------------------------
+# JOB RUN LOGS (스케줄러 작업 실행 이력)
+# ----------------------------------------------------------------------------------------------------------------------
+class JobRunLog(Base):
+    __tablename__ = "job_run_logs"
+
+    run_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    job_name = Column(String(100), nullable=False, index=True)
+    owner = Column(String(100))
+    status = Column(String(20), nullable=False) # 'success' 또는 'failed'
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    duration_ms = Column(Integer)
+    error = Column(Text)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# MEMBER DAILY USAGE (회원별 일일 이용 집계, 통계 API 조회용)
+# ----------------------------------------------------------------------------------------------------------------------
+class MemberDailyUsage(Base):
+    __tablename__ = "member_daily_usage"
+
+    member_id = Column(BigInteger, ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    usage_date = Column(Date, primary_key=True)             # 입실 일자 기준
+    session_count = Column(Integer, nullable=False, server_default="0")
+    usage_minutes = Column(Float, nullable=False, server_default="0")
+    focus_minutes = Column(Float, nullable=False, server_default="0")         # total_in_time 합계
+    best_focus_minutes = Column(Float, nullable=False, server_default="0")    # 단일 이용 중 최대 집중 시간
+    attended = Column(Boolean, nullable=False, server_default="false")
+    hour_focus = Column(ARRAY(Float), nullable=False, server_default=text("array_fill(0::float8, ARRAY[24])")) # 입실 시각(0~23시)별 집중 시간
+    seat_type_counts = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))                       # 좌석 유형별 이용 횟수
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+# ----------------------------------------------------------------------------------------------------------------------
+# DAILY SALES (일자 × 상품별 매출 집계, 관리자 매출 통계 조회용)
+# ----------------------------------------------------------------------------------------------------------------------
+class DailySales(Base):
+    __tablename__ = "daily_sales"
+
+    sales_date = Column(Date, primary_key=True)             # 주문 일자 기준
+    product_id = Column(BigInteger, primary_key=True)       # 상품 삭제 후에도 집계 유지 (FK 없음)
+    product_type = Column(String(20), nullable=False)       # 주문 시점의 상품 타입
+    revenue = Column(BigInteger, nullable=False, server_default="0")        # payment_amount 합계
+    order_count = Column(Integer, nullable=False, server_default="0")
+    mileage_used = Column(BigInteger, nullable=False, server_default="0")   # 결제 시 사용한 마일리지 합계
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SEAT PREFERENCE PROFILE (회원별 좌석 추천 특성, 퇴실 시 누적 / 새벽 배치로 재계산)
+# ----------------------------------------------------------------------------------------------------------------------
+class MemberSeatStat(Base):
+    __tablename__ = "member_seat_stats"
+
+    member_id = Column(BigInteger, ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    seat_id = Column(BigInteger, primary_key=True)
+    use_count = Column(Integer, nullable=False, server_default="0")
+    total_minutes = Column(Float, nullable=False, server_default="0")
+    decayed_weight = Column(Float, nullable=False, server_default="0")     # 최근 이용일수록 큰 가중치 합 (last_used_at 기준)
+    last_used_at = Column(DateTime)
+
+class MemberSeatProfile(Base):
+    __tablename__ = "member_seat_profiles"
+
+    member_id = Column(BigInteger, ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    total_uses = Column(Integer, nullable=False, server_default="0")
+    attr_counts = Column(ARRAY(Float), nullable=False)      # 좌석 속성별 이용 횟수 (seat_profile.SEAT_FEATURES 순서)
+    attr_decayed = Column(ARRAY(Float), nullable=False)     # 좌석 속성별 최근성 가중 합
+    decayed_total = Column(Float, nullable=False, server_default="0")
+    decay_ref_at = Column(DateTime)                         # 가중치 기준 시각 (마지막 반영 퇴실 시각)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class RecommendationLog(Base):
+    __tablename__ = "recommendation_logs"
+
+    log_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    member_id = Column(BigInteger, ForeignKey("members.member_id", ondelete="SET NULL"), nullable=True)
+    strategy = Column(String(20), nullable=False)           # 'profile' 또는 'random'
+    seat_ids = Column(ARRAY(BigInteger), nullable=False)    # 추천 순위대로
+    scores = Column(ARRAY(Float), nullable=True)
+    free_seat_count = Column(Integer)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_recommendation_logs_member_created", "member_id", "created_at"),
+    )
+
+# ----------------------------------------------------------------------------------------------------------------------
+# EMBEDDING CACHE (모델 + 정규화 텍스트 해시 → 임베딩, 같은 문장은 다시 인코딩하지 않음)
+# ----------------------------------------------------------------------------------------------------------------------
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    model_name = Column(String(100), primary_key=True)      # 모델/백엔드 식별자 (바뀌면 다른 캐시로 취급)
+    text_hash = Column(String(64), primary_key=True)        # 정규화 텍스트의 sha256
+    embedding = Column(Vector(768), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
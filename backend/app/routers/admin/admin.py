@@ -2,18 +2,29 @@
 
 from fastapi import APIRouter, Response, Depends, Cookie, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, distinct, or_
+from sqlalchemy import func, distinct, or_, case, exists
 from typing import List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-from database import get_db
-from models import Member, Order, Product, SeatUsage, TODO, UserTODO, Seat
+from database import get_db, engine, async_engine
+from models import Member, Order, Product, SeatUsage, TODO, UserTODO, Seat, JobRunLog, MemberDailyUsage, DailySales, SeatZone, SeatLayout
 from schemas import (
     MemberLogin, DailySalesStat, TodoCreate, TodoUpdate, TodoResponse, 
     MemberAdminResponse, MemberUpdatePhone,
-    ProductCreate, ProductUpdate, ProductResponse
+    ProductCreate, ProductUpdate, ProductResponse, SeatLayoutUpdate
 )
 from utils.auth_utils import revoke_existing_token, revoke_existing_token_by_id, password_decode, set_token_cookies
+from utils.scheduler import job_latency, worker_id
+from utils.checkout_hooks import after_checkout, claim_checkout
+from utils.cache import statics_cache
+from utils.sales_cube import resolve_sales_range
+from utils.seat_layout import get_seat_layout, invalidate_seat_layout, zone_key_expr, DEFAULT_ZONE_KEY
+from utils.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, pool_status
+from ai_models.embedding_service import embedding_service
+from ai_models.embedding_cache import embedding_cache
+from ai_models.sbert import model_manager
+from ai_models.llm_client import llm_manager
+from ai_models.intent_classifier import intent_classifier
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -47,31 +58,34 @@ async def logout(response: Response):
 # STATISTICS (매출 통계)
 # ----------------------------------------------------------------------------------------------------------------------
 """
-[GET] 월별 일간 매출 통계 조회
-Query Parameter: year (YYYY), month (MM)
+[GET] 기간별 일간 매출 통계 조회 (일일 매출 집계 daily_sales 기준)
+Query Parameter: year (YYYY) + month (MM) / year + week (ISO 주차) / year / start + end (YYYY-MM-DD)
 """
 @router.get("/stats/daily", response_model=List[DailySalesStat])
 def get_daily_sales_stats(
-    year: int = Query(..., description="조회할 연도"),
-    month: int = Query(..., description="조회할 월"),
+    year: int = Query(None, description="조회할 연도"),
+    month: int = Query(None, description="조회할 월"),
+    week: int = Query(None, description="조회할 ISO 주차"),
+    start: date = Query(None, description="조회 시작일"),
+    end: date = Query(None, description="조회 종료일 (포함)"),
     db: Session = Depends(get_db)
 ):
-    date_col = func.to_char(Order.created_at, 'YYYY-MM-DD').label("date")
+    range_start, range_end = resolve_sales_range(year, month, week, start, end)
+    date_col = func.to_char(DailySales.sales_date, 'YYYY-MM-DD').label("date")
 
     stats = (
         db.query(
             date_col,
-            Product.type.label("product_type"),
-            func.sum(Order.payment_amount).label("total_sales"),
-            func.count(Order.order_id).label("order_count")
+            DailySales.product_type.label("product_type"),
+            func.sum(DailySales.revenue).label("total_sales"),
+            func.sum(DailySales.order_count).label("order_count")
         )
-        .join(Product, Order.product_id == Product.product_id)
         .filter(
-            extract('year', Order.created_at) == year,
-            extract('month', Order.created_at) == month
+            DailySales.sales_date >= range_start,
+            DailySales.sales_date < range_end
         )
-        .group_by(date_col, Product.type)
-        .order_by(date_col)
+        .group_by(DailySales.sales_date, DailySales.product_type)
+        .order_by(DailySales.sales_date)
         .all()
     )
 
@@ -79,27 +93,42 @@ def get_daily_sales_stats(
 
 @router.get("/stats/products")
 def get_product_sales_stats(
-    year: int = Query(..., description="조회할 연도"),
-    month: int = Query(..., description="조회할 월"),
+    year: int = Query(None, description="조회할 연도"),
+    month: int = Query(None, description="조회할 월"),
+    week: int = Query(None, description="조회할 ISO 주차"),
+    start: date = Query(None, description="조회 시작일"),
+    end: date = Query(None, description="조회 종료일 (포함)"),
     db: Session = Depends(get_db)
 ):
     """
-    [GET] 월별 상품 판매 순위 (판매량 기준 내림차순)
+    [GET] 기간별 상품 판매 순위 (판매량 기준 내림차순, 일일 매출 집계 기준)
     """
-    stats = (
+    range_start, range_end = resolve_sales_range(year, month, week, start, end)
+
+    sales_subquery = (
         db.query(
-            Product.name,
-            Product.type,
-            func.count(Order.order_id).label("count"),
-            func.sum(Order.payment_amount).label("revenue")
+            DailySales.product_id,
+            func.max(DailySales.product_type).label("type"),
+            func.sum(DailySales.order_count).label("count"),
+            func.sum(DailySales.revenue).label("revenue")
         )
-        .join(Order, Product.product_id == Order.product_id)
         .filter(
-            extract('year', Order.created_at) == year,
-            extract('month', Order.created_at) == month
+            DailySales.sales_date >= range_start,
+            DailySales.sales_date < range_end
         )
-        .group_by(Product.product_id, Product.name, Product.type)
-        .order_by(func.count(Order.order_id).desc())
+        .group_by(DailySales.product_id)
+        .subquery()
+    )
+
+    stats = (
+        db.query(
+            Product.name,
+            sales_subquery.c.type,
+            sales_subquery.c.count,
+            sales_subquery.c.revenue
+        )
+        .join(sales_subquery, Product.product_id == sales_subquery.c.product_id)
+        .order_by(sales_subquery.c.count.desc())
         .all()
     )
 
@@ -107,8 +136,8 @@ def get_product_sales_stats(
         {
             "name": name,
             "type": p_type,
-            "count": count,
-            "revenue": revenue or 0
+            "count": int(count or 0),
+            "revenue": int(revenue or 0)
         }
         for name, p_type, count, revenue in stats
     ]
@@ -121,15 +150,13 @@ def get_members(
     search: str = Query(None, description="이름/전화번호 검색"),
     db: Session = Depends(get_db)
 ):
+    # 누적 이용 시간은 일일 집계(member_daily_usage)에서 합산
     usage_subquery = (
         db.query(
-            SeatUsage.member_id,
-            func.sum(
-                func.extract('epoch', SeatUsage.check_out_time - SeatUsage.check_in_time) / 60
-            ).label("total_usage_minutes")
+            MemberDailyUsage.member_id,
+            func.sum(MemberDailyUsage.usage_minutes).label("total_usage_minutes")
         )
-        .filter(SeatUsage.check_out_time != None)
-        .group_by(SeatUsage.member_id)
+        .group_by(MemberDailyUsage.member_id)
         .subquery()
     )
 
@@ -216,6 +243,11 @@ def force_checkout_member(
     member = db.query(Member).filter(Member.member_id == member_id).first()
     
     now = datetime.now()
+
+    # 퇴실 시간을 먼저 기록 (키오스크/자동 퇴실과 겹쳐 이미 퇴실됐으면 시간 차감·집계를 하지 않음)
+    if not claim_checkout(db, usage, now):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="이미 퇴실 처리된 이용 기록입니다.")
     
     # 2. 이용 시간 차감 계산 (시간제 이용권일 경우만)
     # (고정석/기간제는 시간 차감이 필요 없으나, 로직에 따라 추가 가능)
@@ -227,11 +259,12 @@ def force_checkout_member(
         if member.saved_time_minute < 0:
             member.saved_time_minute = 0
             
-    # 3. 퇴실 처리 및 좌석 상태 변경
-    usage.check_out_time = now
+    # 3. 좌석 상태 변경
     if seat:
         seat.is_status = True # 좌석 활성화 (비어있음)
 
+    after_checkout(db, usage, seat)
+
     db.commit()
     
     return {"message": "강제 퇴실 처리되었습니다."}
@@ -262,41 +295,50 @@ def update_member_phone(
 # ----------------------------------------------------------------------------------------------------------------------
 # SEAT MANAGEMENT
 # ----------------------------------------------------------------------------------------------------------------------
+def zone_seat_counts(db: Session, layout, occupied) -> dict:
+    """구역별 전체 / occupied 조건을 만족하는 좌석 수 → {zone_key: {"name", "total", "used"}} (layout의 모든 구역 포함)"""
+    zone_col = zone_key_expr()
+    zone_counts = (
+        db.query(zone_col, func.count(Seat.seat_id), func.count(case((occupied, 1))))
+        .select_from(Seat)
+        .outerjoin(SeatLayout, SeatLayout.seat_id == Seat.seat_id)
+        .group_by(zone_col)
+        .all()
+    )
+    zone_stats = {
+        z["key"]: {"name": z["name"], "total": 0, "used": 0} for z in layout.zones
+    }
+    for zone_key, zone_total, zone_used in zone_counts:
+        stat = zone_stats.setdefault(zone_key, {"name": zone_key, "total": 0, "used": 0})
+        stat["total"] += zone_total
+        stat["used"] += zone_used
+    return zone_stats
+
 @router.get("/stats/seats")
 def get_seat_stats(db: Session = Depends(get_db)):
     """
     [GET] 구역별 실시간 좌석 점유 현황 조회
     """
-    occupied_seat_ids = db.query(SeatUsage.seat_id).filter(
-        SeatUsage.check_out_time == None
-    ).all()
-    occupied_ids = {row[0] for row in occupied_seat_ids}
-
-    # 중앙석(Island) 범위 확장 (31~50 + 61~70)
-    zones = [
-        {"name": "고정석 (Private)", "range": range(1, 21)},
-        {"name": "창가석 (View)", "range": range(21, 31)},
-        {"name": "중앙석 (Island)", "range": list(range(31, 51)) + list(range(61, 71))},
-        {"name": "독립석 (Corner)", "range": range(51, 61)},
-        {"name": "음료대석 (Easy)", "range": range(71, 91)},
-        {"name": "일반석 (Aisle)", "range": range(91, 101)},
-    ]
+    layout = get_seat_layout(db)
+
+    # 구역별 전체 / 입실 중 좌석 수 (GROUP BY 한 번, 배치 행이 없는 좌석은 기본 번호 범위)
+    occupied = exists().where(SeatUsage.seat_id == Seat.seat_id, SeatUsage.check_out_time == None)
+    zone_stats = zone_seat_counts(db, layout, occupied)
 
     stats = []
     total_used = 0
     total_count = 0
 
-    for zone in zones:
-        zone_total = len(zone["range"])
-        zone_used = sum(1 for seat_id in zone["range"] if seat_id in occupied_ids)
-        
+    for zone in layout.zones:
+        zone_total, zone_used = zone_stats[zone["key"]]["total"], zone_stats[zone["key"]]["used"]
+
         stats.append({
             "name": zone["name"],
             "total": zone_total,
             "used": zone_used,
             "rate": round((zone_used / zone_total) * 100) if zone_total > 0 else 0
         })
-        
+
         total_used += zone_used
         total_count += zone_total
 
@@ -308,24 +350,76 @@ def get_seat_stats(db: Session = Depends(get_db)):
         "zones": stats
     }
 
+def member_aggregate_maps(db: Session, member_ids: set):
+    """회원별 진행 중 TODO 수 / 누적 이용 시간(분)을 한 번에 조회"""
+    if not member_ids:
+        return {}, {}
+
+    todo_counts = dict(
+        db.query(UserTODO.member_id, func.count(UserTODO.user_todo_id))
+        .filter(UserTODO.member_id.in_(member_ids), UserTODO.is_achieved == False)
+        .group_by(UserTODO.member_id)
+        .all()
+    )
+    usage_minutes = dict(
+        db.query(MemberDailyUsage.member_id, func.sum(MemberDailyUsage.usage_minutes))
+        .filter(MemberDailyUsage.member_id.in_(member_ids))
+        .group_by(MemberDailyUsage.member_id)
+        .all()
+    )
+    return todo_counts, usage_minutes
+
 @router.get("/seats/detail")
-def get_seat_detail_stats(db: Session = Depends(get_db)):
+def get_seat_detail_stats(
+    zone: str = Query(None, description="구역 key (seat_zones.zone_key)"),
+    offset: int = Query(0, ge=0, description="좌석 목록 시작 위치"),
+    limit: int = Query(None, ge=1, le=500, description="좌석 목록 개수 (미지정 시 전체)"),
+    db: Session = Depends(get_db)
+):
     """
     [GET] 좌석 관리 페이지용 상세 데이터
     (수정: 입실하지 않은 기간제/고정석 예약자도 '사용중'으로 표시하여 점검중 오해 방지)
+    summary / type_stats는 전체 좌석 기준(GROUP BY 집계), seats는 zone 필터와 offset/limit을 SQL에서 적용한 결과
     """
-    seats = db.query(Seat).order_by(Seat.seat_id).all()
     now = datetime.now()
-    
-    # 1. 현재 입실 중인 정보 조회 (Active Usage)
+    layout = get_seat_layout(db)
+    zone_col = zone_key_expr()
+
+    # 논리적 점유 (입실 중 or 유효한 기간제/고정석 예약)
+    occupied = or_(
+        exists().where(SeatUsage.seat_id == Seat.seat_id, SeatUsage.check_out_time == None),
+        exists().where(Order.fixed_seat_id == Seat.seat_id, Order.period_end_date > now)
+    )
+
+    # 1. 구역별 전체 / 점유 좌석 수 (전체 좌석 기준, GROUP BY 한 번)
+    zone_stats = zone_seat_counts(db, layout, occupied)
+    total_seats = sum(stat["total"] for stat in zone_stats.values())
+    used_seats = sum(stat["used"] for stat in zone_stats.values())
+
+    # 2. 요청한 구역 / 페이지의 좌석만 조회
+    seat_query = (
+        db.query(Seat, zone_col)
+        .outerjoin(SeatLayout, SeatLayout.seat_id == Seat.seat_id)
+        .order_by(Seat.seat_id)
+    )
+    if zone:
+        seat_query = seat_query.filter(zone_col == zone)
+    seat_query = seat_query.offset(offset)
+    if limit:
+        seat_query = seat_query.limit(limit)
+    page_rows = seat_query.all()
+    page_seat_ids = [seat.seat_id for seat, _ in page_rows]
+    seat_count = zone_stats[zone]["total"] if zone in zone_stats else (0 if zone else total_seats)
+
+    # 3. 페이지 좌석의 입실 중 정보 (Active Usage)
     active_usages = (
         db.query(SeatUsage, Member, Order, Product)
         .join(Member, SeatUsage.member_id == Member.member_id)
         .outerjoin(Order, SeatUsage.order_id == Order.order_id)
         .outerjoin(Product, Order.product_id == Product.product_id)
-        .filter(SeatUsage.check_out_time == None)
+        .filter(SeatUsage.check_out_time == None, SeatUsage.seat_id.in_(page_seat_ids))
         .all()
-    )
+    ) if page_seat_ids else []
     
     usage_map = {}
     for usage, member, order, product in active_usages:
@@ -336,18 +430,17 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
             "product": product
         }
 
-    # 2. [추가] 기간제/고정석 예약 정보 조회 (입실 안 한 상태여도 주인 있는 좌석)
-    # period_end_date가 남아있고, fixed_seat_id가 설정된 주문 검색
+    # 4. 페이지 좌석의 기간제/고정석 예약 정보 (입실 안 한 상태여도 주인 있는 좌석)
     fixed_orders = (
         db.query(Order, Member, Product)
         .join(Member, Order.member_id == Member.member_id)
         .join(Product, Order.product_id == Product.product_id)
         .filter(
             Order.period_end_date > now,
-            Order.fixed_seat_id != None
+            Order.fixed_seat_id.in_(page_seat_ids)
         )
         .all()
-    )
+    ) if page_seat_ids else []
     # 좌석 ID를 Key로 매핑
     fixed_map = {
         order.fixed_seat_id: {"order": order, "member": member, "product": product}
@@ -355,39 +448,12 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
     }
     
     seat_list = []
-    total_seats = 0
-    used_seats = 0
-    
-    # 구역 정의
-    zones_def = [
-        {"key": "fix", "name": "고정석 (Private)", "range": range(1, 21)},
-        {"key": "view", "name": "창가석 (View)", "range": range(21, 31)},
-        {"key": "island", "name": "중앙석 (Island)", "range": list(range(31, 51)) + list(range(61, 71))},
-        {"key": "corner", "name": "독립석 (Corner)", "range": range(51, 61)},
-        {"key": "easy", "name": "음료대석 (Easy)", "range": range(71, 91)},
-        {"key": "aisle", "name": "일반석 (Aisle)", "range": range(91, 101)},
-    ]
-    
-    zone_stats = {
-        z["key"]: {"name": z["name"], "total": 0, "used": 0} for z in zones_def
-    }
-
-    for seat in seats:
-        total_seats += 1
-        
-        sid = seat.seat_id
-        current_zone_key = "aisle"
-        for z in zones_def:
-            if sid in z["range"]:
-                current_zone_key = z["key"]
-                break
-        
-        zone_stats[current_zone_key]["total"] += 1
 
+    for seat, current_zone_key in page_rows:
         seat_info = {
             "seat_id": seat.seat_id,
             "type": seat.type,
-            "zone_name": zone_stats[current_zone_key]["name"],
+            "zone_name": zone_stats.get(current_zone_key, {}).get("name", current_zone_key),
             "zone_key": current_zone_key,
             "is_status": seat.is_status,
             "is_occupied": False, # 논리적 점유 여부 (입실 or 예약)
@@ -408,8 +474,6 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
 
         # Case A: 현재 입실 중인 경우 (가장 우선)
         if seat.seat_id in usage_map:
-            used_seats += 1
-            zone_stats[current_zone_key]["used"] += 1
             
             data = usage_map[seat.seat_id]
             usage = data["usage"]
@@ -428,17 +492,6 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
             seat_info["saved_time_minute"] = member.saved_time_minute
             seat_info["check_in_time"] = usage.check_in_time
 
-            # Todo 및 총 이용시간 통계
-            todo_count = db.query(func.count(UserTODO.user_todo_id))\
-                .filter(UserTODO.member_id == member.member_id, UserTODO.is_achieved == False)\
-                .scalar()
-            seat_info["active_todo_count"] = todo_count or 0
-
-            total_usage = db.query(func.sum(
-                func.extract('epoch', SeatUsage.check_out_time - SeatUsage.check_in_time) / 60
-            )).filter(SeatUsage.member_id == member.member_id, SeatUsage.check_out_time != None).scalar()
-            seat_info["total_usage_minutes"] = int(total_usage) if total_usage else 0
-            
             # 티켓 타입 및 남은 시간 표시
             if product and product.type == '기간제':
                 seat_info["ticket_type"] = "기간권"
@@ -459,9 +512,7 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
 
         # Case B: 입실은 안 했지만, 기간제/고정석 예약이 있는 경우 (추가된 로직)
         elif seat.seat_id in fixed_map:
-            # 예약되어 있으므로 사용 중(occupied)으로 간주
-            used_seats += 1
-            zone_stats[current_zone_key]["used"] += 1
+            # 예약되어 있으므로 사용 중(occupied)으로 간주 (사용 좌석 수는 위에서 집계)
 
             data = fixed_map[seat.seat_id]
             order = data["order"]
@@ -483,17 +534,6 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
             remain_days = (order.period_end_date.date() - now.date()).days
             seat_info["remaining_info"] = f"{remain_days}일 남음"
 
-            # 기타 통계 (필요 시 조회)
-            todo_count = db.query(func.count(UserTODO.user_todo_id))\
-                .filter(UserTODO.member_id == member.member_id, UserTODO.is_achieved == False)\
-                .scalar()
-            seat_info["active_todo_count"] = todo_count or 0
-
-            total_usage = db.query(func.sum(
-                func.extract('epoch', SeatUsage.check_out_time - SeatUsage.check_in_time) / 60
-            )).filter(SeatUsage.member_id == member.member_id, SeatUsage.check_out_time != None).scalar()
-            seat_info["total_usage_minutes"] = int(total_usage) if total_usage else 0
-
         # Case C: 입실도 예약도 없는 경우 -> 빈 좌석 or 진짜 점검중
         else:
             # is_status가 False인데 사용자 정보가 없으면 '점검중'으로 표시됨 (프론트엔드 로직)
@@ -501,6 +541,15 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
 
         seat_list.append(seat_info)
 
+    # 해당 페이지 회원들의 TODO 수 / 누적 이용 시간을 한 번에 채운다
+    todo_counts, usage_minutes = member_aggregate_maps(
+        db, {info["member_id"] for info in seat_list if info["member_id"]}
+    )
+    for info in seat_list:
+        if info["member_id"]:
+            info["active_todo_count"] = todo_counts.get(info["member_id"], 0)
+            info["total_usage_minutes"] = int(usage_minutes.get(info["member_id"]) or 0)
+
     summary = {
         "total": total_seats,
         "used": used_seats,
@@ -509,9 +558,7 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
     }
     
     formatted_type_stats = []
-    for z in zones_def:
-        key = z["key"]
-        stat = zone_stats[key]
+    for key, stat in zone_stats.items():
         rate = round((stat["used"] / stat["total"]) * 100) if stat["total"] > 0 else 0
         formatted_type_stats.append({
             "type": key,
@@ -524,7 +571,8 @@ def get_seat_detail_stats(db: Session = Depends(get_db)):
     return {
         "summary": summary,
         "type_stats": formatted_type_stats,
-        "seats": seat_list
+        "seats": seat_list,
+        "page": {"zone": zone, "offset": offset, "limit": limit, "total": seat_count}
     }
 
 @router.put("/seats/{seat_id}/status")
@@ -542,40 +590,97 @@ def update_seat_status(
     
     return {"message": "좌석 상태가 변경되었습니다."}
 
+@router.get("/seats/layout")
+def get_seat_layouts(db: Session = Depends(get_db)):
+    """
+    [GET] 좌석 배치 정보 (구역 목록 + 좌석별 구역/층/좌표/카메라 매핑)
+    """
+    zones = db.query(SeatZone).order_by(SeatZone.floor, SeatZone.sort_order).all()
+    layouts = db.query(SeatLayout).order_by(SeatLayout.seat_id).all()
+
+    return {
+        "zones": [
+            {"zone_key": z.zone_key, "name": z.name, "floor": z.floor, "sort_order": z.sort_order, "is_fixed": z.is_fixed}
+            for z in zones
+        ],
+        "seats": [
+            {
+                "seat_id": l.seat_id, "zone_key": l.zone_key, "floor": l.floor,
+                "pos_x": l.pos_x, "pos_y": l.pos_y, "camera_id": l.camera_id, "camera_slot": l.camera_slot
+            }
+            for l in layouts
+        ]
+    }
+
+@router.put("/seats/{seat_id}/layout")
+def update_seat_layout(seat_id: int, layout_data: SeatLayoutUpdate, db: Session = Depends(get_db)):
+    """
+    [PUT] 좌석 배치 정보 수정 (없으면 생성)
+    """
+    seat = db.query(Seat).filter(Seat.seat_id == seat_id).first()
+    if not seat:
+        raise HTTPException(status_code=404, detail="좌석을 찾을 수 없습니다.")
+
+    update_data = layout_data.model_dump(exclude_unset=True)
+    if "zone_key" in update_data and not db.query(SeatZone).filter(SeatZone.zone_key == update_data["zone_key"]).first():
+        raise HTTPException(status_code=400, detail="존재하지 않는 구역입니다.")
+
+    layout = db.query(SeatLayout).filter(SeatLayout.seat_id == seat_id).first()
+    if not layout:
+        layout = SeatLayout(seat_id=seat_id, zone_key=update_data.get("zone_key", DEFAULT_ZONE_KEY))
+        db.add(layout)
+
+    for key, value in update_data.items():
+        setattr(layout, key, value)
+
+    db.commit()
+    invalidate_seat_layout()
+
+    return {"message": "좌석 배치 정보가 변경되었습니다."}
+
 # ----------------------------------------------------------------------------------------------------------------------
 # TODO MANAGEMENT
 # ----------------------------------------------------------------------------------------------------------------------
+def todo_count_subquery(db: Session):
+    """TODO별 참가자 수 / 달성자 수 (한 번의 GROUP BY)"""
+    return (
+        db.query(
+            UserTODO.todo_id,
+            func.count(UserTODO.user_todo_id).label("participant_count"),
+            func.count(UserTODO.user_todo_id).filter(UserTODO.is_achieved == True).label("achievement_count")
+        )
+        .group_by(UserTODO.todo_id)
+        .subquery()
+    )
+
+def build_todo_response(todo: TODO, p_count, a_count) -> TodoResponse:
+    return TodoResponse(
+        todo_id=todo.todo_id,
+        todo_type=todo.todo_type,
+        todo_title=todo.todo_title,
+        todo_content=todo.todo_content,
+        todo_value=todo.todo_value,
+        betting_mileage=todo.betting_mileage,
+        payback_mileage_percent=todo.payback_mileage_percent,
+        is_exposed=todo.is_exposed,
+        created_at=todo.created_at,
+        updated_at=todo.updated_at,
+        participant_count=p_count or 0,
+        achievement_count=a_count or 0
+    )
+
 @router.get("/todos", response_model=List[TodoResponse])
 def get_todos(db: Session = Depends(get_db)):
-    todos = db.query(TODO).order_by(TODO.created_at.desc()).all()
-    results = []
-    for todo in todos:
-        # 참가자 수
-        p_count = db.query(func.count(UserTODO.user_todo_id))\
-            .filter(UserTODO.todo_id == todo.todo_id).scalar()
-        
-        # 달성자 수 (is_achieved = True)
-        a_count = db.query(func.count(UserTODO.user_todo_id))\
-            .filter(
-                UserTODO.todo_id == todo.todo_id,
-                UserTODO.is_achieved == True
-            ).scalar()
-
-        results.append(TodoResponse(
-            todo_id=todo.todo_id,
-            todo_type=todo.todo_type,
-            todo_title=todo.todo_title,
-            todo_content=todo.todo_content,
-            todo_value=todo.todo_value,
-            betting_mileage=todo.betting_mileage,
-            payback_mileage_percent=todo.payback_mileage_percent,
-            is_exposed=todo.is_exposed,
-            created_at=todo.created_at,
-            updated_at=todo.updated_at,
-            participant_count=p_count or 0,
-            achievement_count=a_count or 0 
-        ))
-    return results
+    # TODO 개수와 무관하게 한 번의 쿼리로 참가자 / 달성자 수까지 조회
+    counts = todo_count_subquery(db)
+    rows = (
+        db.query(TODO, counts.c.participant_count, counts.c.achievement_count)
+        .outerjoin(counts, TODO.todo_id == counts.c.todo_id)
+        .order_by(TODO.created_at.desc())
+        .all()
+    )
+
+    return [build_todo_response(todo, p_count, a_count) for todo, p_count, a_count in rows]
 
 @router.post("/todos", response_model=TodoResponse)
 def create_todo(todo_data: TodoCreate, db: Session = Depends(get_db)):
@@ -611,15 +716,13 @@ def update_todo(todo_id: int, todo_data: TodoUpdate, db: Session = Depends(get_d
     db.commit()
     db.refresh(todo)
     
-    # Update 시에도 count 정보를 반환하기 위해 재계산
-    p_count = db.query(func.count(UserTODO.user_todo_id)).filter(UserTODO.todo_id == todo_id).scalar()
-    a_count = db.query(func.count(UserTODO.user_todo_id)).filter(UserTODO.todo_id == todo_id, UserTODO.is_achieved == True).scalar()
+    # Update 시에도 count 정보를 반환하기 위해 재계산 (단일 집계 쿼리)
+    p_count, a_count = db.query(
+        func.count(UserTODO.user_todo_id),
+        func.count(UserTODO.user_todo_id).filter(UserTODO.is_achieved == True)
+    ).filter(UserTODO.todo_id == todo_id).one()
 
-    return TodoResponse(
-        **todo.__dict__,
-        participant_count=p_count or 0,
-        achievement_count=a_count or 0
-    )
+    return build_todo_response(todo, p_count, a_count)
 
 @router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_todo(todo_id: int, db: Session = Depends(get_db)):
@@ -679,6 +782,8 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
 @router.get("/stats/members")
 def get_member_stats(db: Session = Depends(get_db)):
     now = datetime.now()
+    # 이번 달 구간 (created_at 인덱스를 쓰도록 범위 조건으로 조회)
+    month_start, month_end = resolve_sales_range(now.year, now.month)
     
     # 전체 회원 수 (관리자, 비회원 제외)
     total_members = db.query(Member).filter(
@@ -688,8 +793,8 @@ def get_member_stats(db: Session = Depends(get_db)):
     
     # 신규 회원 수
     new_members = db.query(Member).filter(
-        extract('year', Member.created_at) == now.year,
-        extract('month', Member.created_at) == now.month,
+        Member.created_at >= month_start,
+        Member.created_at < month_end,
         Member.is_deleted_at == False,
         Member.member_id.notin_([1, 2])
     ).count()
@@ -719,8 +824,8 @@ def get_member_stats(db: Session = Depends(get_db)):
     # 비회원(게스트) 이용 건수 (월간)
     non_members = db.query(distinct(Order.buyer_phone)).filter(
         Order.member_id == 2,
-        extract('year', Order.created_at) == now.year,
-        extract('month', Order.created_at) == now.month
+        Order.created_at >= month_start,
+        Order.created_at < month_end
     ).count()
     
     return {
@@ -730,4 +835,120 @@ def get_member_stats(db: Session = Depends(get_db)):
         "time_members": time_members,
         "current_users": current_users,
         "non_members": non_members
-    }
\ No newline at end of file
+    }
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SYSTEM METRICS
+# ----------------------------------------------------------------------------------------------------------------------
+@router.get("/metrics/jobs")
+def get_job_metrics(
+    hours: int = Query(24, ge=1, le=24 * 30, description="집계 기간 (시간)"),
+    limit: int = Query(20, ge=1, le=200, description="최근 실행 이력 개수"),
+    db: Session = Depends(get_db)
+):
+    """
+    [GET] 스케줄러 작업 실행 이력 및 지연시간
+    summary는 클러스터 전체(DB 기록), local_latency는 응답한 워커 프로세스 기준
+    """
+    since = datetime.now() - timedelta(hours=hours)
+
+    summary = (
+        db.query(
+            JobRunLog.job_name,
+            func.count(JobRunLog.run_id).label("runs"),
+            func.count(JobRunLog.run_id).filter(JobRunLog.status == "failed").label("failures"),
+            func.avg(JobRunLog.duration_ms).label("avg_ms"),
+            func.max(JobRunLog.duration_ms).label("max_ms"),
+            func.percentile_cont(0.95).within_group(JobRunLog.duration_ms).label("p95_ms"),
+            func.max(JobRunLog.started_at).label("last_run_at")
+        )
+        .filter(JobRunLog.started_at >= since)
+        .group_by(JobRunLog.job_name)
+        .all()
+    )
+
+    recent = (
+        db.query(JobRunLog)
+        .order_by(JobRunLog.started_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return {
+        "worker": worker_id(),
+        "summary": [
+            {
+                "job_name": row.job_name,
+                "runs": row.runs,
+                "failures": row.failures,
+                "avg_ms": round(float(row.avg_ms or 0), 2),
+                "max_ms": row.max_ms or 0,
+                "p95_ms": round(float(row.p95_ms or 0), 2),
+                "last_run_at": row.last_run_at
+            }
+            for row in summary
+        ],
+        "recent_runs": [
+            {
+                "job_name": run.job_name,
+                "owner": run.owner,
+                "status": run.status,
+                "started_at": run.started_at,
+                "duration_ms": run.duration_ms,
+                "error": run.error
+            }
+            for run in recent
+        ],
+        "local_latency": {name: hist.snapshot() for name, hist in job_latency.items()}
+    }
+
+@router.get("/metrics/db-pool")
+def get_db_pool_metrics():
+    """
+    [GET] DB 커넥션 풀 현황 (응답한 워커 프로세스 기준)
+    checked_out / overflow는 현재 값, 나머지는 프로세스 시작 이후 누적 값
+    """
+    return {
+        "worker": worker_id(),
+        "sync": pool_status(engine, InstrumentedQueuePool.metrics),
+        "async": pool_status(async_engine.sync_engine, InstrumentedAsyncQueuePool.metrics)
+    }
+
+@router.get("/metrics/statics-cache")
+def get_statics_cache_metrics():
+    """
+    [GET] 회원 통계 응답 캐시 현황 (응답한 워커 프로세스 기준 적중률)
+    """
+    return {
+        "worker": worker_id(),
+        **statics_cache.snapshot()
+    }
+
+@router.get("/metrics/embedding")
+def get_embedding_metrics():
+    """
+    [GET] 임베딩 서비스 배치 현황 / 임베딩 캐시 적중률 (응답한 워커 프로세스 기준)
+    avg_batch_size가 1에 가까우면 요청이 거의 묶이지 않고 있다는 뜻
+    """
+    return {
+        "worker": worker_id(),
+        "running": embedding_service.running,
+        "model": model_manager.status(),
+        "max_batch": embedding_service.max_batch,
+        "max_wait_ms": embedding_service.max_wait * 1000,
+        **embedding_service.metrics.snapshot(),
+        "cache": embedding_cache.snapshot()
+    }
+
+@router.get("/metrics/llm")
+def get_llm_metrics():
+    """
+    [GET] 플래너 LLM 토큰 캐시 / 호출 지연시간 (응답한 워커 프로세스 기준)
+    token_hits 대비 token_refreshes가 크면 토큰 캐시가 제대로 재사용되지 않는 것
+    intent: 라우터 LLM을 건너뛴 비율(fast_path_rate)과 LLM 라우터와의 일치율
+    """
+    return {
+        "worker": worker_id(),
+        **llm_manager.metrics.snapshot(),
+        "intent": intent_classifier.metrics.snapshot()
+    }
@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from database import get_db
-from models import Member, Product, Order, Seat, SeatUsage, MileageHistory, TODO, UserTODO
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_async_db
+from models import Member, Product, Order, Seat, SeatUsage, MileageHistory
 from schemas import PinAuthRequest
+from utils.todo_progress import evaluate_todos
+from utils.checkout_hooks import after_checkout, claim_checkout
+from utils.usage_rollup import add_focus_minutes
+from utils.cache import invalidate_statics_on_commit
+from utils.sales_cube import record_order
+from utils.seat_layout import get_seat_layout_async
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy import cast, Date, func, distinct
+from sqlalchemy import cast, Date, select
+from sqlalchemy.exc import IntegrityError
 import requests
 import time
 import base64
@@ -94,6 +102,15 @@ def trigger_camera_checkin(seat_id: int, usage_id: int):
     except Exception as e:
         print(f"[Warning] Camera check-in request failed: {e}")
 
+# ------------------------
+# [Helper] 입실 유니크 인덱스 위반 메시지
+# ------------------------
+def seat_claim_error_message(e: IntegrityError) -> str:
+    constraint = getattr(getattr(e.orig, "diag", None), "constraint_name", None)
+    if constraint == "uq_seat_usage_open_member":
+        return "이미 입실 중입니다."
+    return "이미 사용 중인 좌석입니다."
+
 # ------------------------
 # 전화번호 없이 비회원 조회 또는 생성
 # ------------------------
@@ -172,11 +189,13 @@ def member_login(data: PinAuthRequest, db: Session = Depends(get_db)):
 # 2) 이용권 목록 조회
 # ------------------------
 @router.get("/products")
-def list_products(db: Session = Depends(get_db)):
-    products = db.query(Product).filter(
-        Product.is_exposured == True,
-        Product.type == "시간제"
-    ).all()
+async def list_products(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(Product.product_id, Product.name, Product.type, Product.price, Product.value).filter(
+            Product.is_exposured == True,
+            Product.type == "시간제"
+        )
+    )
     return [
         {
             "product_id": p.product_id,
@@ -184,7 +203,7 @@ def list_products(db: Session = Depends(get_db)):
             "type": p.type,
             "price": p.price,
             "value": p.value
-        } for p in products
+        } for p in result.all()
     ]
 
 # ------------------------
@@ -245,9 +264,15 @@ def purchase_ticket(
         product_id=product_id,
         buyer_phone=phone,
         payment_amount=final_payment_amount,
+        used_mileage=use_mileage,
         created_at=datetime.now()
     )
     db.add(order)
+    db.flush()
+
+    # 일일 매출 집계 반영
+    record_order(db, order.order_id)
+
     db.commit()
     db.refresh(order)
 
@@ -268,18 +293,46 @@ def purchase_ticket(
 # 4) 좌석 목록 조회 (수정됨)
 # ------------------------
 @router.get("/seats")
-def list_seats(db: Session = Depends(get_db)):
-    seats = db.query(Seat).order_by(Seat.seat_id).all()
-    
-    results = []
+async def list_seats(db: AsyncSession = Depends(get_async_db)):
     now = datetime.now()
 
+    seats = (await db.execute(select(Seat).order_by(Seat.seat_id))).scalars().all()
+    layout = await get_seat_layout_async(db)
+
+    # 현재 입실 중인 이용 기록 (좌석별)
+    active_rows = (await db.execute(
+        select(SeatUsage, Member)
+        .outerjoin(Member, SeatUsage.member_id == Member.member_id)
+        .filter(SeatUsage.check_out_time == None)
+    )).all()
+    active_map = {}
+    for usage, member in active_rows:
+        active_map.setdefault(usage.seat_id, (usage, member))
+
+    # 좌석별 유효한 고정석 주문 중 만료일이 가장 늦은 것 1건
+    fixed_rows = (await db.execute(
+        select(Order, Member)
+        .outerjoin(Member, Order.member_id == Member.member_id)
+        .filter(
+            Order.fixed_seat_id != None,
+            Order.period_end_date > now
+        )
+        .order_by(Order.fixed_seat_id, Order.period_end_date.desc())
+        .distinct(Order.fixed_seat_id)
+    )).all()
+    fixed_map = {order.fixed_seat_id: (order, owner) for order, owner in fixed_rows}
+
+    results = []
+
     for s in seats:
         seat_type_str = "기간제" if s.type == "fix" else "자유석"
 
         seat_data = {
             "seat_id": s.seat_id,
             "type": seat_type_str,
+            "zone_key": layout.zone_of(s.seat_id),
+            "zone_name": layout.zone_name(layout.zone_of(s.seat_id)),
+            "floor": layout.seat_floor.get(s.seat_id, 1),
             "near_window": s.near_window,
             "corner_seat": s.corner_seat,
             "aisle_seat": s.aisle_seat,
@@ -294,21 +347,15 @@ def list_seats(db: Session = Depends(get_db)):
             "role": None
         }
 
+        fixed_order, fixed_owner = fixed_map.get(s.seat_id, (None, None))
+
         # 1. 고정석(fix)인 경우, 유효한 주인 및 만료일 확인
         fixed_owner_name = None
         fixed_expire_time = None
 
-        if s.type == "fix":
-            active_fixed_order = db.query(Order).filter(
-                Order.fixed_seat_id == s.seat_id,
-                Order.period_end_date > now
-            ).order_by(Order.period_end_date.desc()).first()
-            
-            if active_fixed_order:
-                owner_member = db.query(Member).filter(Member.member_id == active_fixed_order.member_id).first()
-                if owner_member:
-                    fixed_owner_name = owner_member.name
-                    fixed_expire_time = active_fixed_order.period_end_date
+        if s.type == "fix" and fixed_owner:
+            fixed_owner_name = fixed_owner.name
+            fixed_expire_time = fixed_order.period_end_date
 
         # 2. 실제 입실 중인지 확인
         if s.is_status: # 물리적으로 비어있음
@@ -320,41 +367,29 @@ def list_seats(db: Session = Depends(get_db)):
                 seat_data["ticket_expired_time"] = fixed_expire_time
         
         # 입실 중인 경우
+        elif s.seat_id in active_map:
+            active_usage, member = active_map[s.seat_id]
+            if member:
+                seat_data["user_name"] = member.name
+                seat_data["role"] = member.role
+
+            if active_usage.ticket_expired_time:
+                seat_data["ticket_expired_time"] = active_usage.ticket_expired_time
+                remain_delta = active_usage.ticket_expired_time - now
+                minutes = int(remain_delta.total_seconds() / 60)
+                seat_data["remaining_time"] = max(minutes, 0)
         else:
-            active_usage = db.query(SeatUsage).filter(
-                SeatUsage.seat_id == s.seat_id,
-                SeatUsage.check_out_time == None
-            ).first()
-
-            if active_usage:
-                member = db.query(Member).filter(Member.member_id == active_usage.member_id).first()
-                if member:
-                    seat_data["user_name"] = member.name
-                    seat_data["role"] = member.role
-                
-                if active_usage.ticket_expired_time:
-                    seat_data["ticket_expired_time"] = active_usage.ticket_expired_time
-                    remain_delta = active_usage.ticket_expired_time - now
-                    minutes = int(remain_delta.total_seconds() / 60)
-                    seat_data["remaining_time"] = max(minutes, 0)
+            # [수정] 실제 이용(SeatUsage) 기록이 없으면, 실제 입실 상태가 아님을 명시
+            seat_data["is_real_checkin"] = False
+
+            # 입실은 안 했지만, 기간제/고정석 예약이 있는 경우 확인
+            if fixed_order:
+                if fixed_owner:
+                    seat_data["user_name"] = fixed_owner.name # 예약자 이름 표시
+                    seat_data["role"] = "member"
+                    seat_data["ticket_expired_time"] = fixed_order.period_end_date
             else:
-                # [수정] 실제 이용(SeatUsage) 기록이 없으면, 실제 입실 상태가 아님을 명시
-                seat_data["is_real_checkin"] = False
-
-                # 입실은 안 했지만, 기간제/고정석 예약이 있는 경우 확인
-                reserved_order = db.query(Order).filter(
-                    Order.fixed_seat_id == s.seat_id,
-                    Order.period_end_date > now
-                ).order_by(Order.period_end_date.desc()).first()
-
-                if reserved_order:
-                    owner = db.query(Member).filter(Member.member_id == reserved_order.member_id).first()
-                    if owner:
-                        seat_data["user_name"] = owner.name # 예약자 이름 표시
-                        seat_data["role"] = "member"
-                        seat_data["ticket_expired_time"] = reserved_order.period_end_date
-                else:
-                    seat_data["user_name"] = "점검중" # 예약도 없고 입실도 없으면 점검중
+                seat_data["user_name"] = "점검중" # 예약도 없고 입실도 없으면 점검중
         
         results.append(seat_data)
 
@@ -380,14 +415,13 @@ def check_in(
     
     member_id_to_use = member.member_id
 
-    # 이미 다른 좌석에 입실 중인지 확인
-    if member.role != "guest":
-        active_usage = db.query(SeatUsage).filter(SeatUsage.member_id == member_id_to_use, SeatUsage.check_out_time == None).first()
-        if active_usage:
-            raise HTTPException(status_code=400, detail="이미 입실 중입니다.")
-
-    seat = db.query(Seat).filter(Seat.seat_id == seat_id).first()
-    if not seat: raise HTTPException(status_code=404, detail="좌석 정보 없음")
+    # 좌석 행 잠금 (다른 키오스크가 같은 좌석을 처리 중이면 기다리지 않고 바로 실패)
+    # 회원 중복 입실/좌석 중복 점유는 seat_usage 부분 유니크 인덱스가 최종적으로 막는다
+    seat = db.query(Seat).filter(Seat.seat_id == seat_id).with_for_update(skip_locked=True).first()
+    if not seat:
+        if db.query(Seat.seat_id).filter(Seat.seat_id == seat_id).first():
+            raise HTTPException(status_code=409, detail="다른 키오스크에서 입실 처리 중인 좌석입니다.")
+        raise HTTPException(status_code=404, detail="좌석 정보 없음")
     
     # [수정] 고정석 입실 시, '이미 사용 중' 체크 로직 개선
     # 본인이 주인인 고정석이면 입실 허용, 남이 주인으면 차단
@@ -455,7 +489,11 @@ def check_in(
     seat.is_status = False
     db.add(seat)
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=seat_claim_error_message(e))
     db.refresh(usage)
 
     trigger_camera_checkin(seat_id, usage.usage_id)
@@ -504,8 +542,11 @@ def check_out(
             if member.pin_code != pin: raise HTTPException(status_code=401, detail="PIN 번호가 일치하지 않습니다.")
 
     if not force:
+        # 카메라 응답을 기다리는 동안(최대 수 초) DB 커넥션을 쥐고 있지 않도록 트랜잭션을 먼저 끝낸다
+        usage_id = usage.usage_id
+        db.commit()
         try:
-            is_detected, img_path, classes, msg = capture_predict(seat_id, usage.usage_id)
+            is_detected, img_path, classes, msg = capture_predict(seat_id, usage_id)
             if is_detected:
                 web_image_url = img_path.replace("\\", "/") if img_path else ""
 
@@ -524,6 +565,11 @@ def check_out(
             if isinstance(e, HTTPException): raise e
             print(f"[Warning] YOLO Error: {e}")
 
+    # 카메라를 기다리는 동안 중복 요청 / 자동 퇴실 / 관리자 강제 퇴실이 먼저 처리했으면 여기서 멈춘다
+    if not claim_checkout(db, usage, now):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="이미 퇴실 처리된 이용 기록입니다.")
+
     time_used = now - usage.check_in_time
     time_used_minutes = int(time_used.total_seconds() / 60)
     
@@ -549,8 +595,6 @@ def check_out(
             if member.saved_time_minute < 0:
                 member.saved_time_minute = 0 
     
-    usage.check_out_time = now
-    
     if seat:
         seat.is_status = True
         db.add(seat)
@@ -559,63 +603,14 @@ def check_out(
     db.add(member)
     db.flush() 
 
+    # 도전 누적치 / 일일 이용 집계 반영
+    after_checkout(db, usage, seat)
+
     todo_results = []
     
     if member.role != "guest":
-        active_todos = db.query(UserTODO).join(TODO).filter(
-            UserTODO.member_id == member.member_id,
-            UserTODO.is_achieved == False
-        ).all()
-
-        for user_todo in active_todos:
-            todo_def = user_todo.todos
-            is_cleared = False
-            current_val = 0
-            
-            if todo_def.todo_type == 'time':
-                total_seconds = db.query(func.sum(
-                    func.extract('epoch', SeatUsage.check_out_time - SeatUsage.check_in_time)
-                )).filter(
-                    SeatUsage.member_id == member.member_id,
-                    SeatUsage.check_out_time != None,
-                    SeatUsage.check_in_time >= user_todo.started_at
-                ).scalar() or 0
-                
-                current_val = int(total_seconds / 60)
-                if current_val >= todo_def.todo_value:
-                    is_cleared = True
-
-            elif todo_def.todo_type == 'attendance':
-                attend_count = db.query(func.count(distinct(cast(SeatUsage.check_in_time, Date)))).filter(
-                    SeatUsage.member_id == member.member_id,
-                    SeatUsage.is_attended == True,
-                    SeatUsage.check_in_time >= user_todo.started_at
-                ).scalar() or 0
-                
-                current_val = attend_count
-                if current_val >= todo_def.todo_value:
-                    is_cleared = True
-
-            reward_amount = 0
-            if is_cleared:
-                user_todo.is_achieved = True
-                user_todo.achieved_at = now
-                
-                payback_rate = 1 + (todo_def.payback_mileage_percent / 100.0)
-                reward_amount = int(todo_def.betting_mileage * payback_rate)
-                
-                if reward_amount > 0:
-                    member.total_mileage += reward_amount
-                    db.add(MileageHistory(member_id=member.member_id, amount=reward_amount, type="prize"))
-            
-            todo_results.append({
-                "title": todo_def.todo_title,
-                "type": todo_def.todo_type,
-                "goal_value": todo_def.todo_value,
-                "current_value": current_val,
-                "is_achieved_now": is_cleared,
-                "reward_amount": reward_amount
-            })
+        # 누적치로 달성 판정 (이용 이력 전체를 다시 집계하지 않음)
+        todo_results = evaluate_todos(db, member, now)
 
     db.commit()
     db.refresh(usage)
@@ -652,6 +647,10 @@ def checktime_seat(payload: dict = Body(...), db: Session = Depends(get_db)):
         current = seatusage.total_in_time or 0
         seatusage.total_in_time = current + int(minutes)
 
+        # 이미 퇴실한 이용 기록이면 일일 집계에도 반영 (+ 통계 캐시 무효화)
+        add_focus_minutes(db, seatusage, int(minutes))
+        invalidate_statics_on_commit(db, seatusage.member_id)
+
         db.commit()
         db.refresh(seatusage)
 
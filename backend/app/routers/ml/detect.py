@@ -5,6 +5,8 @@ from fastapi.params import Body
 from sqlalchemy.sql import func
 from database import get_db
 from models import Member, Product, Order, Seat, SeatUsage
+from utils.usage_rollup import add_focus_minutes
+from utils.cache import invalidate_statics_on_commit
 import os
 import base64
 from datetime import datetime
@@ -177,6 +179,10 @@ def checktime_seat(payload: CheckTimePayload, db: Session = Depends(get_db)) :
         current = seatusage.total_in_time or 0
         seatusage.total_in_time = current + int(data["minutes"])
 
+        # 이미 퇴실한 이용 기록이면 일일 집계에도 반영 (+ 통계 캐시 무효화)
+        add_focus_minutes(db, seatusage, int(data["minutes"]))
+        invalidate_statics_on_commit(db, seatusage.member_id)
+
         db.commit()
         db.refresh(seatusage)
 
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
 import random
-from typing import Optional
-from database import get_db
-from models import Member, Seat, SeatUsage
-from datetime import datetime, timedelta
+import numpy as np
+from database import get_async_db
+from models import Member, Seat, SeatUsage, MemberDailyUsage
+from utils.usage_rollup import classify_seat_type
+from utils.cache import statics_cache
+from datetime import date, datetime, timedelta
 from collections import Counter, defaultdict
 
 router = APIRouter(prefix="/api/statics", tags=["Statistics services"])
@@ -110,12 +113,11 @@ WEEKDAY_LABELS = {
 }
 
 
-def ensure_valid_member(member_id: int, db: Session) -> None:
-    user = (
-        db.query(Member.member_id)
+async def ensure_valid_member(member_id: int, db: AsyncSession) -> None:
+    user = (await db.execute(
+        select(Member.member_id)
         .filter(Member.member_id == member_id, Member.is_deleted_at == False)
-        .first()
-    )
+    )).first()
     if member_id < MIN_VALID_MEMBER_ID or not user:
         raise HTTPException(status_code=400, detail="유효하지 않은 회원 ID입니다")
 
@@ -140,11 +142,13 @@ def determine_trend_type(recent_ratio: dict, past_ratio: dict) -> str:
     return trend[0][0]
 
 
-def pick_messages(seat_type: str) -> dict:
+def pick_messages(seat_type: str, seed: int) -> dict:
+    # 캐시 항목마다 같은 메시지가 나오도록 시드 고정
+    rng = random.Random(seed)
     data = SEAT_TYPE_MESSAGES.get(seat_type, SEAT_TYPE_MESSAGES["일반석"])
     return {
-        "analysis": random.choice(data["analysis"]),
-        "coaching": random.choice(data["coaching"]),
+        "analysis": rng.choice(data["analysis"]),
+        "coaching": rng.choice(data["coaching"]),
     }
 
 
@@ -193,71 +197,121 @@ def aggregate_seat_attr(rows: list, total_count: int):
     return seat_attr, top_type
 
 
-def aggregate_time_stats(usages: list, start_time: datetime) -> dict:
-    total_usage = 0.0
-    focus_time = 0.0
+DAILY_COLUMNS = (
+    MemberDailyUsage.usage_date,
+    MemberDailyUsage.session_count,
+    MemberDailyUsage.usage_minutes,
+    MemberDailyUsage.focus_minutes,
+    MemberDailyUsage.best_focus_minutes,
+    MemberDailyUsage.hour_focus,
+)
 
-    for usage in usages:
-        if usage.check_in_time < start_time:
-            continue
-        duration = (usage.check_out_time - usage.check_in_time).total_seconds() / 60.0
-        if duration > 0:
-            total_usage += duration
-        focus_time += usage.total_in_time or 0
 
-    focus_ratio = round(focus_time / total_usage, 2) if total_usage else 0.0
+async def load_daily_columns(db: AsyncSession, member_id: int, start_date: date) -> dict:
+    # ORM 객체 대신 필요한 컬럼만 읽어 배열로 변환 (일자 오름차순, 최대 31행)
+    rows = (await db.execute(
+        select(*DAILY_COLUMNS)
+        .filter(
+            MemberDailyUsage.member_id == member_id,
+            MemberDailyUsage.usage_date >= start_date,
+        )
+        .order_by(MemberDailyUsage.usage_date)
+    )).all()
+
+    days, sessions, usage, focus, best, hours = zip(*rows) if rows else ((),) * 6
+    return {
+        "day": np.array([d.toordinal() for d in days], dtype=np.int64),
+        "sessions": np.array(sessions, dtype=np.int64),
+        "usage": np.array(usage, dtype=np.float64),
+        "focus": np.array(focus, dtype=np.float64),
+        "best": np.array(best, dtype=np.float64),
+        "hour_focus": np.array(hours, dtype=np.float64).reshape(-1, 24),
+    }
+
+
+def summarize_period(usage: np.ndarray, focus: np.ndarray) -> dict:
+    total_usage = float(usage.sum())
+    focus_time = float(focus.sum())
     return {
         "total_usage_minute": round(total_usage, 2),
         "focus_time_minute": round(focus_time, 2),
-        "focus_ratio": focus_ratio,
+        "focus_ratio": round(focus_time / total_usage, 2) if total_usage else 0.0,
     }
 
 
-def load_usages_since(db: Session, member_id: int, start_time: datetime):
-    return (
-        db.query(SeatUsage)
-        .filter(
-            SeatUsage.member_id == member_id,
-            SeatUsage.check_out_time.isnot(None),
-            SeatUsage.check_in_time >= start_time,
-        )
-        .all()
-    )
+def longest_run(days: np.ndarray) -> int:
+    # 정렬된 고유 일자 배열에서 연속 구간의 최대 길이
+    if not days.size:
+        return 0
+    breaks = np.flatnonzero(np.diff(days) != 1) + 1
+    bounds = np.concatenate(([0], breaks, [days.size]))
+    return int(np.diff(bounds).max())
+
+
+def compute_usage_metrics(cols: dict, today: date) -> dict:
+    """일일 집계 배열로 통계 API의 모든 지표를 한 번에 계산 (최근 30일 데이터 기준)"""
+    t = today.toordinal()
+    day, usage, focus = cols["day"], cols["usage"], cols["focus"]
+    week = day >= t - 7
+    prev_week = (day >= t - 14) & ~week
+
+    # 최근 7일 일자별 사용/집중 (오늘 제외, 기존 화면과 같은 구간)
+    offsets = day - (t - 7)
+    in_range = week & (offsets < 7)
+    day_usage = np.zeros(7)
+    day_focus = np.zeros(7)
+    day_usage[offsets[in_range]] = usage[in_range]
+    day_focus[offsets[in_range]] = focus[in_range]
+    days = []
+    for i in range(7):
+        day_date = date.fromordinal(t - 7 + i)
+        days.append({
+            "date": day_date.isoformat(),
+            "weekday": WEEKDAY_LABELS[day_date.weekday()],
+            "usage_minute": round(float(day_usage[i]), 2),
+            "focus_minute": round(float(day_focus[i]), 2),
+        })
+
+    # 이번 주 집중 비율이 가장 높은 요일
+    week_usage, week_focus = usage[week], focus[week]
+    ratios = np.divide(week_focus, week_usage, out=np.zeros_like(week_focus), where=week_usage > 0)
+    if ratios.size and ratios.max() > 0:
+        best_idx = int(ratios.argmax())
+        top_day = {
+            "day": WEEKDAY_LABELS[date.fromordinal(int(day[week][best_idx])).weekday()],
+            "focus_ratio": round(float(ratios[best_idx]), 2),
+        }
+    else:
+        top_day = {"day": None, "focus_ratio": 0.0}
+
+    # 이번 주 입실 시각별 집중 시간 합계가 가장 큰 시간대
+    hour_totals = cols["hour_focus"][week].sum(axis=0)
+    if hour_totals.size and hour_totals.max() > 0:
+        top_hour = int(hour_totals.argmax())
+        top_focus_hour = {"hour": top_hour, "total_focus_minute": round(float(hour_totals[top_hour]), 2)}
+    else:
+        top_focus_hour = {"hour": None, "total_focus_minute": 0.0}
+
+    session_count = int(cols["sessions"].sum())
+    best_idx = int(cols["best"].argmax()) if cols["best"].size else None
+    week_focus_total = float(week_focus.sum())
 
-# seat type 문자열 함수
-def classify_seat_type(seat):
-    if seat.near_window:
-        return "창가석"
-    if seat.corner_seat:
-        return "코너석"
-    if seat.aisle_seat:
-        return "통로석"
-    if seat.isolated:
-        return "고립석"
-    if seat.near_beverage_table:
-        return "음료바근처"
-    if seat.is_center:
-        return "중앙석"
-    return "일반석"
-
-
-def minutes_between(usage: SeatUsage) -> float:
-    if not usage.check_in_time or not usage.check_out_time:
-        return 0.0
-    duration = (usage.check_out_time - usage.check_in_time).total_seconds() / 60.0
-    return max(duration, 0.0)
-
-
-def sum_focus_within(usages: list, start_time: datetime, end_time: Optional[datetime] = None) -> float:
-    total = 0.0
-    for usage in usages:
-        check_in = usage.check_in_time
-        if check_in < start_time:
-            continue
-        if end_time and check_in >= end_time:
-            continue
-        total += usage.total_in_time or 0
-    return total
+    return {
+        "weekly": summarize_period(week_usage, week_focus),
+        "monthly": summarize_period(usage, focus),
+        "days": days,
+        "session_count": session_count,
+        "average_focus_minute": round(float(focus.sum()) / session_count, 2) if session_count else 0.0,
+        "best_record": {
+            "minute": round(float(cols["best"][best_idx]), 2),
+            "date": date.fromordinal(int(day[best_idx])).isoformat(),
+        } if best_idx is not None else {"minute": 0.0, "date": None},
+        "weekly_difference": round(week_focus_total - float(focus[prev_week].sum()), 2),
+        "top_focus_day": top_day,
+        "top_focus_hour": top_focus_hour,
+        "avg_daily_focus_minute": round(week_focus_total / 7, 2),
+        "longest_streak_days": longest_run(day[cols["sessions"] > 0]),
+    }
 
 
 def build_trend_message(trend: str, difference: float) -> dict:
@@ -278,104 +332,24 @@ def build_trend_message(trend: str, difference: float) -> dict:
     }
 
 
-def calculate_best_focus_day(usages: list) -> dict:
-    daily_stats = defaultdict(lambda: {"focus": 0.0, "usage": 0.0})
-    for usage in usages:
-        day_key = usage.check_in_time.date()
-        daily_stats[day_key]["focus"] += usage.total_in_time or 0
-        daily_stats[day_key]["usage"] += minutes_between(usage)
-
-    best_day = None
-    best_ratio = 0.0
-    for day, stat in daily_stats.items():
-        if not stat["usage"]:
-            continue
-        ratio = stat["focus"] / stat["usage"]
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_day = day
-
-    if not best_day:
-        return {"day": None, "focus_ratio": 0.0}
-
-    return {
-        "day": WEEKDAY_LABELS[best_day.weekday()],
-        "focus_ratio": round(best_ratio, 2),
-    }
-
-
-def calculate_top_focus_hour(usages: list) -> dict:
-    hourly_focus = defaultdict(float)
-    for usage in usages:
-        hour = usage.check_in_time.hour
-        hourly_focus[hour] += usage.total_in_time or 0
-
-    if not hourly_focus:
-        return {"hour": None, "total_focus_minute": 0.0}
-
-    top_hour, total_focus = max(hourly_focus.items(), key=lambda item: item[1])
-    return {"hour": top_hour, "total_focus_minute": round(total_focus, 2)}
-
-
-def calculate_average_daily_focus(total_focus: float, days: int) -> float:
-    return round(total_focus / days, 2) if days else 0.0
-
-
-def calculate_longest_streak(usages: list) -> int:
-    dates = sorted({usage.check_in_time.date() for usage in usages})
-    if not dates:
-        return 0
-
-    longest = 1
-    current = 1
-    previous = dates[0]
-
-    for day in dates[1:]:
-        if day == previous + timedelta(days=1):
-            current += 1
-        else:
-            current = 1
-        longest = max(longest, current)
-        previous = day
-
-    return longest
-
-
-def aggregate_daily_usage(usages: list, start_time: datetime, days: int = 7) -> list:
-    end_time = start_time + timedelta(days=days)
-    daily_data = defaultdict(lambda: {"usage": 0.0, "focus": 0.0})
-
-    for usage in usages:
-        check_in = usage.check_in_time
-        if check_in < start_time or check_in >= end_time:
-            continue
-        day_key = check_in.date()
-        daily_data[day_key]["usage"] += minutes_between(usage)
-        daily_data[day_key]["focus"] += usage.total_in_time or 0
-
-    day_stats = []
-    for i in range(days):
-        day_date = (start_time + timedelta(days=i)).date()
-        stats = daily_data.get(day_date, {"usage": 0.0, "focus": 0.0})
-        day_stats.append(
-            {
-                "date": day_date.isoformat(),
-                "weekday": WEEKDAY_LABELS[day_date.weekday()],
-                "usage_minute": round(stats["usage"], 2),
-                "focus_minute": round(stats["focus"], 2),
-            }
-        )
+async def respond_cached(endpoint: str, member_id: int, build) -> JSONResponse:
+    # 통계는 회원이 퇴실하거나 집중 시간이 갱신될 때만 바뀌므로 회원/날짜 단위로 캐시
+    # (무효화는 utils.cache.invalidate_statics_on_commit, 퇴실/checktime 커밋 직후)
+    # 회원 세대를 원본 계산 전에 읽어 두므로, 계산 중에 커밋된 변경은 다음 조회에서 다시 계산된다
+    today = datetime.utcnow().date()
+    entry = await statics_cache.entry(member_id, endpoint, today)
 
-    return day_stats
+    content = await statics_cache.get(entry)
+    if content is None:
+        content = await build(today, entry.seed)
+        await statics_cache.set(entry, content)
 
+    return JSONResponse(status_code=200, content=content)
 
-"""좌석 통계 API"""
-@router.get("/seats")
-def seat_statistics(member_id: int, db: Session = Depends(get_db)):
-    ensure_valid_member(member_id, db)
 
-    rows = (
-        db.query(SeatUsage, Seat)
+async def build_seat_statistics(db: AsyncSession, member_id: int, today: date, seed: int) -> dict:
+    rows = (await db.execute(
+        select(SeatUsage, Seat)
         .join(Seat, SeatUsage.seat_id == Seat.seat_id)
         .filter(
             SeatUsage.member_id == member_id,
@@ -383,96 +357,58 @@ def seat_statistics(member_id: int, db: Session = Depends(get_db)):
         )
         .order_by(SeatUsage.check_in_time.desc())
         .limit(20)
-        .all()
-    )
+    )).all()
 
     total_count = len(rows)
     if total_count <= 10:
-        return JSONResponse(
-            status_code=200,
-            content={
-                "frequently_seat_use": [],
-                "seat_attr": [],
-                "message": {
-                    "analysis": "아직 사용량이 적어 좌석을 제시해드릴 수 없어요",
-                    "coaching": "더 많은 사용을 통해 취향에 맞는 좌석을 추천해드릴께요",
-                },
+        return {
+            "frequently_seat_use": [],
+            "seat_attr": [],
+            "message": {
+                "analysis": "아직 사용량이 적어 좌석을 제시해드릴 수 없어요",
+                "coaching": "더 많은 사용을 통해 취향에 맞는 좌석을 추천해드릴께요",
             },
-        )
+        }
 
     frequently_seat_use = calculate_frequently_used_seats(rows)
     seat_attr, top_type = aggregate_seat_attr(rows, total_count)
 
-    return JSONResponse(
-        status_code=200,
-        content={
-            "frequently_seat_use": frequently_seat_use,
-            "seat_attr": seat_attr,
-            "message": pick_messages(top_type),
-        },
-    )
-
-
-@router.get("/times")
-def time_statistics(member_id: int, db: Session = Depends(get_db)):
-    ensure_valid_member(member_id, db)
-
-    now = datetime.utcnow()
-    week_start = now - timedelta(days=7)
-    month_start = now - timedelta(days=30)
-
-    usages = load_usages_since(db, member_id, month_start)
-    weekly_stats = aggregate_time_stats(usages, week_start)
-    monthly_stats = aggregate_time_stats(usages, month_start)
-    daily_stats = aggregate_daily_usage(usages, week_start)
-
-    return JSONResponse(
-        status_code=200,
-        content={
-            "weekly": weekly_stats,
-            "monthly": monthly_stats,
-            "days": daily_stats,
-        },
-    )
+    return {
+        "frequently_seat_use": frequently_seat_use,
+        "seat_attr": seat_attr,
+        "message": pick_messages(top_type, seed),
+    }
 
 
-@router.get("/seat/analysis")
-def seat_analysis(member_id: int, db: Session = Depends(get_db)):
-    ensure_valid_member(member_id, db)
+async def load_usage_metrics(db: AsyncSession, member_id: int, today: date) -> dict:
+    cols = await load_daily_columns(db, member_id, today - timedelta(days=30))
+    return compute_usage_metrics(cols, today)
 
-    now = datetime.utcnow()
-    month_start = now - timedelta(days=30)
-    usages = load_usages_since(db, member_id, month_start)
 
-    if not usages:
-        empty_message = {
-            "analysis": "아직 집중 기록이 부족해 패턴을 분석하기 어려워요.",
-            "coaching": "조금 더 자주 이용하면 맞춤형 코칭을 전해드릴 수 있어요.",
-        }
-        return JSONResponse(
-            status_code=200,
-            content={
-                "average_focus_minute": 0.0,
-                "best_record": {"minute": 0.0, "date": None},
-                "weekly_change": {"difference_minute": 0.0, "trend": "flat"},
-                "message": empty_message,
-            },
-        )
+async def build_time_statistics(db: AsyncSession, member_id: int, today: date, seed: int) -> dict:
+    metrics = await load_usage_metrics(db, member_id, today)
+    return {
+        "weekly": metrics["weekly"],
+        "monthly": metrics["monthly"],
+        "days": metrics["days"],
+    }
 
-    focus_values = [usage.total_in_time or 0 for usage in usages]
-    total_focus = sum(focus_values)
-    average_focus = round(total_focus / len(focus_values), 2) if focus_values else 0.0
 
-    best_usage = max(usages, key=lambda u: u.total_in_time or 0)
-    best_minutes = round(best_usage.total_in_time or 0, 2)
-    best_date = best_usage.check_in_time.strftime("%Y-%m-%d") if best_usage.check_in_time else None
+async def build_seat_analysis(db: AsyncSession, member_id: int, today: date, seed: int) -> dict:
+    metrics = await load_usage_metrics(db, member_id, today)
 
-    current_week_start = now - timedelta(days=7)
-    previous_week_start = now - timedelta(days=14)
-    current_week_focus = sum_focus_within(usages, current_week_start)
-    previous_week_focus = sum_focus_within(usages, previous_week_start, current_week_start)
-    difference = round(current_week_focus - previous_week_focus, 2)
+    if not metrics["session_count"]:
+        return {
+            "average_focus_minute": 0.0,
+            "best_record": {"minute": 0.0, "date": None},
+            "weekly_change": {"difference_minute": 0.0, "trend": "flat"},
+            "message": {
+                "analysis": "아직 집중 기록이 부족해 패턴을 분석하기 어려워요.",
+                "coaching": "조금 더 자주 이용하면 맞춤형 코칭을 전해드릴 수 있어요.",
+            },
+        }
 
+    difference = metrics["weekly_difference"]
     if difference > 0:
         trend = "increase"
     elif difference < 0:
@@ -480,39 +416,52 @@ def seat_analysis(member_id: int, db: Session = Depends(get_db)):
     else:
         trend = "flat"
 
-    return JSONResponse(
-        status_code=200,
-        content={
-            "average_focus_minute": average_focus,
-            "best_record": {"minute": best_minutes, "date": best_date},
-            "weekly_change": {"difference_minute": difference, "trend": trend},
-            "message": build_trend_message(trend, difference),
-        },
+    return {
+        "average_focus_minute": metrics["average_focus_minute"],
+        "best_record": metrics["best_record"],
+        "weekly_change": {"difference_minute": difference, "trend": trend},
+        "message": build_trend_message(trend, difference),
+    }
+
+
+async def build_seat_pattern(db: AsyncSession, member_id: int, today: date, seed: int) -> dict:
+    metrics = await load_usage_metrics(db, member_id, today)
+    return {
+        "top_focus_day": metrics["top_focus_day"],
+        "top_focus_hour": metrics["top_focus_hour"],
+        "avg_daily_focus_minute": metrics["avg_daily_focus_minute"],
+        "longest_streak_days": metrics["longest_streak_days"],
+    }
+
+
+"""좌석 통계 API"""
+@router.get("/seats")
+async def seat_statistics(member_id: int, db: AsyncSession = Depends(get_async_db)):
+    await ensure_valid_member(member_id, db)
+    return await respond_cached(
+        "seats", member_id, lambda today, seed: build_seat_statistics(db, member_id, today, seed)
+    )
+
+
+@router.get("/times")
+async def time_statistics(member_id: int, db: AsyncSession = Depends(get_async_db)):
+    await ensure_valid_member(member_id, db)
+    return await respond_cached(
+        "times", member_id, lambda today, seed: build_time_statistics(db, member_id, today, seed)
+    )
+
+
+@router.get("/seat/analysis")
+async def seat_analysis(member_id: int, db: AsyncSession = Depends(get_async_db)):
+    await ensure_valid_member(member_id, db)
+    return await respond_cached(
+        "seat_analysis", member_id, lambda today, seed: build_seat_analysis(db, member_id, today, seed)
     )
 
 
 @router.get("/seat/pattern")
-def seat_pattern(member_id: int, db: Session = Depends(get_db)):
-    ensure_valid_member(member_id, db)
-
-    now = datetime.utcnow()
-    month_start = now - timedelta(days=30)
-    week_start = now - timedelta(days=7)
-    usages = load_usages_since(db, member_id, month_start)
-    week_usages = [usage for usage in usages if usage.check_in_time >= week_start]
-
-    best_focus_day = calculate_best_focus_day(week_usages)
-    top_focus_hour = calculate_top_focus_hour(week_usages)
-    total_week_focus = sum(usage.total_in_time or 0 for usage in week_usages)
-    avg_daily_focus = calculate_average_daily_focus(total_week_focus, 7)
-    longest_streak = calculate_longest_streak(usages)
-
-    return JSONResponse(
-        status_code=200,
-        content={
-            "top_focus_day": best_focus_day,
-            "top_focus_hour": top_focus_hour,
-            "avg_daily_focus_minute": avg_daily_focus,
-            "longest_streak_days": longest_streak,
-        },
+async def seat_pattern(member_id: int, db: AsyncSession = Depends(get_async_db)):
+    await ensure_valid_member(member_id, db)
+    return await respond_cached(
+        "seat_pattern", member_id, lambda today, seed: build_seat_pattern(db, member_id, today, seed)
     )
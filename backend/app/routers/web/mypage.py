@@ -5,6 +5,7 @@ from database import get_db
 from models import Product, Member, Order, Seat, MileageHistory, SeatUsage, UserTODO, TODO
 from utils.auth_utils import get_cookies_info, password_encode, password_decode
 from schemas import ModifyEmail, ModifyPin, TodoSelectReq, CheckOrModifyPw
+from utils.todo_progress import current_value as todo_current_value
 from datetime import datetime
 
 router = APIRouter(prefix="/api/web/mypage", tags=["마이페이지"])
@@ -30,29 +31,16 @@ def get_member_info(token = Depends(get_cookies_info), db: Session = Depends(get
     # 선택한 todo의 정보 가져오기
     select_todo_info = db.query(TODO).filter(TODO.todo_id == selected_todo.todo_id).first()
     
-    select_time = selected_todo.started_at
-    total_minutes = 0
-
-    # 선택날짜 이후 입퇴실 기록 가져오기
-    seat_usages = db.query(SeatUsage).filter(SeatUsage.check_in_time >= select_time).filter(SeatUsage.member_id == id).all()
-
-    for usage in seat_usages:
-        if usage.check_out_time is not None:
-            start = usage.check_in_time
-            end = usage.check_out_time
-            diff = end - start
-            minutes = int(diff.total_seconds() // 60)
-            total_minutes += minutes
-        else:
-            continue
-        
+    # 퇴실 시점마다 누적해 둔 진행도 사용 (time: 분, attendance: 출석 일수)
+    current_value = todo_current_value(selected_todo, select_todo_info.todo_type)
+
     result = {
         # 선택한 todo 이름
         "todo_name": select_todo_info.todo_title,
         # 선택한 todo의 달성조건
         "target_value": select_todo_info.todo_value,
         # 선택한 todo의 현재 달성 값
-        "current_value": total_minutes, 
+        "current_value": current_value, 
         # 선택한 todo의 타입
         "todo_type": select_todo_info.todo_type
     }
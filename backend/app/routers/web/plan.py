@@ -1,28 +1,31 @@
-import os
-import requests
+import asyncio
+import json
+from time import perf_counter
 from zoneinfo import ZoneInfo
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 from fastapi import Depends, APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.messages import HumanMessage, AIMessage
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 from models import AIChatLog, ScheduleEvent, SeatUsage
 from schemas import AiResponse, EventResponse, ChatRequest, ManualEventRequest
-from ai_models.sbert import get_embedding_model
-from database import get_db
+from ai_models.embedding_service import EmbeddingService, get_embedding_service
+from ai_models.sbert import model_manager, STATE_READY
+from ai_models.llm_client import llm_manager
+from ai_models.embedding_cache import embedding_cache
+from ai_models.intent_classifier import intent_classifier
+from utils.hybrid_search import ahybrid_search_events
+from database import get_db, get_async_db
 from utils.auth_utils import get_cookies_info
 
 router = APIRouter(prefix="/api/web/plan", tags=["plan"])
 
 load_dotenv()
-baseurl = os.getenv("OPENAI_API_BASE_URL")
-apikey = os.getenv("OPENAI_API_KEY")
 KST = ZoneInfo("Asia/Seoul")
 
 # ------------------------------------------------------------------
@@ -59,6 +62,13 @@ def get_duration_text(start: time, end: time) -> str:
 
     return " ".join(result) if result else "0분"
 
+# ------------------------------------------------------------------
+# [Helper] Description Embedding용 Rich Text (제목 + 시간 범위 + 소요시간 + 내용)
+# ------------------------------------------------------------------
+def build_rich_text(title: str, start: time, end: time, description: Optional[str]) -> str:
+    time_range_str = f"{start.strftime('%H:%M') if start else ''}~{end.strftime('%H:%M') if end else ''}"
+    return f"{title} {time_range_str} ({get_duration_text(start, end)}) {description or ''}"
+
 # ------------------------------------------------------------------
 # [Helper] 24:00 처리 및 시간 변환기
 # ------------------------------------------------------------------
@@ -79,113 +89,9 @@ def safe_parse_time(time_str: str) -> Optional[time]:
         return time(0, 0)
 
 # ------------------------------------------------------------------
-# 토큰 교환 함수
-# ------------------------------------------------------------------
-def get_copilot_token(github_token: str):
-    url = "https://api.github.com/copilot_internal/v2/token"
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Editor-Version": "vscode/1.85.0",
-        "Editor-Plugin-Version": "copilot/1.143.0",
-        "User-Agent": "GitHubCopilot/1.143.0"
-    }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("token")
-    else:
-        raise Exception(f"토큰 발급 실패: {response.status_code} {response.text}")
-
-# ------------------------------------------------------------------
-# [Helper] Context Injection
-# ------------------------------------------------------------------
-def get_recent_chat_history(db: Session, member_id: int, limit: int = 20):
-    logs = db.query(AIChatLog).filter(AIChatLog.member_id == member_id) \
-        .order_by(AIChatLog.created_at.desc()).limit(limit).all()
-    logs.reverse()
-
-    messages = []
-    for log in logs:
-        if log.role == 'user':
-            messages.append(HumanMessage(content=log.message))
-        else:
-            messages.append(AIMessage(content=log.message))
-    return messages
-
-# ------------------------------------------------------------------
-# [Helper] 벡터 검색
-# ------------------------------------------------------------------
-def search_similar_events(db: Session, member_id: int, query_vector: list, limit: int = 20):
-    title_dist = ScheduleEvent.title_embedding.cosine_distance(query_vector)
-    desc_dist = func.coalesce(
-        ScheduleEvent.description_embedding.cosine_distance(query_vector),
-        2.0
-    )
-    min_dist = func.least(title_dist, desc_dist)
-
-    stmt = select(ScheduleEvent).filter(
-        ScheduleEvent.member_id == member_id
-    ).order_by(
-        min_dist.asc()
-    ).limit(limit)
-
-    results = db.execute(stmt).scalars().all()
-
-    context_str = ""
-    for idx, ev in enumerate(results):
-        start_str = ev.start_time.strftime("%H:%M")
-        end_str = ev.end_time.strftime("%H:%M")
-
-        # [수정] Context에 시간 소요 정보(duration) 추가
-        duration_info = get_duration_text(ev.start_time, ev.end_time)
-
-        context_str += (
-            f"ID:{idx+1} | Date:{ev.schedule_date} | Time:{start_str}~{end_str} ({duration_info}) | "
-            f"Color:{ev.color} | Title:{ev.title} | Desc:{ev.description or 'None'}\n"
-        )
-
-    return context_str if context_str else "검색된 관련 일정이 없습니다."
-
-# ------------------------------------------------------------------
-# [Main API] 채팅 프로세싱
+# [Prompt] Router / Solver (모듈 로드 시 한 번 컴파일, 체인은 llm_manager가 토큰별로 재사용)
 # ------------------------------------------------------------------
-@router.post("/chat", response_model=AiResponse)
-async def process_chat_request(
-    req: ChatRequest,
-    db: Session = Depends(get_db),
-    model: SentenceTransformer = Depends(get_embedding_model)
-) -> AiResponse:
-
-    try:
-        real_access_token = get_copilot_token(apikey)
-    except Exception as e:
-        print(f"Token Error: {e}")
-        return AiResponse(type="chat", message="GitHub 토큰 발급에 실패했습니다.", events=[])
-
-    member_id = req.member_id
-    user_input = req.user_input
-
-    llm = ChatOpenAI(
-        api_key=real_access_token,
-        model="gpt-4.1",
-        base_url=baseurl,
-        temperature=0,
-        default_headers={
-            "Authorization": f"Bearer {real_access_token}",
-            "Editor-Version": "vscode/1.85.0",
-            "Editor-Plugin-Version": "copilot/1.143.0",
-            "User-Agent": "GitHubCopilot/1.143.0"
-        }
-    )
-
-    now_dt = datetime.now(KST)
-    today_str = now_dt.strftime("%Y-%m-%d")
-    current_time_str = now_dt.strftime("%H:%M")
-
-    # ------------------------------------------------------------------
-    # Router
-    # ------------------------------------------------------------------
-    router_system = """
+ROUTER_SYSTEM = """
     당신은 스터디 플래너의 분류기입니다. 
     오늘 날짜: {today}
     현재 시각: {current_time}
@@ -196,43 +102,25 @@ async def process_chat_request(
     1. 'search': 과거 일정 조회, 수정/삭제 대상이 모호할 때, 내용 기반 검색
     2. 'direct': 명확한 생성/수정/삭제 요청, 인사
 
+    [날짜 범위]
+    검색 대상 날짜가 분명하면(예: "어제", "이번 주", "3월 5일") date_from/date_to에 YYYY-MM-DD로 넣고, 아니면 null.
+
     [JSON 포맷]
     {{
         "decision": "search" | "direct",
-        "search_query": "검색할 키워드"
+        "search_query": "검색할 키워드",
+        "date_from": "YYYY-MM-DD" | null,
+        "date_to": "YYYY-MM-DD" | null
     }}
     """
-    router_prompt = ChatPromptTemplate.from_messages([
-        ("system", router_system),
-        MessagesPlaceholder(variable_name="chat_history"),
-        ("user", "{input}")
-    ])
-    router_chain = router_prompt | llm | JsonOutputParser()
-
-    try:
-        history_messages = get_recent_chat_history(db, member_id)
-        router_res = router_chain.invoke({
-            "today": today_str,
-            "current_time": current_time_str,
-            "chat_history": history_messages,
-            "input": user_input
-        })
-        decision = router_res.get("decision", "direct")
-        search_query = router_res.get("search_query", "")
-
-        # ------------------------------------------------------------------
-        # Vector Search
-        # ------------------------------------------------------------------
-        found_context = ""
-        if decision == "search" and search_query:
-            query_vec = model.encode(search_query).tolist()
-            found_context = search_similar_events(db, member_id, query_vec)
-
-        # ------------------------------------------------------------------
-        # Solver
-        # ------------------------------------------------------------------
-        # 프롬프트는 요청하신 대로 제공해주신 원본 그대로 유지합니다.
-        solver_system = """
+ROUTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", ROUTER_SYSTEM),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("user", "{input}")
+])
+
+# 프롬프트는 요청하신 대로 제공해주신 원본 그대로 유지합니다.
+SOLVER_SYSTEM = """
         당신은 친절하고 똑똑한 스터디 플래너 AI입니다. 
         오늘 날짜: {today}
         현재 시각: {current_time}
@@ -311,246 +199,404 @@ async def process_chat_request(
             ]
         }}
         """
+SOLVER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SOLVER_SYSTEM),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("user", "{input}")
+])
 
-        solver_chain = ChatPromptTemplate.from_messages([
-            ("system", solver_system),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("user", "{input}")
-        ]) | llm | JsonOutputParser()
-
-        ai_result = solver_chain.invoke({
-            "today": today_str,
-            "current_time": current_time_str,
-            "context": found_context if found_context else "관련된 과거 데이터 없음.",
-            "chat_history": history_messages,
-            "input": user_input
-        })
-
-        res_type = ai_result.get("type", "chat")
-        delete_mode = ai_result.get("delete_mode", "specific")
-        ai_msg = ai_result.get("message", "")
-        events_data = ai_result.get("events", [])
-        search_results_raw = ai_result.get("search_results", [])
-        final_search_results = []
-
-        if search_results_raw and isinstance(search_results_raw, list):
-            for item in search_results_raw:
-                final_search_results.append(EventResponse(
-                    event_id=item.get('event_id', 0),
-                    title=item.get('title', ''),
-                    schedule_date=item.get('schedule_date') or today_str,
-                    start_time=item.get('start_time', '00:00'),
-                    end_time=item.get('end_time', '00:00'),
-                    color=item.get('color', 'blue')
-                ))
+llm_manager.register_chain("router", ROUTER_PROMPT)
+llm_manager.register_chain("solver", SOLVER_PROMPT)
 
-        # ------------------------------------------------------------------
-        # [Step 4] DB 트랜잭션
-        # ------------------------------------------------------------------
-        user_log = AIChatLog(member_id=member_id, role="user", message=user_input)
-        db.add(user_log)
-        db.flush()
+# ------------------------------------------------------------------
+# [Helper] Context Injection
+# ------------------------------------------------------------------
+async def get_recent_chat_history(db: AsyncSession, member_id: int, limit: int = 20):
+    result = await db.execute(
+        select(AIChatLog).filter(AIChatLog.member_id == member_id)
+        .order_by(AIChatLog.created_at.desc()).limit(limit)
+    )
+    logs = list(result.scalars().all())
+    logs.reverse()
 
-        response_events = []
+    messages = []
+    for log in logs:
+        if log.role == 'user':
+            messages.append(HumanMessage(content=log.message))
+        else:
+            messages.append(AIMessage(content=log.message))
+    return messages
 
-        if res_type == "create":
-            next_default_hour = 9
+# ------------------------------------------------------------------
+# [Helper] 하이브리드 검색 (트라이그램 + 벡터, RRF) → Context 문자열
+# ------------------------------------------------------------------
+def parse_date_or_none(value) -> Optional[date]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+    except (ValueError, TypeError):
+        return None
 
-            for ev in events_data:
-                try:
-                    s_date = datetime.strptime(ev['date'], "%Y-%m-%d").date()
-                    temp_start = safe_parse_time(ev.get('start'))
-                    temp_end = safe_parse_time(ev.get('end'))
-
-                    if temp_start is None:
-                        if next_default_hour >= 24:
-                            next_default_hour = 9
-                        s_start = time(next_default_hour, 0)
-                        next_default_hour += 1
-                    else:
-                        s_start = temp_start
-                        next_default_hour = s_start.hour + 1
-
-                    if temp_end is None:
-                        end_h = s_start.hour + 1
-                        if end_h >= 24:
-                            s_end = time(23, 59)
-                        else:
-                            s_end = time(end_h, s_start.minute)
-                    else:
-                        s_end = temp_end
+async def search_similar_events(db: AsyncSession, member_id: int, query: str, query_vector: Optional[list],
+                                limit: int = 20, date_from: Optional[date] = None, date_to: Optional[date] = None):
+    results = await ahybrid_search_events(db, member_id, query, query_vector, limit, date_from, date_to)
 
-                except (ValueError, TypeError) as e:
-                    print(f"Date/Time Parse Error: {e}")
-                    continue
+    context_str = ""
+    for idx, ev in enumerate(results):
+        start_str = ev.start_time.strftime("%H:%M")
+        end_str = ev.end_time.strftime("%H:%M")
 
-                # 임베딩에 시간/소요시간 정보 포함 (Semantic Search 강화)
-                duration_str = get_duration_text(s_start, s_end)
-                time_range_str = f"{s_start.strftime('%H:%M')}~{s_end.strftime('%H:%M')}"
-
-                # Title Embedding은 제목만
-                t_vec = model.encode(ev['title']).tolist()
-
-                # Description Embedding에 풍부한 정보(Rich Text) 포함
-                rich_text_for_embedding = f"{ev['title']} {time_range_str} ({duration_str}) {ev.get('description', '')}"
-                d_vec = model.encode(rich_text_for_embedding).tolist()
-
-                new_event = ScheduleEvent(
-                    member_id=member_id,
-                    ai_chat_log_id=user_log.ai_chat_logs_id,
-                    title=ev['title'],
-                    schedule_date=s_date,
-                    start_time=s_start,
-                    end_time=s_end,
-                    description=ev.get('description', ''),
-                    color=ev.get('color', 'blue'),
-                    title_embedding=t_vec,
-                    description_embedding=d_vec
-                )
-                db.add(new_event)
-                db.flush()
-                response_events.append(EventResponse(
-                    event_id=new_event.event_id,
-                    title=new_event.title,
-                    schedule_date=ev['date'],
-                    start_time=s_start.strftime("%H:%M") if s_start else "",
-                    end_time=s_end.strftime("%H:%M") if s_end else "",
-                    color=new_event.color,
-                    description=new_event.description
-                ))
+        # [수정] Context에 시간 소요 정보(duration) 추가
+        duration_info = get_duration_text(ev.start_time, ev.end_time)
+
+        context_str += (
+            f"ID:{idx+1} | Date:{ev.schedule_date} | Time:{start_str}~{end_str} ({duration_info}) | "
+            f"Color:{ev.color} | Title:{ev.title} | Desc:{ev.description or 'None'}\n"
+        )
+
+    return context_str if context_str else "검색된 관련 일정이 없습니다."
+
+# ------------------------------------------------------------------
+# [Helper] 로컬 분류 결과 검증용 라우터 호출 (응답 경로와 무관하게 백그라운드 실행)
+# ------------------------------------------------------------------
+_shadow_tasks = set()
+
+async def shadow_route(router_chain, router_input: dict, prediction):
+    try:
+        with llm_manager.track("router_shadow"):
+            router_res = await router_chain.ainvoke(router_input)
+        intent_classifier.record_llm_decision(prediction, router_res, shadow=True)
+    except Exception as e:
+        print(f"[Intent] 라우터 검증 호출 실패: {e}")
+
+# ------------------------------------------------------------------
+# [Helper] Router + 하이브리드 검색 → Solver 입력
+# ------------------------------------------------------------------
+async def prepare_solver_input(db: AsyncSession, embedder: EmbeddingService, router_chain,
+                               member_id: int, user_input: str) -> dict:
+    now_dt = datetime.now(KST)
+    today_str = now_dt.strftime("%Y-%m-%d")
+    current_time_str = now_dt.strftime("%H:%M")
+
+    history_messages = await get_recent_chat_history(db, member_id)
+    router_input = {
+        "today": today_str,
+        "current_time": current_time_str,
+        "chat_history": history_messages,
+        "input": user_input
+    }
+
+    # 로컬 분류기가 확신하면 라우터 LLM 호출 생략 (일부는 뒤에서 LLM 라우터와 일치 여부만 확인)
+    prediction = await intent_classifier.classify(embedder, user_input)
+    if prediction.confident:
+        router_res = prediction.router_result(user_input)
+        if intent_classifier.should_shadow():
+            task = asyncio.create_task(shadow_route(router_chain, router_input, prediction))
+            _shadow_tasks.add(task)
+            task.add_done_callback(_shadow_tasks.discard)
+    else:
+        with llm_manager.track("router"):
+            router_res = await router_chain.ainvoke(router_input)
+        intent_classifier.record_llm_decision(prediction, router_res)
+    decision = router_res.get("decision", "direct")
+    search_query = router_res.get("search_query", "")
+    date_from = parse_date_or_none(router_res.get("date_from"))
+    date_to = parse_date_or_none(router_res.get("date_to"))
+
+    # Hybrid Search (날짜 범위가 있으면 그 안에서만 검색)
+    found_context = ""
+    if decision == "search":
+        if prediction.confident and prediction.vector is not None:
+            # fast-path: 어휘 검색은 키워드, 벡터 검색은 이미 계산한 입력 문장 임베딩
+            query_vec = prediction.vector
+        else:
+            query_vec = await embedder.aencode_one(search_query) if search_query else None
+        if search_query or query_vec is not None or date_from or date_to:
+            found_context = await search_similar_events(db, member_id, search_query, query_vec,
+                                                        date_from=date_from, date_to=date_to)
+
+    return {
+        "today": today_str,
+        "current_time": current_time_str,
+        "context": found_context if found_context else "관련된 과거 데이터 없음.",
+        "chat_history": history_messages,
+        "input": user_input
+    }
+
+# ------------------------------------------------------------------
+# [Helper] Solver 결과(JSON) 적용 → 일정 생성/수정/삭제 + 채팅 로그 저장 (commit 포함)
+# ------------------------------------------------------------------
+async def apply_solver_result(db: AsyncSession, embedder: EmbeddingService, member_id: int,
+                              user_input: str, ai_result: dict, today_str: str) -> AiResponse:
+    res_type = ai_result.get("type", "chat")
+    delete_mode = ai_result.get("delete_mode", "specific")
+    ai_msg = ai_result.get("message", "")
+    events_data = ai_result.get("events", [])
+    search_results_raw = ai_result.get("search_results", [])
+    final_search_results = []
+
+    if search_results_raw and isinstance(search_results_raw, list):
+        for item in search_results_raw:
+            final_search_results.append(EventResponse(
+                event_id=item.get('event_id', 0),
+                title=item.get('title', ''),
+                schedule_date=item.get('schedule_date') or today_str,
+                start_time=item.get('start_time', '00:00'),
+                end_time=item.get('end_time', '00:00'),
+                color=item.get('color', 'blue')
+            ))
+
+    # ------------------------------------------------------------------
+    # [Step 4] DB 트랜잭션
+    # ------------------------------------------------------------------
+    user_log = AIChatLog(member_id=member_id, role="user", message=user_input)
+    db.add(user_log)
+    await db.flush()
+
+    response_events = []
+
+    if res_type == "create":
+        next_default_hour = 9
+        parsed_events = []
+
+        for ev in events_data:
+            try:
+                s_date = datetime.strptime(ev['date'], "%Y-%m-%d").date()
+                temp_start = safe_parse_time(ev.get('start'))
+                temp_end = safe_parse_time(ev.get('end'))
+
+                if temp_start is None:
+                    if next_default_hour >= 24:
+                        next_default_hour = 9
+                    s_start = time(next_default_hour, 0)
+                    next_default_hour += 1
+                else:
+                    s_start = temp_start
+                    next_default_hour = s_start.hour + 1
+
+                if temp_end is None:
+                    end_h = s_start.hour + 1
+                    if end_h >= 24:
+                        s_end = time(23, 59)
+                    else:
+                        s_end = time(end_h, s_start.minute)
+                else:
+                    s_end = temp_end
+
+            except (ValueError, TypeError) as e:
+                print(f"Date/Time Parse Error: {e}")
+                continue
+
+            parsed_events.append((ev, s_date, s_start, s_end))
+
+        # 임베딩은 일정 전체를 모아 한 번에 처리 (제목 N개 + Rich Text N개, 캐시에 없는 문장만 인코딩)
+        # Title Embedding은 제목만, Description Embedding에는 시간/소요시간 정보 포함 (Semantic Search 강화)
+        titles = [ev['title'] for ev, _, _, _ in parsed_events]
+        rich_texts = [
+            build_rich_text(ev['title'], s_start, s_end, ev.get('description', ''))
+            for ev, _, s_start, s_end in parsed_events
+        ]
+        vectors = await embedding_cache.aembed(db, embedder, titles + rich_texts) if parsed_events else []
+        n_events = len(parsed_events)
+
+        new_events = []
+        for i, (ev, s_date, s_start, s_end) in enumerate(parsed_events):
+            new_event = ScheduleEvent(
+                member_id=member_id,
+                ai_chat_log_id=user_log.ai_chat_logs_id,
+                title=ev['title'],
+                schedule_date=s_date,
+                start_time=s_start,
+                end_time=s_end,
+                description=ev.get('description', ''),
+                color=ev.get('color', 'blue'),
+                title_embedding=vectors[i],
+                description_embedding=vectors[n_events + i]
+            )
+            db.add(new_event)
+            new_events.append((new_event, ev, s_start, s_end))
+
+        # 한 번의 flush로 INSERT (event_id는 flush 후에 채워짐)
+        if new_events:
+            await db.flush()
+        for new_event, ev, s_start, s_end in new_events:
+            response_events.append(EventResponse(
+                event_id=new_event.event_id,
+                title=new_event.title,
+                schedule_date=ev['date'],
+                start_time=s_start.strftime("%H:%M") if s_start else "",
+                end_time=s_end.strftime("%H:%M") if s_end else "",
+                color=new_event.color,
+                description=new_event.description
+            ))
+
+    elif res_type == "update" and events_data:
+        updated_count = 0
+        updated_events = []
+
+        for update_data in events_data:
+            # 수정 대상 찾기 (original_title/date 우선, 없으면 현재 값 Fallback)
+            target_date_str = update_data.get('original_date')
+            target_title = update_data.get('original_title')
+
+            if not target_date_str:
+                target_date_str = update_data.get('date')
+            if not target_title:
+                target_title = update_data.get('title')
+
+            query = select(ScheduleEvent).filter(ScheduleEvent.member_id == member_id)
+
+            if target_date_str:
+                try:
+                    target_dt = datetime.strptime(target_date_str, "%Y-%m-%d").date()
+                    query = query.filter(ScheduleEvent.schedule_date == target_dt)
+                except ValueError:
+                    pass
 
-        elif res_type == "update" and events_data:
-            updated_count = 0
+            if target_title:
+                query = query.filter(ScheduleEvent.title.like(f"%{target_title}%"))
 
-            for update_data in events_data:
-                # 수정 대상 찾기 (original_title/date 우선, 없으면 현재 값 Fallback)
-                target_date_str = update_data.get('original_date')
-                target_title = update_data.get('original_title')
+            target_event = (await db.execute(
+                query.order_by(ScheduleEvent.schedule_date.desc(), ScheduleEvent.start_time.asc()).limit(1)
+            )).scalars().first()
 
-                if not target_date_str:
-                    target_date_str = update_data.get('date')
-                if not target_title:
-                    target_title = update_data.get('title')
+            if target_event:
+                # 임베딩 대상 필드(제목/시간/내용)가 그대로면 임베딩도 그대로 둔다
+                old_title = target_event.title
+                old_rich_text = build_rich_text(target_event.title, target_event.start_time,
+                                                target_event.end_time, target_event.description)
 
-                query = db.query(ScheduleEvent).filter(ScheduleEvent.member_id == member_id)
+                # 값 업데이트 (None 체크로 기존 값 유지)
+                if update_data.get('title'):
+                    target_event.title = update_data['title']
 
-                if target_date_str:
+                if update_data.get('date'):
                     try:
-                        target_dt = datetime.strptime(target_date_str, "%Y-%m-%d").date()
-                        query = query.filter(ScheduleEvent.schedule_date == target_dt)
+                        target_event.schedule_date = datetime.strptime(update_data['date'], "%Y-%m-%d").date()
                     except ValueError:
                         pass
 
-                if target_title:
-                    query = query.filter(ScheduleEvent.title.like(f"%{target_title}%"))
-
-                target_event = query.order_by(ScheduleEvent.schedule_date.desc(), ScheduleEvent.start_time.asc()).first()
-
-                if target_event:
-                    # 값 업데이트 (None 체크로 기존 값 유지)
-                    if update_data.get('title'):
-                        target_event.title = update_data['title']
-
-                    if update_data.get('date'):
-                        try:
-                            target_event.schedule_date = datetime.strptime(update_data['date'], "%Y-%m-%d").date()
-                        except ValueError:
-                            pass
-
-                    if update_data.get('start') is not None:
-                        target_event.start_time = safe_parse_time(update_data['start'])
-
-                    if update_data.get('end') is not None:
-                        target_event.end_time = safe_parse_time(update_data['end'])
-
-                    if update_data.get('description') is not None:
-                        target_event.description = update_data['description']
-
-                    if update_data.get('color'):
-                        target_event.color = update_data['color']
-
-                    # 임베딩 갱신 (시간이나 내용이 바뀌었을 수 있으므로 항상 수행)
-                    current_start = target_event.start_time
-                    current_end = target_event.end_time
-                    current_desc = target_event.description or ""
-                    current_title = target_event.title
-
-                    duration_str = get_duration_text(current_start, current_end)
-                    time_range_str = f"{current_start.strftime('%H:%M')}~{current_end.strftime('%H:%M')}"
-
-                    rich_text = f"{current_title} {time_range_str} ({duration_str}) {current_desc}"
-
-                    target_event.title_embedding = model.encode(current_title).tolist()
-                    target_event.description_embedding = model.encode(rich_text).tolist()
-
-                    updated_count += 1
-
-                    response_events.append(EventResponse(
-                        event_id=target_event.event_id,
-                        title=target_event.title,
-                        schedule_date=target_event.schedule_date.strftime("%Y-%m-%d"),
-                        start_time=target_event.start_time.strftime("%H:%M"),
-                        end_time=target_event.end_time.strftime("%H:%M"),
-                        color=target_event.color,
-                        description=target_event.description
-                    ))
-
-            if updated_count == 0:
-                if not ai_msg:
-                    ai_msg = "조건에 맞는 수정할 일정을 찾지 못했습니다."
-
-        elif res_type == "delete":
-            deleted_count = 0
-
-            # [삭제 모드 확인] 'all'이면 전체 삭제
-            if delete_mode == "all":
-                result = db.query(ScheduleEvent).filter(ScheduleEvent.member_id == member_id).delete()
-                deleted_count = result
-                if not ai_msg:
-                    ai_msg = f"요청하신 대로 모든 일정({deleted_count}개)을 삭제했습니다."
-
-            else:
-                # 개별 삭제 로직
-                targets = events_data if events_data else []
-                for ev in targets:
-                    query = db.query(ScheduleEvent).filter(ScheduleEvent.member_id == member_id)
-                    del_date_str = ev.get('date') or ev.get('original_date')
-                    del_title = ev.get('title') or ev.get('original_title')
-
-                    if del_date_str:
-                        try:
-                            del_date = datetime.strptime(del_date_str, "%Y-%m-%d").date()
-                            query = query.filter(ScheduleEvent.schedule_date == del_date)
-                        except ValueError:
-                            continue
-
-                    if del_title:
-                        query = query.filter(ScheduleEvent.title.like(f"%{del_title}%"))
-
-                    if not del_date_str and not del_title:
+                if update_data.get('start') is not None:
+                    target_event.start_time = safe_parse_time(update_data['start'])
+
+                if update_data.get('end') is not None:
+                    target_event.end_time = safe_parse_time(update_data['end'])
+
+                if update_data.get('description') is not None:
+                    target_event.description = update_data['description']
+
+                if update_data.get('color'):
+                    target_event.color = update_data['color']
+
+                # 임베딩 갱신 (제목/시간/내용이 바뀐 경우만, 색상·날짜만 바뀌면 생략)
+                rich_text = build_rich_text(target_event.title, target_event.start_time,
+                                            target_event.end_time, target_event.description)
+                if target_event.title != old_title or rich_text != old_rich_text:
+                    updated_events.append((target_event, target_event.title, rich_text))
+
+                updated_count += 1
+
+                response_events.append(EventResponse(
+                    event_id=target_event.event_id,
+                    title=target_event.title,
+                    schedule_date=target_event.schedule_date.strftime("%Y-%m-%d"),
+                    start_time=target_event.start_time.strftime("%H:%M"),
+                    end_time=target_event.end_time.strftime("%H:%M"),
+                    color=target_event.color,
+                    description=target_event.description
+                ))
+
+        # 내용이 바뀐 일정 임베딩을 한 번에 재계산 (캐시에 없는 문장만 인코딩)
+        if updated_events:
+            vectors = await embedding_cache.aembed(
+                db, embedder,
+                [title for _, title, _ in updated_events] + [rich for _, _, rich in updated_events]
+            )
+            n_events = len(updated_events)
+            for i, (target_event, _, _) in enumerate(updated_events):
+                target_event.title_embedding = vectors[i]
+                target_event.description_embedding = vectors[n_events + i]
+
+        if updated_count == 0:
+            if not ai_msg:
+                ai_msg = "조건에 맞는 수정할 일정을 찾지 못했습니다."
+
+    elif res_type == "delete":
+        deleted_count = 0
+
+        # [삭제 모드 확인] 'all'이면 전체 삭제
+        if delete_mode == "all":
+            result = await db.execute(delete(ScheduleEvent).filter(ScheduleEvent.member_id == member_id))
+            deleted_count = result.rowcount
+            if not ai_msg:
+                ai_msg = f"요청하신 대로 모든 일정({deleted_count}개)을 삭제했습니다."
+
+        else:
+            # 개별 삭제 로직
+            targets = events_data if events_data else []
+            for ev in targets:
+                query = delete(ScheduleEvent).filter(ScheduleEvent.member_id == member_id)
+                del_date_str = ev.get('date') or ev.get('original_date')
+                del_title = ev.get('title') or ev.get('original_title')
+
+                if del_date_str:
+                    try:
+                        del_date = datetime.strptime(del_date_str, "%Y-%m-%d").date()
+                        query = query.filter(ScheduleEvent.schedule_date == del_date)
+                    except ValueError:
                         continue
 
-                    result = query.delete(synchronize_session=False)
-                    deleted_count += result
+                if del_title:
+                    query = query.filter(ScheduleEvent.title.like(f"%{del_title}%"))
 
-                if not ai_msg:
-                    if deleted_count > 0:
-                        ai_msg = f"요청하신 대로 총 {deleted_count}개의 일정을 삭제했습니다."
-                    else:
-                        ai_msg = "조건에 맞는 삭제할 일정을 찾지 못했습니다."
+                if not del_date_str and not del_title:
+                    continue
 
-        db.add(AIChatLog(member_id=member_id, role="ai", message=ai_msg))
-        db.commit()
+                result = await db.execute(query.execution_options(synchronize_session=False))
+                deleted_count += result.rowcount
 
-        return AiResponse(
-            type=res_type,
-            message=ai_msg,
-            events=response_events,
-            search_results=final_search_results
-        )
+            if not ai_msg:
+                if deleted_count > 0:
+                    ai_msg = f"요청하신 대로 총 {deleted_count}개의 일정을 삭제했습니다."
+                else:
+                    ai_msg = "조건에 맞는 삭제할 일정을 찾지 못했습니다."
+
+    db.add(AIChatLog(member_id=member_id, role="ai", message=ai_msg))
+    await db.commit()
+
+    return AiResponse(
+        type=res_type,
+        message=ai_msg,
+        events=response_events,
+        search_results=final_search_results
+    )
+
+# ------------------------------------------------------------------
+# [Main API] 채팅 프로세싱
+# LLM 호출(ainvoke) / DB(AsyncSession) / 임베딩(전담 스레드) 모두 이벤트 루프를 막지 않는다
+# ------------------------------------------------------------------
+@router.post("/chat", response_model=AiResponse)
+async def process_chat_request(
+    req: ChatRequest,
+    db: AsyncSession = Depends(get_async_db),
+    embedder: EmbeddingService = Depends(get_embedding_service)
+) -> AiResponse:
 
+    # 토큰은 만료 직전까지 캐시, ChatOpenAI / 체인은 토큰이 바뀔 때만 새로 생성
+    try:
+        router_chain = await llm_manager.chain("router")
+        solver_chain = await llm_manager.chain("solver")
     except Exception as e:
-        db.rollback()
+        print(f"Token Error: {e}")
+        return AiResponse(type="chat", message="GitHub 토큰 발급에 실패했습니다.", events=[])
+
+    try:
+        solver_input = await prepare_solver_input(db, embedder, router_chain, req.member_id, req.user_input)
+        with llm_manager.track("solver"):
+            ai_result = await solver_chain.ainvoke(solver_input)
+        return await apply_solver_result(db, embedder, req.member_id, req.user_input, ai_result, solver_input["today"])
+
+    except Exception as e:
+        await db.rollback()
         print(f"Error process_chat_request: {e}")
         return AiResponse(
             type="chat",
@@ -558,6 +604,81 @@ async def process_chat_request(
             events=[]
         )
 
+# ------------------------------------------------------------------
+# [Main API] 채팅 프로세싱 (SSE 스트리밍)
+# - event: message  → {"delta": "..."}  Solver JSON의 message 필드가 생성되는 대로 조각 전송
+# - event: result   → AiResponse        JSON이 완성되면 일정 생성/수정/삭제를 적용한 최종 결과
+# - event: done     → {}                스트림 종료
+# ------------------------------------------------------------------
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/chat/stream")
+async def stream_chat_request(
+    req: ChatRequest,
+    db: AsyncSession = Depends(get_async_db),
+    embedder: EmbeddingService = Depends(get_embedding_service)
+):
+    async def event_stream():
+        try:
+            router_chain = await llm_manager.chain("router")
+            solver_chain = await llm_manager.chain("solver")
+        except Exception as e:
+            print(f"Token Error: {e}")
+            yield sse_event("result", AiResponse(type="chat", message="GitHub 토큰 발급에 실패했습니다.", events=[]).model_dump())
+            yield sse_event("done", {})
+            return
+
+        try:
+            solver_input = await prepare_solver_input(db, embedder, router_chain, req.member_id, req.user_input)
+
+            # JsonOutputParser는 스트리밍 중 지금까지 파싱된 (부분) JSON을 누적해서 내보낸다
+            ai_result = {}
+            sent_message = ""
+            started = perf_counter()
+            with llm_manager.track("solver"):
+                async for partial in solver_chain.astream(solver_input):
+                    if not isinstance(partial, dict):
+                        continue
+                    ai_result = partial
+                    message = partial.get("message")
+                    if isinstance(message, str) and len(message) > len(sent_message) and message.startswith(sent_message):
+                        if not sent_message:
+                            llm_manager.metrics.call_histogram("solver_first_token").observe(
+                                (perf_counter() - started) * 1000
+                            )
+                        yield sse_event("message", {"delta": message[len(sent_message):]})
+                        sent_message = message
+
+            response = await apply_solver_result(db, embedder, req.member_id, req.user_input,
+                                                 ai_result, solver_input["today"])
+            yield sse_event("result", response.model_dump())
+
+        except Exception as e:
+            await db.rollback()
+            print(f"Error stream_chat_request: {e}")
+            yield sse_event("result", AiResponse(type="chat", message=f"오류가 발생했습니다: {str(e)}", events=[]).model_dump())
+
+        yield sse_event("done", {})
+
+    # 프록시(nginx) 버퍼링을 끄고 조각이 생기는 즉시 내려보낸다
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ------------------------------------------------------------------
+# [API] AI 플래너 준비 상태 (임베딩 모델 로드 상태 / 로드 시간)
+# ------------------------------------------------------------------
+@router.get("/ready")
+def get_planner_readiness(warm: bool = False):
+    """warm=true면 아직 로드 전인 경우 백그라운드 로드를 시작시킨다 (EMBEDDING_PRELOAD=false일 때)"""
+    if warm:
+        model_manager.start_loading()
+    status = model_manager.status()
+    return JSONResponse(status_code=200 if status["state"] == STATE_READY else 503, content=status)
+
 # ------------------------------------------------------------------
 # [API] 일반 일정 조회 (GET)
 # ------------------------------------------------------------------
@@ -587,18 +708,15 @@ def get_schedule_events(
 def create_manual_event(
     req: ManualEventRequest,
     db: Session = Depends(get_db),
-    model: SentenceTransformer = Depends(get_embedding_model)
+    embedder: EmbeddingService = Depends(get_embedding_service)
 ):
     # 수동 생성 시에도 시간/소요시간 정보를 벡터에 포함
     s_time = safe_parse_time(req.start)
     e_time = safe_parse_time(req.end)
 
-    t_vec = model.encode(req.title).tolist()
-
-    # Rich Text 생성 (Duration 포함)
-    duration_str = get_duration_text(s_time, e_time)
-    rich_text = f"{req.title} {req.start}~{req.end} ({duration_str}) {req.description}"
-    d_vec = model.encode(rich_text).tolist()
+    # Rich Text 생성 (Duration 포함), 제목과 함께 처리 (캐시에 없는 문장만 인코딩)
+    rich_text = build_rich_text(req.title, s_time, e_time, req.description)
+    t_vec, d_vec = embedding_cache.embed(db, embedder, [req.title, rich_text])
 
     new_event = ScheduleEvent(
         member_id=req.member_id,
@@ -629,12 +747,15 @@ def create_manual_event(
 def update_manual_event(
     req: ManualEventRequest,
     db: Session = Depends(get_db),
-    model: SentenceTransformer = Depends(get_embedding_model)
+    embedder: EmbeddingService = Depends(get_embedding_service)
 ):
     event = db.query(ScheduleEvent).filter(ScheduleEvent.event_id == req.event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
+    old_rich_text = build_rich_text(event.title, event.start_time, event.end_time, event.description)
+    old_title = event.title
+
     event.title = req.title
     event.schedule_date = datetime.strptime(req.date, "%Y-%m-%d").date()
     event.start_time = safe_parse_time(req.start)
@@ -642,12 +763,10 @@ def update_manual_event(
     event.description = req.description
     event.color = req.color
 
-    # [수정] 수동 수정 시에도 임베딩 갱신
-    duration_str = get_duration_text(event.start_time, event.end_time)
-    rich_text = f"{req.title} {req.start}~{req.end} ({duration_str}) {req.description}"
-
-    event.title_embedding = model.encode(req.title).tolist()
-    event.description_embedding = model.encode(rich_text).tolist()
+    # [수정] 수동 수정 시에도 임베딩 갱신 (제목/시간/내용이 바뀐 경우만, 캐시에 없는 문장만 인코딩)
+    rich_text = build_rich_text(event.title, event.start_time, event.end_time, event.description)
+    if event.title != old_title or rich_text != old_rich_text or event.title_embedding is None:
+        event.title_embedding, event.description_embedding = embedding_cache.embed(db, embedder, [event.title, rich_text])
 
     db.commit()
     return EventResponse(
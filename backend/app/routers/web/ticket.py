@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Cookie, Body
 from fastapi.responses import RedirectResponse, JSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import get_db, SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_async_db, SessionLocal
 from datetime import datetime, timedelta
 from models import Product, Member, Order, Seat, MileageHistory, SeatUsage
-from utils.auth_utils import get_cookies_info
+from utils.auth_utils import get_cookies_info, aget_cookies_info
+from utils.sales_cube import record_order
 from typing import Optional
-from apscheduler.schedulers.background import BackgroundScheduler
 
 
 router = APIRouter(prefix="/api/web", tags=["웹사이트 관리"])
@@ -36,22 +38,20 @@ def reset_seat_status():
     except Exception as e:
         db.rollback()
         print("좌석 상태 업데이트 중 오류 발생 :", str(e))
+        raise
 
     finally:
         db.close()
 
-def start_scheduler():
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(reset_seat_status, 'cron', hour=0, minute=0)
-    scheduler.start()
-
 # ===== 로그인 사용자 정보 가져오기 (수정함) =====
 @router.get("/me")
-def getMemberInfo(token = Depends(get_cookies_info), db: Session = Depends(get_db)):
+async def getMemberInfo(token = Depends(aget_cookies_info), db: AsyncSession = Depends(get_async_db)):
     """로그인한 사용자 정보 및 계정 상태 가져오기"""
 
     id = token["member_id"]
-    result = db.query(Member).filter(Member.member_id == id).filter(Member.is_deleted_at == False).first()
+    result = (await db.execute(
+        select(Member).filter(Member.member_id == id).filter(Member.is_deleted_at == False)
+    )).scalars().first()
 
     if not result:
         return None # 또는 404 에러 처리
@@ -80,13 +80,27 @@ def getMemberInfo(token = Depends(get_cookies_info), db: Session = Depends(get_d
 # ===== 좌석 관련 =====
 # 좌석현황 조회
 @router.get("/seat")
-def getSeatStatus(db: Session = Depends(get_db)):
+async def getSeatStatus(db: AsyncSession = Depends(get_async_db)):
     """좌석현황 조회 (웹 사용자용 - 보안을 위해 정보 제한)"""
-    seats = db.query(Seat).order_by(Seat.seat_id).all()
-    
-    result = []
     now = datetime.now()
 
+    seats = (await db.execute(select(Seat).order_by(Seat.seat_id))).scalars().all()
+
+    # 현재 입실(사용) 중인 좌석
+    in_use_ids = set((await db.execute(
+        select(SeatUsage.seat_id).filter(SeatUsage.check_out_time == None)
+    )).scalars().all())
+
+    # 입실은 안 했지만 기간제/고정석 예약이 있는 좌석
+    reserved_ids = set((await db.execute(
+        select(Order.fixed_seat_id).filter(
+            Order.fixed_seat_id != None,
+            Order.period_end_date >= now.date()
+        )
+    )).scalars().all())
+
+    result = []
+
     for seat in seats:
         seat_info = {
             "seat_id": seat.seat_id,
@@ -103,23 +117,8 @@ def getSeatStatus(db: Session = Depends(get_db)):
 
         # 좌석이 비어있지 않은 경우(is_status=False) 상세 체크
         if not seat.is_status:
-            # 1. 현재 입실(사용) 중인지 확인
-            usage_exists = db.query(SeatUsage).filter(
-                SeatUsage.seat_id == seat.seat_id,
-                SeatUsage.check_out_time == None
-            ).first()
-
-            if usage_exists:
+            if seat.seat_id in in_use_ids or seat.seat_id in reserved_ids:
                 seat_info["is_occupied"] = True
-            else:
-                # 2. 입실은 안 했지만 기간제/고정석 예약이 있는지 확인
-                order_exists = db.query(Order).filter(
-                    Order.fixed_seat_id == seat.seat_id,
-                    Order.period_end_date >= now.date()
-                ).first()
-                
-                if order_exists:
-                    seat_info["is_occupied"] = True
         
         # is_status=False인데 is_occupied=False라면 -> 실제 점검중인 상태가 됨
         result.append(seat_info)
@@ -164,7 +163,8 @@ def getPaymentPage(ticketData: dict = Body(...), user: dict = Body(...), SelectS
             member_id = member.member_id,
             product_id = ticket["product_id"],
             buyer_phone = user["phone"],
-            payment_amount = ticket["total_amount"]
+            payment_amount = ticket["total_amount"],
+            used_mileage = useMileage
         )
     
     # 기간제 이용권일 때만 좌석 + 날짜 정보 추가
@@ -191,6 +191,9 @@ def getPaymentPage(ticketData: dict = Body(...), user: dict = Body(...), SelectS
     db.add(order)
     db.flush()
 
+    # 일일 매출 집계 반영
+    record_order(db, order.order_id)
+
     # 마일리지 사용했을 경우
     if useMileage > 0:
         db.add(MileageHistory(
@@ -127,6 +127,14 @@ class ProductUpdate(BaseSchema):
 class ProductResponse(ProductCreate):
     product_id: int
 
+class SeatLayoutUpdate(BaseSchema):
+    zone_key: Optional[str] = None
+    floor: Optional[int] = None
+    pos_x: Optional[int] = None
+    pos_y: Optional[int] = None
+    camera_id: Optional[str] = None
+    camera_slot: Optional[int] = None
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ai planner
 # ----------------------------------------------------------------------------------------------------------------------
@@ -14,9 +14,11 @@ from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from cryptography.fernet import Fernet
-from database import get_db
+from database import get_db, get_async_db
 from models import Token, Member
 
 load_dotenv()
@@ -149,19 +151,55 @@ def get_cookies_info(
             return None
 
         # 엑세스 토큰 재발급
-        new_access_token = create_access_token(mem_info["member_id"], mem_info["name"])
-        response.set_cookie(
-            key="access_token",
-            value=new_access_token,
-            httponly=True,
-            samesite="lax",
-            max_age=ACCESS_TOKEN_EXPIRE_SECONDS
-        )
+        reissue_access_token(response, mem_info)
         return mem_info
 
     # 리프레시 토큰이 없을때
     return None
 
+""" JWT 토큰이 포함된 쿠키 정보 받기 (async 엔드포인트용, AsyncSession으로 리프레시 토큰 확인) """
+async def aget_cookies_info(
+    response: Response,
+    access_token: str = Cookie(None),
+    refresh_token: str = Cookie(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # 엑세스 토큰이 유효하면 DB 조회 없이 반환
+    if access_token:
+        mem_info, error = verify_token(access_token, "access")
+
+        if not error:
+            return mem_info
+        print(f"⚠️ Access Token 만료/유효하지 않음: {error}")
+
+    if refresh_token:
+        mem_info, error = verify_token(refresh_token, "refresh")
+        if error or not mem_info:
+            return None
+
+        # DB에 있는 리프레시 토큰과 일치 여부 검증
+        db_token = (await db.execute(
+            select(Token.token_id).filter(Token.token == refresh_token, Token.is_revoked == False).limit(1)
+        )).scalar()
+        if db_token is None:
+            return None
+
+        reissue_access_token(response, mem_info)
+        return mem_info
+
+    return None
+
+""" 엑세스 토큰 재발급 후 쿠키에 저장 """
+def reissue_access_token(response: Response, mem_info: dict):
+    new_access_token = create_access_token(mem_info["member_id"], mem_info["name"])
+    response.set_cookie(
+        key="access_token",
+        value=new_access_token,
+        httponly=True,
+        samesite="lax",
+        max_age=ACCESS_TOKEN_EXPIRE_SECONDS
+    )
+
 """ 기존 리프레시 토큰 무효화 (쿠키 기반) """
 def revoke_existing_token(db: Session, refresh_token: str = None):
     if refresh_token:
@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # redis 패키지는 선택 사항 (없으면 프로세스 내 LRU만 사용)
+    redis = None
+    aioredis = None
+
+# ---------------------------------------------------------
+# 응답 캐시 (회원별 통계 API)
+# 기본은 워커 프로세스 내 LRU, REDIS_URL이 있으면 Redis를 공용 저장소로 사용
+# (워커가 여러 개일 때 퇴실 무효화가 모든 워커에 반영되도록)
+# ---------------------------------------------------------
+
+REDIS_URL = os.getenv("REDIS_URL")
+STATICS_CACHE_SIZE = int(os.getenv("STATICS_CACHE_SIZE", "2048"))          # LRU 최대 항목 수
+STATICS_CACHE_TTL = int(os.getenv("STATICS_CACHE_TTL", "3600"))            # 항목 유지 시간 (초)
+
+class LRUBackend:
+    """
+    TTL이 있는 스레드 안전 LRU (값은 JSON 직렬화 가능한 dict, 인터페이스는 RedisBackend와 동일)
+    회원별 세대(generation)를 키에 넣으므로 무효화는 세대 증가뿐이고, 이전 세대 항목은 LRU/TTL로 밀려난다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    async def generation(self, owner: str) -> int:
+        with self._lock:
+            return self._generations.get(owner, 0)
+
+    def bump(self, owner: str):
+        with self._lock:
+            self._generations[owner] = self._generations.get(owner, 0) + 1
+
+    async def get(self, owner: str, generation: int, field: str):
+        key = f"{owner}:g{generation}:{field}"
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, owner: str, generation: int, field: str, value):
+        key = f"{owner}:g{generation}:{field}"
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+class RedisBackend:
+    """
+    Redis 공용 캐시 (조회/저장은 async 클라이언트, 무효화는 동기 클라이언트)
+    회원별로 "{owner}:gen" 세대 카운터와 세대별 해시 "{owner}:g{세대}"(필드 = endpoint:day)를 둔다.
+    무효화는 INCR + 이전 세대 해시 DEL 두 번의 명령으로 끝난다 (키 공간 SCAN 없음).
+    """
+
+    def __init__(self, url: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        # 세대 카운터는 항목보다 오래 유지해야 예전 세대 해시를 다시 읽지 않는다
+        self.generation_ttl = max(ttl_seconds * 24, 86400)
+        self._sync = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._async = aioredis.Redis.from_url(url, socket_timeout=0.5)
+
+    async def generation(self, owner: str) -> int:
+        raw = await self._async.get(f"{owner}:gen")
+        return int(raw) if raw is not None else 0
+
+    def bump(self, owner: str):
+        generation = self._sync.incr(f"{owner}:gen")
+        pipe = self._sync.pipeline(transaction=False)
+        pipe.expire(f"{owner}:gen", self.generation_ttl)
+        pipe.delete(f"{owner}:g{generation - 1}")
+        pipe.execute()
+
+    async def get(self, owner: str, generation: int, field: str):
+        raw = await self._async.hget(f"{owner}:g{generation}", field)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, owner: str, generation: int, field: str, value):
+        key = f"{owner}:g{generation}"
+        pipe = self._async.pipeline(transaction=False)
+        pipe.hset(key, field, json.dumps(value, ensure_ascii=False))
+        pipe.expire(key, self.ttl_seconds)
+        await pipe.execute()
+
+    def size(self) -> Optional[int]:
+        return None
+
+class CacheEntry:
+    """조회 시점의 회원 세대로 고정된 캐시 위치 (get 이후 같은 세대에 set)"""
+    __slots__ = ("owner", "generation", "field", "endpoint")
+
+    def __init__(self, owner: str, generation: int, field: str, endpoint: str):
+        self.owner = owner
+        self.generation = generation
+        self.field = field
+        self.endpoint = endpoint
+
+    @property
+    def seed(self) -> int:
+        """캐시 항목별 고정 난수 시드 (같은 회원/엔드포인트/날짜면 항상 같은 메시지)"""
+        return zlib.crc32(f"{self.owner}:{self.field}".encode("utf-8"))
+
+class ResponseCache:
+    """
+    회원별 응답 캐시. 위치는 (회원, 세대, "{endpoint}:{day}")이며, 날짜가 바뀌면 자연 만료된다.
+    커밋 후 무효화는 회원 세대를 올리는 것이라, 커밋 전에 계산을 시작한 조회가 늦게 저장해도
+    이전 세대 자리에 들어가 이후 조회에는 보이지 않는다.
+    캐시 장애는 응답을 막지 않고 원본 계산으로 넘어간다.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl_seconds: int):
+        self.namespace = namespace
+        self.backend = None
+        if REDIS_URL and redis is not None:
+            self.backend = RedisBackend(REDIS_URL, ttl_seconds)
+        else:
+            if REDIS_URL:
+                print(f"⚠️ REDIS_URL이 설정되었지만 redis 패키지가 없어 {namespace} 캐시는 프로세스 내 LRU를 사용합니다.")
+            self.backend = LRUBackend(max_entries, ttl_seconds)
+
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"hits": 0, "misses": 0, "errors": 0})
+        self.invalidations = 0
+
+    def _owner(self, member_id: int) -> str:
+        return f"{self.namespace}:{member_id}"
+
+    def _count(self, endpoint: str, field: str):
+        with self._lock:
+            self._stats[endpoint][field] += 1
+
+    async def entry(self, member_id: int, endpoint: str, day) -> CacheEntry:
+        """현재 회원 세대를 읽어 캐시 위치를 정한다 (원본 계산보다 먼저 호출)"""
+        owner = self._owner(member_id)
+        try:
+            generation = await self.backend.generation(owner)
+        except Exception as e:
+            print(f"[Cache] {self.namespace} 세대 조회 실패: {e}")
+            self._count(endpoint, "errors")
+            generation = None
+        return CacheEntry(owner, generation, f"{endpoint}:{day}", endpoint)
+
+    async def get(self, entry: CacheEntry):
+        if entry.generation is None:
+            return None
+        try:
+            value = await self.backend.get(entry.owner, entry.generation, entry.field)
+        except Exception as e:
+            print(f"[Cache] {self.namespace} 조회 실패: {e}")
+            self._count(entry.endpoint, "errors")
+            return None
+
+        self._count(entry.endpoint, "hits" if value is not None else "misses")
+        return value
+
+    async def set(self, entry: CacheEntry, value):
+        if entry.generation is None:
+            return
+        try:
+            await self.backend.set(entry.owner, entry.generation, entry.field, value)
+        except Exception as e:
+            print(f"[Cache] {self.namespace} 저장 실패: {e}")
+
+    def invalidate_member(self, member_id: int):
+        try:
+            self.backend.bump(self._owner(member_id))
+        except Exception as e:
+            print(f"[Cache] {self.namespace} 무효화 실패 (member_id={member_id}): {e}")
+            return
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            endpoints = {name: dict(stat) for name, stat in self._stats.items()}
+            invalidations = self.invalidations
+
+        for stat in endpoints.values():
+            total = stat["hits"] + stat["misses"]
+            stat["hit_rate"] = round(stat["hits"] / total, 4) if total else 0.0
+
+        hits = sum(stat["hits"] for stat in endpoints.values())
+        misses = sum(stat["misses"] for stat in endpoints.values())
+        return {
+            "backend": "redis" if isinstance(self.backend, RedisBackend) else "lru",
+            "size": self.backend.size(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "invalidations": invalidations,
+            "endpoints": endpoints,
+        }
+
+statics_cache = ResponseCache("statics", STATICS_CACHE_SIZE, STATICS_CACHE_TTL)
+
+# ---------------------------------------------------------
+# 커밋 이후 무효화
+# 세션에 회원 ID를 모아 두었다가 커밋이 끝난 뒤 회원 세대를 올린다.
+# (커밋 전에 올리면 그 사이 조회가 새 세대 자리에 이전 값을 저장할 수 있다.
+#  커밋 전에 읽기 시작한 조회의 늦은 저장은 이전 세대 자리에 들어가므로 보이지 않는다.)
+# ---------------------------------------------------------
+
+def invalidate_statics_on_commit(db: Session, member_id: Optional[int]):
+    if member_id:
+        db.info.setdefault("statics_invalidate", set()).add(member_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    member_ids = session.info.pop("statics_invalidate", None)
+    for member_id in member_ids or ():
+        statics_cache.invalidate_member(member_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("statics_invalidate", None)
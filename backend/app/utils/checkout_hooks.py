@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from models import Seat, SeatUsage
+from utils.todo_progress import accumulate_usage
+from utils.usage_rollup import record_usage
+from utils.cache import invalidate_statics_on_commit
+from utils.seat_profile import update_member_profile
+from utils.seat_recommender import queue_preference_update
+
+def claim_checkout(db: Session, usage: SeatUsage, now: datetime) -> bool:
+    """
+    아직 열려 있는(check_out_time IS NULL) 이용 기록에만 퇴실 시간을 기록한다.
+    키오스크 중복 요청 / 자동 퇴실 / 관리자 강제 퇴실이 겹치면 먼저 기록한 한 곳만 True를 받고,
+    나머지는 행 잠금이 풀린 뒤 조건이 맞지 않아 False (이때는 after_checkout을 호출하지 않는다)
+    """
+    claimed = db.execute(
+        update(SeatUsage)
+        .where(SeatUsage.usage_id == usage.usage_id, SeatUsage.check_out_time.is_(None))
+        .values(check_out_time=now)
+        .returning(SeatUsage.usage_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if claimed is None:
+        return False
+    # DB에는 이미 반영됐으므로 세션 객체 값만 맞춘다 (중복 UPDATE 방지)
+    set_committed_value(usage, "check_out_time", now)
+    return True
+
+def after_checkout(db: Session, usage: SeatUsage, seat: Optional[Seat]):
+    """
+    퇴실 처리 직후 공통 후처리 (kiosk 퇴실 / 관리자 강제 퇴실 / 자동 퇴실 모두 호출)
+    claim_checkout이 True를 돌려준 경우에만 호출하고, commit은 호출한 쪽에서 한다.
+    (통계 캐시 / 추천 취향 벡터 무효화는 commit이 끝난 뒤 반영된다)
+    """
+    accumulate_usage(db, usage)
+    record_usage(db, usage, seat)
+    update_member_profile(db, usage, seat)
+    invalidate_statics_on_commit(db, usage.member_id)
+    queue_preference_update(db, usage)
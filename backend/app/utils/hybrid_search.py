@@ -0,0 +1,104 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models import ScheduleEvent
+from utils.vector_search import vector_search_events, avector_search_events, date_filters
+
+# ---------------------------------------------------------
+# 플래너 하이브리드 검색 (어휘 + 벡터, Reciprocal Rank Fusion)
+# - 어휘: pg_trgm word_similarity (제목/설명 GIN 트라이그램 인덱스, 한국어는 공백 토큰화보다 트라이그램이 잘 맞음)
+# - 벡터: utils/vector_search.py (HNSW top-k)
+# 두 순위를 RRF(1 / (k + rank))로 합산하고, 라우터가 날짜를 뽑았으면 schedule_date 범위로 먼저 거른다.
+# ---------------------------------------------------------
+
+RRF_K = 60                  # RRF 상수 (상위 순위 간 점수 차를 완만하게)
+CANDIDATE_LIMIT = 40        # 검색 방식별로 가져올 후보 수
+LEXICAL_WEIGHT = 1.0
+VECTOR_WEIGHT = 1.0
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _lexical_stmt(member_id: int, query: str, limit: int, date_from: Optional[date], date_to: Optional[date]):
+    """제목/설명에 검색어가 (부분적으로라도) 들어 있는 일정, 트라이그램 유사도 순"""
+    score = func.greatest(
+        func.word_similarity(query, ScheduleEvent.title),
+        func.word_similarity(query, func.coalesce(ScheduleEvent.description, "")) * 0.8,     # 제목 일치를 조금 더 우선
+    )
+    return (
+        select(ScheduleEvent)
+        .filter(
+            ScheduleEvent.member_id == member_id,
+            # 컬럼 %> 검색어 (word_similarity가 임계값 이상) / ILIKE 모두 gin_trgm_ops 인덱스로 처리된다
+            or_(
+                ScheduleEvent.title.op("%>")(query),
+                ScheduleEvent.description.op("%>")(query),
+                ScheduleEvent.title.ilike(f"%{escape_like(query)}%", escape="\\"),
+            ),
+            *date_filters(date_from, date_to),
+        )
+        .order_by(score.desc(), ScheduleEvent.schedule_date.desc())
+        .limit(limit)
+    )
+
+def _date_only_stmt(member_id: int, limit: int, date_from: Optional[date], date_to: Optional[date]):
+    # 검색어 없이 날짜만 있는 질문 ("어제 뭐 했지?") → 해당 기간 일정을 시간순으로
+    return (
+        select(ScheduleEvent)
+        .filter(ScheduleEvent.member_id == member_id, *date_filters(date_from, date_to))
+        .order_by(ScheduleEvent.schedule_date, ScheduleEvent.start_time)
+        .limit(limit)
+    )
+
+def lexical_search_events(db: Session, member_id: int, query: str, limit: int = CANDIDATE_LIMIT,
+                          date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    query = (query or "").strip()
+    if not query:
+        return []
+    return db.execute(_lexical_stmt(member_id, query, limit, date_from, date_to)).scalars().all()
+
+async def alexical_search_events(db: AsyncSession, member_id: int, query: str, limit: int = CANDIDATE_LIMIT,
+                                 date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    query = (query or "").strip()
+    if not query:
+        return []
+    return (await db.execute(_lexical_stmt(member_id, query, limit, date_from, date_to))).scalars().all()
+
+def rrf_fuse(rankings: list, limit: int) -> list:
+    """[(가중치, 일정 목록)] 순위들을 RRF 점수로 합쳐 상위 limit개 반환"""
+    scores = {}
+    events = {}
+    for weight, ranked in rankings:
+        for rank, event in enumerate(ranked, start=1):
+            events[event.event_id] = event
+            scores[event.event_id] = scores.get(event.event_id, 0.0) + weight / (RRF_K + rank)
+
+    order = sorted(scores, key=lambda event_id: (-scores[event_id], event_id))
+    return [events[event_id] for event_id in order[:limit]]
+
+def hybrid_search_events(db: Session, member_id: int, query: str, query_vector: Optional[list],
+                         limit: int = 20, date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    if not (query or "").strip() and query_vector is None:
+        return db.execute(_date_only_stmt(member_id, limit, date_from, date_to)).scalars().all()
+
+    lexical = lexical_search_events(db, member_id, query, CANDIDATE_LIMIT, date_from, date_to)
+    vector = []
+    if query_vector is not None:
+        vector = vector_search_events(db, member_id, query_vector, CANDIDATE_LIMIT,
+                                      date_from=date_from, date_to=date_to)
+    return rrf_fuse([(LEXICAL_WEIGHT, lexical), (VECTOR_WEIGHT, vector)], limit)
+
+async def ahybrid_search_events(db: AsyncSession, member_id: int, query: str, query_vector: Optional[list],
+                                limit: int = 20, date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    """hybrid_search_events의 AsyncSession 버전"""
+    if not (query or "").strip() and query_vector is None:
+        return (await db.execute(_date_only_stmt(member_id, limit, date_from, date_to))).scalars().all()
+
+    lexical = await alexical_search_events(db, member_id, query, CANDIDATE_LIMIT, date_from, date_to)
+    vector = []
+    if query_vector is not None:
+        vector = await avector_search_events(db, member_id, query_vector, CANDIDATE_LIMIT,
+                                             date_from=date_from, date_to=date_to)
+    return rrf_fuse([(LEXICAL_WEIGHT, lexical), (VECTOR_WEIGHT, vector)], limit)
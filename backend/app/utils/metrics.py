@@ -0,0 +1,47 @@
+import threading
+from bisect import bisect_left
+from typing import Sequence
+
+# 기본 지연시간 버킷 (ms)
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class LatencyHistogram:
+    """스레드 안전한 누적 지연시간 히스토그램 (관리자 메트릭 조회용)"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._buckets = tuple(buckets_ms)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, value_ms: float):
+        idx = bisect_left(self._buckets, value_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum += value_ms
+            if value_ms > self._max:
+                self._max = value_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, max_v = self._count, self._sum, self._max
+
+        buckets = {f"le_{b}ms": c for b, c in zip(self._buckets, counts)}
+        buckets["le_inf"] = counts[-1]
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 2) if count else 0.0,
+            "max_ms": round(max_v, 2),
+            "buckets": buckets,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self._buckets) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._max = 0.0
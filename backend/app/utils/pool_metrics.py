@@ -0,0 +1,96 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from utils.metrics import LatencyHistogram
+
+# 커넥션 대기시간은 ms 단위로 작게 쪼개서 본다 (pool_timeout 기본 30초)
+WAIT_BUCKETS_MS = (0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 30000)
+
+class PoolMetrics:
+    """커넥션 풀 사용 현황 (체크아웃 수, 대기시간, overflow/timeout 발생 횟수)"""
+
+    def __init__(self):
+        self.wait_time = LatencyHistogram(WAIT_BUCKETS_MS)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.max_checked_out = 0
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def track_checked_out(self, checked_out: int):
+        with self._lock:
+            if checked_out > self.max_checked_out:
+                self.max_checked_out = checked_out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "max_checked_out": self.max_checked_out,
+            }
+        counters["wait_time"] = self.wait_time.snapshot()
+        return counters
+
+class InstrumentedPoolMixin:
+    """QueuePool 계열에 커넥션 획득 대기시간 측정을 추가"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.wait_time.observe((time.perf_counter() - start) * 1000)
+
+        # pool_size를 넘겨서 overflow 커넥션을 쓰고 있는 상태
+        if self.overflow() > 0:
+            self.metrics.incr("overflow_events")
+        self.metrics.track_checked_out(self.checkedout())
+        return conn
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+def register_pool_events(engine, metrics: PoolMetrics):
+    """체크아웃/신규 연결/무효화 이벤트 카운트"""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, conn_record, exception):
+        metrics.incr("invalidations")
+
+def pool_status(engine, metrics: PoolMetrics) -> dict:
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        **metrics.snapshot(),
+    }
@@ -0,0 +1,103 @@
+import calendar
+from datetime import date, timedelta
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# ---------------------------------------------------------
+# 일일 매출 집계 (daily_sales: 일자 × 상품 → 매출, 주문 수, 사용 마일리지)
+# 주문 생성 시 한 행씩 누적하고, 관리자 매출 통계는 이 테이블만 기간 조건으로 읽는다.
+# ---------------------------------------------------------
+
+_RECORD_SQL = text("""
+    INSERT INTO daily_sales AS ds (sales_date, product_id, product_type, revenue, order_count, mileage_used, updated_at)
+    SELECT CAST(o.created_at AS date), o.product_id, p.type, COALESCE(o.payment_amount, 0), 1, COALESCE(o.used_mileage, 0), localtimestamp
+    FROM orders o
+    JOIN products p ON p.product_id = o.product_id
+    WHERE o.order_id = :order_id
+    ON CONFLICT (sales_date, product_id) DO UPDATE SET
+        revenue = ds.revenue + EXCLUDED.revenue,
+        order_count = ds.order_count + 1,
+        mileage_used = ds.mileage_used + EXCLUDED.mileage_used,
+        product_type = EXCLUDED.product_type,
+        updated_at = localtimestamp
+""")
+
+# used_mileage 컬럼 추가 이전 주문은 (상품 가격 - 결제 금액)으로 추정
+_REBUILD_SQL = """
+    INSERT INTO daily_sales (sales_date, product_id, product_type, revenue, order_count, mileage_used, updated_at)
+    SELECT CAST(o.created_at AS date), o.product_id, MAX(p.type),
+           COALESCE(SUM(o.payment_amount), 0), COUNT(*),
+           COALESCE(SUM(COALESCE(o.used_mileage, GREATEST(p.price - COALESCE(o.payment_amount, 0), 0))), 0),
+           localtimestamp
+    FROM orders o
+    JOIN products p ON p.product_id = o.product_id
+    {where}
+    GROUP BY CAST(o.created_at AS date), o.product_id
+    ON CONFLICT (sales_date, product_id) DO UPDATE SET
+        product_type = EXCLUDED.product_type,
+        revenue = EXCLUDED.revenue,
+        order_count = EXCLUDED.order_count,
+        mileage_used = EXCLUDED.mileage_used,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# 원본 주문이 없어진 (일자, 상품) 행 정리
+_PRUNE_SQL = """
+    DELETE FROM daily_sales ds
+    WHERE {where}NOT EXISTS (
+        SELECT 1 FROM orders o
+        WHERE CAST(o.created_at AS date) = ds.sales_date AND o.product_id = ds.product_id
+    )
+"""
+
+def record_order(db: Session, order_id: int):
+    """flush된 주문 한 건을 일일 매출 집계에 더한다 (commit은 호출한 쪽에서)"""
+    db.execute(_RECORD_SQL, {"order_id": order_id})
+
+def rebuild_daily_sales(db: Session, since: date = None):
+    """
+    주문 원본으로 일일 매출 집계를 다시 만든다 (commit은 호출한 쪽에서)
+    재계산 중 커밋된 record_order 누적이 덮어써지지 않도록 트랜잭션 동안 daily_sales 쓰기를 막고,
+    행은 지우지 않고 upsert로 원본 값에 맞춘다.
+    """
+    db.execute(text("LOCK TABLE daily_sales IN SHARE ROW EXCLUSIVE MODE"))
+    params = {"since": since}
+    if since is not None:
+        db.execute(text(_REBUILD_SQL.format(where="WHERE o.created_at >= :since")), params)
+        db.execute(text(_PRUNE_SQL.format(where="ds.sales_date >= :since AND ")), params)
+    else:
+        db.execute(text(_REBUILD_SQL.format(where="")), params)
+        db.execute(text(_PRUNE_SQL.format(where="")), params)
+
+def resolve_sales_range(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    week: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Tuple[date, date]:
+    """
+    조회 조건을 [시작일, 종료일) 구간으로 변환
+    - start/end: 직접 지정 (end 포함)
+    - year + month: 해당 월 / year + week: ISO 주차 / year: 해당 연도
+    """
+    if start or end:
+        if not (start and end) or start > end:
+            raise HTTPException(status_code=400, detail="조회 기간(start, end)이 올바르지 않습니다.")
+        return start, end + timedelta(days=1)
+
+    if year is None:
+        raise HTTPException(status_code=400, detail="조회 연도(year) 또는 기간(start, end)이 필요합니다.")
+
+    try:
+        if month is not None:
+            last_day = calendar.monthrange(year, month)[1]
+            return date(year, month, 1), date(year, month, last_day) + timedelta(days=1)
+        if week is not None:
+            week_start = date.fromisocalendar(year, week, 1)
+            return week_start, week_start + timedelta(days=7)
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="조회 조건이 올바르지 않습니다.")
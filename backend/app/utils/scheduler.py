@@ -0,0 +1,118 @@
+import os
+import socket
+import time
+from collections import defaultdict
+from datetime import datetime
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import text
+from database import SessionLocal
+from models import JobRunLog
+from utils.metrics import LatencyHistogram
+
+# ---------------------------------------------------------
+# 프로세스당 하나만 존재하는 공용 스케줄러
+# ---------------------------------------------------------
+scheduler = BackgroundScheduler(timezone="Asia/Seoul")
+
+# 작업별 실행 지연시간 (현재 프로세스 기준)
+job_latency = defaultdict(LatencyHistogram)
+
+# 작업 실행권(lease) 획득 쿼리
+# - 행이 없으면 새로 만들고, 만료된 lease만 가져온다 (단일 문장이라 워커 간 경합은 DB가 정리)
+# - 시각은 모두 DB 시계(localtimestamp) 기준이라 서버 간 시계 오차의 영향을 받지 않는다
+_ACQUIRE_LEASE_SQL = text("""
+    INSERT INTO scheduler_leases (job_name, owner, lease_until, updated_at)
+    VALUES (:job_name, :owner, localtimestamp + make_interval(secs => :lease_seconds), localtimestamp)
+    ON CONFLICT (job_name) DO UPDATE
+    SET owner = EXCLUDED.owner,
+        lease_until = EXCLUDED.lease_until,
+        updated_at = EXCLUDED.updated_at
+    WHERE scheduler_leases.lease_until <= localtimestamp
+    RETURNING job_name
+""")
+
+def worker_id() -> str:
+    """현재 워커 식별자 (호스트명:PID)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def try_acquire_lease(job_name: str, lease_seconds: float) -> bool:
+    """클러스터 전체에서 이번 주기의 실행권을 얻었는지 여부"""
+    db = SessionLocal()
+    try:
+        acquired = db.execute(_ACQUIRE_LEASE_SQL, {
+            "job_name": job_name,
+            "owner": worker_id(),
+            "lease_seconds": lease_seconds
+        }).first()
+        db.commit()
+        return acquired is not None
+    except Exception as e:
+        db.rollback()
+        print(f"[Scheduler] lease 획득 실패 ({job_name}): {e}")
+        return False
+    finally:
+        db.close()
+
+def record_job_run(job_name: str, status: str, started_at: datetime, duration_ms: int, error: str = None):
+    db = SessionLocal()
+    try:
+        db.add(JobRunLog(
+            job_name=job_name,
+            owner=worker_id(),
+            status=status,
+            started_at=started_at,
+            finished_at=datetime.now(),
+            duration_ms=duration_ms,
+            error=error
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[Scheduler] 실행 이력 저장 실패 ({job_name}): {e}")
+    finally:
+        db.close()
+
+def run_exclusive(job_name: str, func, lease_seconds: float):
+    """lease를 얻은 워커에서만 작업을 실행하고 실행 이력을 남긴다"""
+    if not try_acquire_lease(job_name, lease_seconds):
+        return
+
+    started_at = datetime.now()
+    start = time.perf_counter()
+    status, error = "success", None
+    try:
+        func()
+    except Exception as e:
+        status, error = "failed", str(e)
+        print(f"[Scheduler Error] {job_name}: {e}")
+
+    duration_ms = int((time.perf_counter() - start) * 1000)
+    job_latency[job_name].observe(duration_ms)
+    record_job_run(job_name, status, started_at, duration_ms, error)
+
+def add_exclusive_job(func, trigger: str, lease_seconds: float, job_name: str = None, **trigger_args):
+    """
+    공용 스케줄러에 클러스터 단일 실행 작업 등록
+
+    lease_seconds는 실행 주기보다 약간 짧게 잡는다.
+    (예: 30초 주기 -> 25초) 주기 안에서는 한 워커만 실행하고, 다음 주기에는 아무 워커나 다시 가져갈 수 있다.
+    """
+    name = job_name or func.__name__
+    scheduler.add_job(
+        run_exclusive,
+        trigger,
+        args=[name, func, lease_seconds],
+        id=name,
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        **trigger_args
+    )
+
+def start_scheduler():
+    if not scheduler.running:
+        scheduler.start()
+
+def shutdown_scheduler():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
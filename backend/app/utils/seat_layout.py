@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import SessionLocal
+from models import Seat, SeatZone, SeatLayout
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 좌석 배치 인덱스 (seat_zones / seat_layouts → 메모리 캐시)
+# 관리자 통계, 자리 추천, 키오스크 좌석 목록이 같은 seat_id → 구역 매핑을 공유한다.
+# 배치 변경 시 invalidate_seat_layout(), 다른 워커는 LAYOUT_TTL 이후 다시 읽는다.
+# 구역/배치 행이 없으면 기존 좌석 번호 규칙(1~20번 고정석 등)으로 대신한다. (읽기 전용)
+# 빠진 구역/배치 행은 0008 마이그레이션과 서버 시작 시(fill_missing_layouts)에만 채워 넣는다.
+# ---------------------------------------------------------
+
+LAYOUT_TTL = 300                # 초
+DEFAULT_ZONE_KEY = "aisle"      # 어느 기본 범위에도 속하지 않는 좌석의 구역
+
+# seat_zones가 비어 있을 때 쓰는 기본 구역 (zone_key, 표시명, 정렬 순서, 고정석 여부) — 0008 초기 데이터와 같음
+DEFAULT_ZONES = [
+    ("fix", "고정석 (Private)", 1, True),
+    ("view", "창가석 (View)", 2, False),
+    ("island", "중앙석 (Island)", 3, False),
+    ("corner", "독립석 (Corner)", 4, False),
+    ("easy", "음료대석 (Easy)", 5, False),
+    ("aisle", "일반석 (Aisle)", 6, False),
+]
+
+# 배치 행이 없는 좌석의 구역 (기존 하드코딩 범위: zone_key, 시작 seat_id, 끝 seat_id)
+DEFAULT_ZONE_RANGES = [
+    ("fix", 1, 20),
+    ("view", 21, 30),
+    ("island", 31, 50),
+    ("corner", 51, 60),
+    ("island", 61, 70),
+    ("easy", 71, 90),
+]
+
+def default_zone_key(seat_id: int) -> str:
+    for zone_key, start, end in DEFAULT_ZONE_RANGES:
+        if start <= seat_id <= end:
+            return zone_key
+    return DEFAULT_ZONE_KEY
+
+def zone_key_expr():
+    """SQL용 좌석 구역 (seat_layouts.zone_key, 없으면 default_zone_key와 같은 범위) — Seat에 SeatLayout을 outer join해서 사용"""
+    default = case(
+        *[(Seat.seat_id.between(start, end), zone_key) for zone_key, start, end in DEFAULT_ZONE_RANGES],
+        else_=DEFAULT_ZONE_KEY
+    )
+    return func.coalesce(SeatLayout.zone_key, default)
+
+class SeatLayoutIndex:
+    """구역 목록(정렬 순서)과 seat_id → zone_key 매핑 (좌석 전체 기준)"""
+
+    def __init__(self, zones: list, layouts: list, seat_ids: list):
+        if zones:
+            self.zones = [
+                {"key": z.zone_key, "name": z.name, "floor": z.floor, "is_fixed": z.is_fixed}
+                for z in zones
+            ]
+        else:
+            self.zones = [
+                {"key": key, "name": name, "floor": 1, "is_fixed": is_fixed}
+                for key, name, _, is_fixed in DEFAULT_ZONES
+            ]
+        self.zone_map = {z["key"]: z for z in self.zones}
+        self.seat_zone = {layout.seat_id: layout.zone_key for layout in layouts}
+        self.seat_floor = {layout.seat_id: layout.floor for layout in layouts}
+
+        # 배치 행이 없는 좌석은 기본 범위로 (그 구역이 없으면 기본 구역)
+        self.missing_seat_ids = [sid for sid in seat_ids if sid not in self.seat_zone]
+        for sid in self.missing_seat_ids:
+            key = default_zone_key(sid)
+            self.seat_zone[sid] = key if key in self.zone_map else DEFAULT_ZONE_KEY
+
+        fixed_keys = {z["key"] for z in self.zones if z["is_fixed"]}
+        self.fixed_seat_ids = {sid for sid, key in self.seat_zone.items() if key in fixed_keys}
+
+    def zone_of(self, seat_id: int) -> str:
+        zone_key = self.seat_zone.get(seat_id)
+        if zone_key is None:
+            zone_key = default_zone_key(seat_id)
+        return zone_key if zone_key in self.zone_map else DEFAULT_ZONE_KEY
+
+    def zone_name(self, zone_key: str) -> Optional[str]:
+        zone = self.zone_map.get(zone_key)
+        return zone["name"] if zone else None
+
+    def is_fixed(self, seat_id: int) -> bool:
+        zone = self.zone_map.get(self.zone_of(seat_id))
+        return bool(zone and zone["is_fixed"])
+
+_index = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+def _is_fresh() -> bool:
+    return _index is not None and time.monotonic() - _loaded_at < LAYOUT_TTL
+
+def _store(zones: list, layouts: list, seat_ids: list) -> SeatLayoutIndex:
+    global _index, _loaded_at
+    index = SeatLayoutIndex(zones, layouts, seat_ids)
+    if not zones:
+        logger.error("seat_zones가 비어 있어 기본 구역(좌석 번호 범위)을 사용합니다. `alembic upgrade head`를 확인하세요.")
+    elif index.missing_seat_ids:
+        logger.warning("배치 정보가 없는 좌석 %d개는 기본 범위 구역으로 표시합니다 (서버 재시작 시 저장): %s",
+                       len(index.missing_seat_ids), index.missing_seat_ids)
+    with _lock:
+        _index, _loaded_at = index, time.monotonic()
+    return index
+
+def ensure_seat_layouts(db: Session) -> int:
+    """
+    구역이 비어 있으면 기본 구역을, 배치 행이 없는 좌석에는 기본 범위 구역의 배치 행을 추가한다.
+    (서버 시작 시 호출, commit은 호출한 쪽에서)
+    """
+    if db.query(SeatZone.zone_key).first() is None:
+        db.execute(insert(SeatZone).values([
+            {"zone_key": key, "name": name, "floor": 1, "sort_order": order, "is_fixed": is_fixed}
+            for key, name, order, is_fixed in DEFAULT_ZONES
+        ]).on_conflict_do_nothing())
+
+    zone_keys = {key for (key,) in db.query(SeatZone.zone_key).all()}
+    missing = (
+        db.query(Seat.seat_id)
+        .outerjoin(SeatLayout, SeatLayout.seat_id == Seat.seat_id)
+        .filter(SeatLayout.seat_id == None)
+        .all()
+    )
+    rows = []
+    for (seat_id,) in missing:
+        zone_key = default_zone_key(seat_id)
+        if zone_key not in zone_keys:
+            zone_key = DEFAULT_ZONE_KEY
+        if zone_key in zone_keys:
+            rows.append({"seat_id": seat_id, "zone_key": zone_key, "floor": 1})
+    if rows:
+        db.execute(insert(SeatLayout).values(rows).on_conflict_do_nothing())
+        logger.warning("배치 정보가 없는 좌석 %d개에 기본 구역을 지정했습니다: %s",
+                       len(rows), [row["seat_id"] for row in rows])
+    return len(rows)
+
+def fill_missing_layouts():
+    """서버 시작 시 기본 구역/배치 행 저장 (실패해도 조회는 메모리 기본값으로 계속 동작)"""
+    db = SessionLocal()
+    try:
+        ensure_seat_layouts(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("기본 좌석 배치 저장 실패: %s", e)
+    finally:
+        db.close()
+
+def get_seat_layout(db: Session) -> SeatLayoutIndex:
+    if _is_fresh():
+        return _index
+    zones = db.query(SeatZone).order_by(SeatZone.floor, SeatZone.sort_order).all()
+    layouts = db.query(SeatLayout).all()
+    seat_ids = [seat_id for (seat_id,) in db.query(Seat.seat_id).all()]
+    return _store(zones, layouts, seat_ids)
+
+async def get_seat_layout_async(db: AsyncSession) -> SeatLayoutIndex:
+    if _is_fresh():
+        return _index
+    zones = (await db.execute(select(SeatZone).order_by(SeatZone.floor, SeatZone.sort_order))).scalars().all()
+    layouts = (await db.execute(select(SeatLayout))).scalars().all()
+    seat_ids = (await db.execute(select(Seat.seat_id))).scalars().all()
+    return _store(zones, layouts, seat_ids)
+
+def invalidate_seat_layout():
+    global _index
+    with _lock:
+        _index = None
@@ -0,0 +1,199 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from models import Seat, SeatUsage, MemberSeatStat, MemberSeatProfile, RecommendationLog
+
+# ---------------------------------------------------------
+# 회원별 좌석 추천 프로필 (member_seat_stats / member_seat_profiles)
+# 퇴실 시점마다 한 건씩 누적하고, 새벽 배치(rebuild_member_profiles)로 원본과 맞춘다.
+# 추천(/ai/seat)은 이 프로필과 현재 빈 좌석만 읽는다.
+# ---------------------------------------------------------
+
+SEAT_FEATURES = ("near_window", "corner_seat", "aisle_seat", "isolated", "near_beverage_table", "is_center")
+HALF_LIFE_DAYS = 30             # 최근성 가중치 반감기 (일)
+EXCLUDED_MEMBER_IDS = (1, 2)    # 관리자 / 비회원 공용 계정은 프로필을 만들지 않는다
+
+def decay_factor(since: Optional[datetime], now: datetime) -> float:
+    if since is None or now <= since:
+        return 1.0
+    days = (now - since).total_seconds() / 86400.0
+    return 0.5 ** (days / HALF_LIFE_DAYS)
+
+def seat_feature_vector(seat: Seat) -> list:
+    return [1.0 if getattr(seat, attr) else 0.0 for attr in SEAT_FEATURES]
+
+# 최근성 감쇠 계수 (SQL 버전, decay_factor와 같음): 새 이용 시각이 기준 시각보다 나중일 때만 감쇠
+_DECAY_SQL = """
+    CASE WHEN {ref} IS NULL OR EXCLUDED.{col} <= {ref} THEN 1.0
+         ELSE power(0.5, EXTRACT(EPOCH FROM EXCLUDED.{col} - {ref}) / 86400.0 / :half_life) END
+"""
+
+# 첫 이용이어서 행이 없을 때도 재계산 배치나 다른 퇴실 처리와 겹쳐 unique 위반이 나지 않도록 upsert로 누적
+_UPSERT_STAT_SQL = text(f"""
+    INSERT INTO member_seat_stats AS m (member_id, seat_id, use_count, total_minutes, decayed_weight, last_used_at)
+    VALUES (:member_id, :seat_id, 1, :minutes, 1.0, :used_at)
+    ON CONFLICT (member_id, seat_id) DO UPDATE SET
+        use_count = m.use_count + 1,
+        total_minutes = m.total_minutes + EXCLUDED.total_minutes,
+        decayed_weight = m.decayed_weight * {_DECAY_SQL.format(ref="m.last_used_at", col="last_used_at")} + 1.0,
+        last_used_at = GREATEST(m.last_used_at, EXCLUDED.last_used_at)
+""")
+
+_UPSERT_PROFILE_SQL = text(f"""
+    INSERT INTO member_seat_profiles AS p (
+        member_id, total_uses, attr_counts, attr_decayed, decayed_total, decay_ref_at, updated_at
+    )
+    VALUES (
+        :member_id, 1, CAST(:features AS double precision[]), CAST(:features AS double precision[]),
+        1.0, :used_at, localtimestamp
+    )
+    ON CONFLICT (member_id) DO UPDATE SET
+        total_uses = p.total_uses + 1,
+        attr_counts = (
+            SELECT array_agg(t.c + t.f ORDER BY t.i)
+            FROM unnest(p.attr_counts, EXCLUDED.attr_counts) WITH ORDINALITY AS t(c, f, i)
+        ),
+        attr_decayed = (
+            SELECT array_agg(t.d * {_DECAY_SQL.format(ref="p.decay_ref_at", col="decay_ref_at")} + t.f ORDER BY t.i)
+            FROM unnest(p.attr_decayed, EXCLUDED.attr_decayed) WITH ORDINALITY AS t(d, f, i)
+        ),
+        decayed_total = p.decayed_total * {_DECAY_SQL.format(ref="p.decay_ref_at", col="decay_ref_at")} + 1.0,
+        decay_ref_at = GREATEST(p.decay_ref_at, EXCLUDED.decay_ref_at),
+        updated_at = localtimestamp
+""")
+
+def update_member_profile(db: Session, usage: SeatUsage, seat: Optional[Seat]):
+    """퇴실 처리된 이용 기록 한 건을 회원 추천 프로필에 더한다 (commit은 호출한 쪽에서)"""
+    if not usage.member_id or usage.member_id in EXCLUDED_MEMBER_IDS:
+        return
+    if not usage.check_out_time or not usage.check_in_time or not usage.seat_id:
+        return
+
+    if seat is None:
+        seat = db.query(Seat).filter(Seat.seat_id == usage.seat_id).first()
+    params = {
+        "member_id": usage.member_id,
+        "seat_id": usage.seat_id,
+        "minutes": max((usage.check_out_time - usage.check_in_time).total_seconds() / 60.0, 0.0),
+        "used_at": usage.check_out_time,
+        "features": seat_feature_vector(seat) if seat else [0.0] * len(SEAT_FEATURES),
+        "half_life": HALF_LIFE_DAYS,
+    }
+
+    # 1) 좌석별 이용 횟수 / 시간 / 최근성 가중치
+    db.execute(_UPSERT_STAT_SQL, params)
+    # 2) 좌석 속성별 선호도 (횟수 + 최근성 가중 합)
+    db.execute(_UPSERT_PROFILE_SQL, params)
+
+def load_member_profile(db: Session, member_id: int):
+    """추천용 프로필 조회 → (좌석별 통계 목록, 속성 프로필 또는 None)"""
+    stats = db.query(MemberSeatStat.seat_id, MemberSeatStat.use_count, MemberSeatStat.total_minutes)\
+        .filter(MemberSeatStat.member_id == member_id).all()
+    profile = db.query(MemberSeatProfile).filter(MemberSeatProfile.member_id == member_id).first()
+    return stats, profile
+
+def log_recommendation(db: Session, member_id: int, strategy: str, ranked: list, free_seat_count: int):
+    """추천 결과 기록 (오프라인 평가용: 이후 seat_usage의 실제 입실 좌석과 비교, commit은 호출한 쪽에서)"""
+    db.add(RecommendationLog(
+        member_id=member_id,
+        strategy=strategy,
+        seat_ids=[seat_id for seat_id, _, _ in ranked],
+        scores=[score for _, _, score in ranked] if strategy == "profile" else None,
+        free_seat_count=free_seat_count
+    ))
+
+# ---------------------------------------------------------
+# 전체 재계산 (누적치 보정용)
+# ---------------------------------------------------------
+
+_USAGE_CTE = """
+    WITH s AS (
+        SELECT su.member_id, su.seat_id, su.check_out_time,
+               GREATEST(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time) / 60.0, 0) AS minutes,
+               MAX(su.check_out_time) OVER (PARTITION BY su.member_id, su.seat_id) AS seat_last,
+               MAX(su.check_out_time) OVER (PARTITION BY su.member_id) AS member_last
+        FROM seat_usage su
+        WHERE su.check_out_time IS NOT NULL
+          AND su.seat_id IS NOT NULL
+          AND su.member_id IS NOT NULL
+          AND su.member_id NOT IN (1, 2)
+          {filters}
+    )
+"""
+
+_REBUILD_STATS_SQL = _USAGE_CTE + """
+    INSERT INTO member_seat_stats (member_id, seat_id, use_count, total_minutes, decayed_weight, last_used_at)
+    SELECT member_id, seat_id, COUNT(*), SUM(minutes),
+           SUM(power(0.5, EXTRACT(EPOCH FROM seat_last - check_out_time) / 86400.0 / :half_life)),
+           MAX(check_out_time)
+    FROM s
+    GROUP BY member_id, seat_id
+    ON CONFLICT (member_id, seat_id) DO UPDATE SET
+        use_count = EXCLUDED.use_count,
+        total_minutes = EXCLUDED.total_minutes,
+        decayed_weight = EXCLUDED.decayed_weight,
+        last_used_at = EXCLUDED.last_used_at
+"""
+
+_REBUILD_PROFILE_SQL = _USAGE_CTE + """
+    , w AS (
+        SELECT s.member_id, s.member_last,
+               power(0.5, EXTRACT(EPOCH FROM s.member_last - s.check_out_time) / 86400.0 / :half_life) AS w,
+               ARRAY[st.near_window, st.corner_seat, st.aisle_seat,
+                     st.isolated, st.near_beverage_table, st.is_center] AS f
+        FROM s
+        LEFT JOIN seats st ON st.seat_id = s.seat_id
+    )
+    INSERT INTO member_seat_profiles (member_id, total_uses, attr_counts, attr_decayed, decayed_total, decay_ref_at, updated_at)
+    SELECT member_id, COUNT(*),
+           ARRAY[{counts}],
+           ARRAY[{decayed}],
+           SUM(w), MAX(member_last), localtimestamp
+    FROM w
+    GROUP BY member_id
+    ON CONFLICT (member_id) DO UPDATE SET
+        total_uses = EXCLUDED.total_uses,
+        attr_counts = EXCLUDED.attr_counts,
+        attr_decayed = EXCLUDED.attr_decayed,
+        decayed_total = EXCLUDED.decayed_total,
+        decay_ref_at = EXCLUDED.decay_ref_at,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# 원본 이용 기록이 없어진 행 정리
+_PRUNE_STATS_SQL = """
+    DELETE FROM member_seat_stats m
+    WHERE {filters}NOT EXISTS (
+        SELECT 1 FROM seat_usage su
+        WHERE su.member_id = m.member_id AND su.seat_id = m.seat_id AND su.check_out_time IS NOT NULL
+    )
+"""
+
+_PRUNE_PROFILES_SQL = """
+    DELETE FROM member_seat_profiles m
+    WHERE {filters}NOT EXISTS (
+        SELECT 1 FROM seat_usage su
+        WHERE su.member_id = m.member_id AND su.seat_id IS NOT NULL AND su.check_out_time IS NOT NULL
+    )
+"""
+
+def rebuild_member_profiles(db: Session, member_id: int = None):
+    """
+    이용 기록 원본으로 추천 프로필을 다시 만든다 (commit은 호출한 쪽에서)
+    퇴실 시 update_member_profile과 겹쳐도 실패하거나 누적이 덮어써지지 않도록
+    트랜잭션 동안 두 테이블 쓰기를 막고 (퇴실 처리와 같은 순서로 잠금), upsert 후 남은 행을 정리한다.
+    """
+    db.execute(text("LOCK TABLE member_seat_stats, member_seat_profiles IN SHARE ROW EXCLUSIVE MODE"))
+    params = {"half_life": HALF_LIFE_DAYS, "member_id": member_id}
+    filters = "AND su.member_id = :member_id" if member_id is not None else ""
+    prune_filters = "m.member_id = :member_id AND " if member_id is not None else ""
+
+    # f[i]는 SEAT_FEATURES 순서의 i번째 속성 (PostgreSQL 배열은 1부터)
+    counts = ", ".join(f"SUM(COALESCE(f[{i}], false)::int)::float8" for i in range(1, len(SEAT_FEATURES) + 1))
+    decayed = ", ".join(f"SUM(CASE WHEN f[{i}] THEN w ELSE 0 END)::float8" for i in range(1, len(SEAT_FEATURES) + 1))
+
+    db.execute(text(_REBUILD_STATS_SQL.format(filters=filters)), params)
+    db.execute(text(_REBUILD_PROFILE_SQL.format(filters=filters, counts=counts, decayed=decayed)), params)
+    db.execute(text(_PRUNE_STATS_SQL.format(filters=prune_filters)), params)
+    db.execute(text(_PRUNE_PROFILES_SQL.format(filters=prune_filters)), params)
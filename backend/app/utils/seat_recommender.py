@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import Seat, SeatUsage
+from utils.seat_profile import SEAT_FEATURES, load_member_profile
+
+# ---------------------------------------------------------
+# 좌석 추천 엔진 (/ai/seat)
+# 좌석 속성은 (좌석 × 6) 불리언 행렬, 회원 취향은 좌석 행렬과 같은 순서의 벡터로 캐시해
+# 빈 좌석 전체를 한 번의 행렬-벡터 곱으로 점수화한다.
+# 취향 벡터는 이용 기록 원본이 아니라 저장된 프로필(utils/seat_profile.py)에서 읽는다.
+# ---------------------------------------------------------
+
+# 종합 점수 가중치 (사용빈도 40% / 사용시간 40% / 선호도 20%)
+WEIGHT_USE_COUNT = 0.4
+WEIGHT_MINUTES = 0.4
+WEIGHT_PREFERENCE = 0.2
+
+MATRIX_TTL = 300                # 좌석 속성 행렬 재로딩 주기 (초)
+PREFERENCE_TTL = 3600           # 취향 벡터를 원본 기준으로 다시 읽는 주기 (초)
+PREFERENCE_CACHE_SIZE = 1024    # 취향 벡터를 캐시할 회원 수
+
+class SeatFeatureMatrix:
+    """좌석 속성 행렬 (행 순서 = seat_ids)"""
+
+    def __init__(self, seats: list):
+        self.seat_ids = np.array([seat.seat_id for seat in seats], dtype=np.int64)
+        self.seat_types = [seat.type for seat in seats]
+        self.features = np.array(
+            [[bool(getattr(seat, attr)) for attr in SEAT_FEATURES] for seat in seats],
+            dtype=np.float64,
+        ).reshape(-1, len(SEAT_FEATURES))
+        self.row_of = {int(sid): row for row, sid in enumerate(self.seat_ids)}
+
+    def rows(self, seat_ids) -> np.ndarray:
+        return np.array([self.row_of[sid] for sid in seat_ids if sid in self.row_of], dtype=np.int64)
+
+class MemberPreference:
+    """회원별 좌석 사용 횟수 / 사용 시간(좌석 행렬 순서)과 속성 선호도"""
+
+    def __init__(self, matrix: SeatFeatureMatrix):
+        self.matrix = matrix
+        self.use_count = np.zeros(len(matrix.seat_ids))
+        self.total_minutes = np.zeros(len(matrix.seat_ids))
+        self.attr_counts = np.zeros(len(SEAT_FEATURES))
+        self.attr_decayed = None    # 최근성 가중 속성 합 (프로필이 있을 때만)
+        self.decayed_total = 0.0
+        self.total_uses = 0
+        self.loaded_at = time.monotonic()
+
+    def add(self, seat_id: int, count: int, minutes: float):
+        row = self.matrix.row_of.get(seat_id)
+        if row is None:
+            return
+        self.use_count[row] += count
+        self.total_minutes[row] += minutes
+        self.attr_counts += self.matrix.features[row] * count
+        self.total_uses += count
+
+    @property
+    def scores(self) -> np.ndarray:
+        # 선호도 = 속성별 사용 비율 (0.0 ~ 1.0), 프로필이 있으면 최근 이용에 더 큰 가중치
+        if self.attr_decayed is not None and self.decayed_total > 0:
+            return self.attr_decayed / self.decayed_total
+        return self.attr_counts / self.total_uses if self.total_uses else self.attr_counts
+
+_matrix = None
+_matrix_loaded_at = 0.0
+_preferences = OrderedDict()
+_lock = threading.Lock()
+
+def get_feature_matrix(db: Session) -> SeatFeatureMatrix:
+    global _matrix, _matrix_loaded_at
+    if _matrix is not None and time.monotonic() - _matrix_loaded_at < MATRIX_TTL:
+        return _matrix
+
+    matrix = SeatFeatureMatrix(db.query(Seat).order_by(Seat.seat_id).all())
+    with _lock:
+        unchanged = (
+            _matrix is not None
+            and np.array_equal(_matrix.seat_ids, matrix.seat_ids)
+            and np.array_equal(_matrix.features, matrix.features)
+            and _matrix.seat_types == matrix.seat_types
+        )
+        if unchanged:
+            matrix = _matrix
+        else:
+            # 좌석 구성이 바뀌면 행 순서가 달라지므로 취향 캐시도 비운다
+            _preferences.clear()
+        _matrix, _matrix_loaded_at = matrix, time.monotonic()
+    return matrix
+
+def _load_preference(db: Session, member_id: int, matrix: SeatFeatureMatrix) -> MemberPreference:
+    stats, profile = load_member_profile(db, member_id)
+    pref = MemberPreference(matrix)
+    for seat_id, count, minutes in stats:
+        pref.add(seat_id, count, float(minutes or 0.0))
+    if profile is not None and len(profile.attr_decayed or ()) == len(SEAT_FEATURES):
+        # 속성 선호도는 좌석 행렬에서 사라진 좌석의 이용분까지 포함한 프로필 값을 사용
+        pref.attr_counts = np.array(profile.attr_counts, dtype=np.float64)
+        pref.attr_decayed = np.array(profile.attr_decayed, dtype=np.float64)
+        pref.decayed_total = float(profile.decayed_total or 0.0)
+        pref.total_uses = profile.total_uses
+    return pref
+
+def get_member_preference(db: Session, member_id: int, matrix: SeatFeatureMatrix) -> MemberPreference:
+    with _lock:
+        pref = _preferences.get(member_id)
+        fresh = pref is not None and time.monotonic() - pref.loaded_at < PREFERENCE_TTL
+        if fresh and pref.matrix is matrix:
+            _preferences.move_to_end(member_id)
+            return pref
+
+    pref = _load_preference(db, member_id, matrix)
+    with _lock:
+        _preferences[member_id] = pref
+        _preferences.move_to_end(member_id)
+        while len(_preferences) > PREFERENCE_CACHE_SIZE:
+            _preferences.popitem(last=False)
+    return pref
+
+def recommend_seats(pref: MemberPreference, free_seat_ids: list, k: int = 3) -> list:
+    """빈 좌석 점수를 한 번에 계산해 상위 k개 [(seat_id, type, score)] 반환"""
+    matrix = pref.matrix
+    rows = matrix.rows(free_seat_ids)
+    if not rows.size:
+        return []
+
+    scores = (
+        WEIGHT_USE_COUNT / (1 + pref.use_count[rows]) +
+        WEIGHT_MINUTES / (1 + pref.total_minutes[rows]) +
+        WEIGHT_PREFERENCE * (matrix.features[rows] @ pref.scores)
+    )
+    # 동점이면 좌석 번호가 작은 쪽 우선 (기존 순차 비교와 동일)
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [
+        (int(matrix.seat_ids[rows[i]]), matrix.seat_types[rows[i]], round(float(scores[i]), 4))
+        for i in order
+    ]
+
+# ---------------------------------------------------------
+# 퇴실 시 캐시된 취향 벡터 무효화 (commit 이후 반영)
+# 프로필 테이블이 퇴실과 같은 트랜잭션에서 갱신되므로, 다음 추천 때 다시 읽으면 된다.
+# ---------------------------------------------------------
+
+def queue_preference_update(db: Session, usage: SeatUsage):
+    if usage.member_id:
+        db.info.setdefault("seat_preference_invalidate", set()).add(usage.member_id)
+
+@event.listens_for(Session, "after_commit")
+def _apply_preference_updates(session):
+    member_ids = session.info.pop("seat_preference_invalidate", None)
+    if not member_ids:
+        return
+    with _lock:
+        for member_id in member_ids:
+            _preferences.pop(member_id, None)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_preference_updates(session):
+    session.info.pop("seat_preference_invalidate", None)
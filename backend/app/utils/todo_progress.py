@@ -0,0 +1,92 @@
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from models import Member, SeatUsage, TODO, UserTODO, MileageHistory
+
+# ---------------------------------------------------------
+# TODO 진행도 (user_todos.progress_seconds / attended_days 누적치)
+# 퇴실 시점마다 해당 이용 기록만큼 더해 두고, 달성 판정은 누적치만 읽는다.
+# ---------------------------------------------------------
+
+# 전체 재계산 (누적치 보정용, 한 번의 GROUP BY로 모든 도전의 진행도를 계산)
+_REBUILD_SQL = """
+    UPDATE user_todos AS ut
+    SET progress_seconds = agg.progress_seconds,
+        attended_days = agg.attended_days
+    FROM (
+        SELECT ut.user_todo_id,
+               COALESCE(SUM(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time))
+                        FILTER (WHERE su.check_out_time IS NOT NULL), 0)::bigint AS progress_seconds,
+               COUNT(DISTINCT CAST(su.check_in_time AS date))
+                        FILTER (WHERE su.is_attended) AS attended_days
+        FROM user_todos ut
+        LEFT JOIN seat_usage su
+               ON su.member_id = ut.member_id
+              AND su.check_in_time >= ut.started_at
+        {where}
+        GROUP BY ut.user_todo_id
+    ) AS agg
+    WHERE ut.user_todo_id = agg.user_todo_id
+"""
+
+def accumulate_usage(db: Session, usage: SeatUsage):
+    """퇴실 처리된 이용 기록을 해당 회원의 도전 누적치에 더한다 (commit은 호출한 쪽에서)"""
+    if not usage.member_id or not usage.check_out_time or not usage.check_in_time:
+        return
+
+    seconds = max(int((usage.check_out_time - usage.check_in_time).total_seconds()), 0)
+    attended = 1 if usage.is_attended else 0
+
+    db.query(UserTODO).filter(
+        UserTODO.member_id == usage.member_id,
+        UserTODO.started_at <= usage.check_in_time
+    ).update({
+        UserTODO.progress_seconds: UserTODO.progress_seconds + seconds,
+        UserTODO.attended_days: UserTODO.attended_days + attended
+    }, synchronize_session=False)
+
+def current_value(user_todo: UserTODO, todo_type: str) -> int:
+    """도전 타입별 현재 달성 값 (time: 분, attendance: 일)"""
+    if todo_type == "attendance":
+        return user_todo.attended_days or 0
+    return int((user_todo.progress_seconds or 0) / 60)
+
+def evaluate_todos(db: Session, member: Member, now: datetime) -> list:
+    """진행 중인 도전의 달성 여부를 누적치로 판정하고 보상을 지급"""
+    active_todos = db.query(UserTODO, TODO).join(TODO, UserTODO.todo_id == TODO.todo_id).filter(
+        UserTODO.member_id == member.member_id,
+        UserTODO.is_achieved == False
+    ).all()
+
+    todo_results = []
+    for user_todo, todo_def in active_todos:
+        current_val = current_value(user_todo, todo_def.todo_type)
+        is_cleared = todo_def.todo_type in ("time", "attendance") and current_val >= todo_def.todo_value
+
+        reward_amount = 0
+        if is_cleared:
+            user_todo.is_achieved = True
+            user_todo.achieved_at = now
+
+            payback_rate = 1 + (todo_def.payback_mileage_percent / 100.0)
+            reward_amount = int(todo_def.betting_mileage * payback_rate)
+
+            if reward_amount > 0:
+                member.total_mileage += reward_amount
+                db.add(MileageHistory(member_id=member.member_id, amount=reward_amount, type="prize"))
+
+        todo_results.append({
+            "title": todo_def.todo_title,
+            "type": todo_def.todo_type,
+            "goal_value": todo_def.todo_value,
+            "current_value": current_val,
+            "is_achieved_now": is_cleared,
+            "reward_amount": reward_amount
+        })
+
+    return todo_results
+
+def rebuild_todo_progress(db: Session, member_id: int = None):
+    """이용 기록 원본으로 누적치를 다시 계산 (commit은 호출한 쪽에서)"""
+    where = "WHERE ut.member_id = :member_id" if member_id is not None else ""
+    db.execute(text(_REBUILD_SQL.format(where=where)), {"member_id": member_id})
@@ -0,0 +1,275 @@
+import json
+from datetime import date
+from typing import Optional
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from models import Seat, SeatUsage
+
+# ---------------------------------------------------------
+# 회원별 일일 이용 집계 (member_daily_usage)
+# 퇴실 시점에 한 행씩 누적하고, 배치(rebuild_usage_rollup)로 원본과 맞춘다.
+# ---------------------------------------------------------
+
+# 좌석 유형 분류 (통계 화면 표시용 문자열)
+def classify_seat_type(seat):
+    if seat is None:
+        return "일반석"
+    if seat.near_window:
+        return "창가석"
+    if seat.corner_seat:
+        return "코너석"
+    if seat.aisle_seat:
+        return "통로석"
+    if seat.isolated:
+        return "고립석"
+    if seat.near_beverage_table:
+        return "음료바근처"
+    if seat.is_center:
+        return "중앙석"
+    return "일반석"
+
+# classify_seat_type과 같은 우선순위의 SQL 버전 (배치 재계산용)
+_SEAT_TYPE_CASE = """
+    CASE
+        WHEN st.near_window THEN '창가석'
+        WHEN st.corner_seat THEN '코너석'
+        WHEN st.aisle_seat THEN '통로석'
+        WHEN st.isolated THEN '고립석'
+        WHEN st.near_beverage_table THEN '음료바근처'
+        WHEN st.is_center THEN '중앙석'
+        ELSE '일반석'
+    END
+"""
+
+_UPSERT_SQL = text("""
+    INSERT INTO member_daily_usage AS mdu (
+        member_id, usage_date, session_count, usage_minutes, focus_minutes, best_focus_minutes,
+        attended, hour_focus, seat_type_counts, updated_at
+    )
+    VALUES (
+        :member_id, :usage_date, 1, :usage_minutes, :focus_minutes, :focus_minutes,
+        :attended, CAST(:hour_focus AS double precision[]), CAST(:seat_type_counts AS jsonb), localtimestamp
+    )
+    ON CONFLICT (member_id, usage_date) DO UPDATE SET
+        session_count = mdu.session_count + 1,
+        usage_minutes = mdu.usage_minutes + EXCLUDED.usage_minutes,
+        focus_minutes = mdu.focus_minutes + EXCLUDED.focus_minutes,
+        best_focus_minutes = GREATEST(mdu.best_focus_minutes, EXCLUDED.best_focus_minutes),
+        attended = mdu.attended OR EXCLUDED.attended,
+        hour_focus[:hour_index] = mdu.hour_focus[:hour_index] + :focus_minutes,
+        seat_type_counts = jsonb_set(
+            mdu.seat_type_counts,
+            ARRAY[:seat_type],
+            to_jsonb(COALESCE((mdu.seat_type_counts ->> :seat_type)::int, 0) + 1)
+        ),
+        updated_at = localtimestamp
+""")
+
+_ADD_FOCUS_SQL = text("""
+    UPDATE member_daily_usage
+    SET focus_minutes = focus_minutes + :minutes,
+        hour_focus[:hour_index] = hour_focus[:hour_index] + :minutes,
+        best_focus_minutes = GREATEST(best_focus_minutes, :session_focus),
+        updated_at = localtimestamp
+    WHERE member_id = :member_id AND usage_date = :usage_date
+""")
+
+_REBUILD_SQL = """
+    WITH s AS (
+        SELECT su.member_id,
+               CAST(su.check_in_time AS date) AS d,
+               EXTRACT(HOUR FROM su.check_in_time)::int AS h,
+               GREATEST(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time) / 60.0, 0) AS usage_min,
+               COALESCE(su.total_in_time, 0)::float8 AS focus,
+               COALESCE(su.is_attended, false) AS is_attended,
+               {seat_type} AS seat_type
+        FROM seat_usage su
+        LEFT JOIN seats st ON st.seat_id = su.seat_id
+        WHERE su.check_out_time IS NOT NULL
+          AND su.member_id IS NOT NULL
+          {filters}
+    ),
+    hourly AS (
+        SELECT member_id, d, h, SUM(focus) AS focus
+        FROM s
+        GROUP BY member_id, d, h
+    ),
+    hour_arrays AS (
+        SELECT k.member_id, k.d, array_agg(COALESCE(hourly.focus, 0) ORDER BY g.h) AS hour_focus
+        FROM (SELECT DISTINCT member_id, d FROM s) AS k
+        CROSS JOIN generate_series(0, 23) AS g(h)
+        LEFT JOIN hourly ON hourly.member_id = k.member_id AND hourly.d = k.d AND hourly.h = g.h
+        GROUP BY k.member_id, k.d
+    ),
+    seat_types AS (
+        SELECT member_id, d, jsonb_object_agg(seat_type, cnt) AS seat_type_counts
+        FROM (SELECT member_id, d, seat_type, COUNT(*) AS cnt FROM s GROUP BY member_id, d, seat_type) AS t
+        GROUP BY member_id, d
+    ),
+    daily AS (
+        SELECT member_id, d,
+               COUNT(*) AS session_count,
+               SUM(usage_min) AS usage_minutes,
+               SUM(focus) AS focus_minutes,
+               MAX(focus) AS best_focus_minutes,
+               BOOL_OR(is_attended) AS attended
+        FROM s
+        GROUP BY member_id, d
+    )
+    INSERT INTO member_daily_usage (
+        member_id, usage_date, session_count, usage_minutes, focus_minutes, best_focus_minutes,
+        attended, hour_focus, seat_type_counts, updated_at
+    )
+    SELECT daily.member_id, daily.d, daily.session_count, daily.usage_minutes, daily.focus_minutes,
+           daily.best_focus_minutes, daily.attended, hour_arrays.hour_focus, seat_types.seat_type_counts, localtimestamp
+    FROM daily
+    JOIN hour_arrays ON hour_arrays.member_id = daily.member_id AND hour_arrays.d = daily.d
+    JOIN seat_types ON seat_types.member_id = daily.member_id AND seat_types.d = daily.d
+    ON CONFLICT (member_id, usage_date) DO UPDATE SET
+        session_count = EXCLUDED.session_count,
+        usage_minutes = EXCLUDED.usage_minutes,
+        focus_minutes = EXCLUDED.focus_minutes,
+        best_focus_minutes = EXCLUDED.best_focus_minutes,
+        attended = EXCLUDED.attended,
+        hour_focus = EXCLUDED.hour_focus,
+        seat_type_counts = EXCLUDED.seat_type_counts,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# 퇴실 완료된 원본 이용 기록이 없어진 (회원, 일자) 행 정리
+_PRUNE_SQL = """
+    DELETE FROM member_daily_usage mdu
+    WHERE {filters}NOT EXISTS (
+        SELECT 1 FROM seat_usage su
+        WHERE su.member_id = mdu.member_id
+          AND CAST(su.check_in_time AS date) = mdu.usage_date
+          AND su.check_out_time IS NOT NULL
+    )
+"""
+
+def _usage_minutes(usage: SeatUsage) -> float:
+    return max((usage.check_out_time - usage.check_in_time).total_seconds() / 60.0, 0.0)
+
+def record_usage(db: Session, usage: SeatUsage, seat: Optional[Seat]):
+    """퇴실 처리된 이용 기록 한 건을 일일 집계에 더한다 (commit은 호출한 쪽에서)"""
+    if not usage.member_id or not usage.check_out_time or not usage.check_in_time:
+        return
+
+    focus = float(usage.total_in_time or 0)
+    hour = usage.check_in_time.hour
+    seat_type = classify_seat_type(seat)
+
+    hour_focus = [0.0] * 24
+    hour_focus[hour] = focus
+
+    db.execute(_UPSERT_SQL, {
+        "member_id": usage.member_id,
+        "usage_date": usage.check_in_time.date(),
+        "usage_minutes": _usage_minutes(usage),
+        "focus_minutes": focus,
+        "attended": bool(usage.is_attended),
+        "hour_focus": hour_focus,
+        "hour_index": hour + 1,  # PostgreSQL 배열은 1부터 시작
+        "seat_type": seat_type,
+        "seat_type_counts": json.dumps({seat_type: 1}, ensure_ascii=False),
+    })
+
+def add_focus_minutes(db: Session, usage: SeatUsage, minutes: int):
+    """퇴실 이후 도착한 집중 시간(checktime)을 일일 집계에 반영"""
+    if not usage.member_id or not usage.check_out_time or not minutes:
+        return
+
+    db.execute(_ADD_FOCUS_SQL, {
+        "member_id": usage.member_id,
+        "usage_date": usage.check_in_time.date(),
+        "minutes": float(minutes),
+        "session_focus": float(usage.total_in_time or 0),
+        "hour_index": usage.check_in_time.hour + 1,
+    })
+
+def rebuild_usage_rollup(db: Session, member_id: int = None, since: date = None):
+    """
+    이용 기록 원본으로 일일 집계를 다시 만든다 (commit은 호출한 쪽에서)
+    퇴실 시 record_usage 누적과 겹쳐도 실패하거나 누적이 덮어써지지 않도록
+    트랜잭션 동안 member_daily_usage 쓰기를 막고, 행은 지우지 않고 upsert로 원본 값에 맞춘다.
+    """
+    db.execute(text("LOCK TABLE member_daily_usage IN SHARE ROW EXCLUSIVE MODE"))
+    params = {}
+    source_filters = ""
+    prune_filters = ""
+    if member_id is not None:
+        params["member_id"] = member_id
+        source_filters += " AND su.member_id = :member_id"
+        prune_filters += "mdu.member_id = :member_id AND "
+    if since is not None:
+        params["since"] = since
+        source_filters += " AND CAST(su.check_in_time AS date) >= :since"
+        prune_filters += "mdu.usage_date >= :since AND "
+
+    db.execute(text(_REBUILD_SQL.format(seat_type=_SEAT_TYPE_CASE, filters=source_filters)), params)
+    db.execute(text(_PRUNE_SQL.format(filters=prune_filters)), params)
+
+# ---------------------------------------------------------
+# 컬럼 배열 기반 집계 (원본 이용 기록 → 일일 집계, ORM 객체 생성 없이 한 번에 계산)
+# 집계 테이블 검증(scripts/verify_usage_rollup.py) 등 대량 원본 계산에 사용
+# ---------------------------------------------------------
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def load_session_columns(db: Session, member_id: int = None, since: date = None) -> dict:
+    """퇴실 완료된 이용 기록을 (member_id, check_in, check_out, total_in_time, seat_id) 배열로 로드"""
+    query = select(
+        SeatUsage.member_id, SeatUsage.check_in_time, SeatUsage.check_out_time,
+        SeatUsage.total_in_time, SeatUsage.seat_id
+    ).filter(SeatUsage.check_out_time.isnot(None), SeatUsage.member_id.isnot(None))
+    if member_id is not None:
+        query = query.filter(SeatUsage.member_id == member_id)
+    if since is not None:
+        query = query.filter(SeatUsage.check_in_time >= since)
+
+    rows = db.execute(query).all()
+    member_ids, check_in, check_out, focus, seat_ids = zip(*rows) if rows else ((),) * 5
+    return {
+        "member_id": np.array(member_ids, dtype=np.int64),
+        "check_in": np.array(check_in, dtype="datetime64[s]"),
+        "check_out": np.array(check_out, dtype="datetime64[s]"),
+        "focus": np.array([f or 0 for f in focus], dtype=np.float64),
+        "seat_id": np.array([s or 0 for s in seat_ids], dtype=np.int64),
+    }
+
+def daily_rollup_from_columns(cols: dict) -> dict:
+    """이용 기록 배열을 (회원, 일자) 단위로 묶어 member_daily_usage와 같은 값을 계산"""
+    if not cols["member_id"].size:
+        empty = np.zeros(0)
+        return {
+            "member_id": empty.astype(np.int64), "day": empty.astype(np.int64),
+            "session_count": empty.astype(np.int64), "usage_minutes": empty, "focus_minutes": empty,
+            "best_focus_minutes": empty, "hour_focus": np.zeros((0, 24)),
+        }
+
+    check_in_day = cols["check_in"].astype("datetime64[D]")
+    day = check_in_day.astype(np.int64) + _EPOCH_ORDINAL
+    hour = ((cols["check_in"] - check_in_day).astype("timedelta64[h]")).astype(np.int64)
+    usage = np.maximum((cols["check_out"] - cols["check_in"]).astype(np.float64) / 60.0, 0.0)
+    focus = cols["focus"]
+
+    keys = np.stack([cols["member_id"], day], axis=1)
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n = len(groups)
+
+    best = np.zeros(n)
+    np.maximum.at(best, inverse, focus)
+    hour_focus = np.zeros((n, 24))
+    np.add.at(hour_focus, (inverse, hour), focus)
+
+    return {
+        "member_id": groups[:, 0],
+        "day": groups[:, 1],
+        "session_count": np.bincount(inverse, minlength=n),
+        "usage_minutes": np.bincount(inverse, weights=usage, minlength=n),
+        "focus_minutes": np.bincount(inverse, weights=focus, minlength=n),
+        "best_focus_minutes": best,
+        "hour_focus": hour_focus,
+    }
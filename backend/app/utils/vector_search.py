@@ -0,0 +1,108 @@
+import os
+from datetime import date
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models import ScheduleEvent
+
+load_dotenv()
+
+# ---------------------------------------------------------
+# 일정 벡터 검색 (schedule_events.title_embedding / description_embedding, HNSW 인덱스)
+# least(제목 거리, 설명 거리)로 정렬하면 인덱스를 쓸 수 없으므로
+# 컬럼별로 "ORDER BY 컬럼 <=> 질의 LIMIT k" 두 번을 인덱스로 실행하고 결과를 합친다.
+# 동기 Session / AsyncSession 버전이 같은 쿼리를 공유한다.
+# ---------------------------------------------------------
+
+VECTOR_EF_SEARCH = int(os.getenv("VECTOR_EF_SEARCH", "100"))      # HNSW 탐색 후보 수 (클수록 정확, 느림)
+VECTOR_CANDIDATE_FACTOR = 2                                          # 컬럼별로 limit의 몇 배를 가져와 합칠지
+
+_VERSION_SQL = text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+_EF_SEARCH_SQL = text(f"SET LOCAL hnsw.ef_search = {int(VECTOR_EF_SEARCH)}")   # 현재 트랜잭션에만 적용
+_ITERATIVE_SCAN_SQL = text("SET LOCAL hnsw.iterative_scan = relaxed_order")
+_EMBEDDING_COLUMNS = (ScheduleEvent.title_embedding, ScheduleEvent.description_embedding)
+
+_pgvector_version = None
+
+def _parse_version(version: Optional[str]) -> tuple:
+    return tuple(int(part) for part in (version or "0").split(".")[:2] if part.isdigit())
+
+def _supports_iterative_scan() -> bool:
+    """pgvector 0.8+ 는 필터(member_id) 때문에 결과가 모자라면 인덱스를 이어서 탐색할 수 있다"""
+    return _pgvector_version >= (0, 8)
+
+def _configure_hnsw(db: Session):
+    global _pgvector_version
+    if _pgvector_version is None:
+        _pgvector_version = _parse_version(db.execute(_VERSION_SQL).scalar())
+    db.execute(_EF_SEARCH_SQL)
+    if _supports_iterative_scan():
+        db.execute(_ITERATIVE_SCAN_SQL)
+
+async def _aconfigure_hnsw(db: AsyncSession):
+    global _pgvector_version
+    if _pgvector_version is None:
+        _pgvector_version = _parse_version((await db.execute(_VERSION_SQL)).scalar())
+    await db.execute(_EF_SEARCH_SQL)
+    if _supports_iterative_scan():
+        await db.execute(_ITERATIVE_SCAN_SQL)
+
+def date_filters(date_from: Optional[date], date_to: Optional[date]) -> list:
+    """schedule_date 범위 조건 (양 끝 포함, 없으면 조건 없음)"""
+    filters = []
+    if date_from is not None:
+        filters.append(ScheduleEvent.schedule_date >= date_from)
+    if date_to is not None:
+        filters.append(ScheduleEvent.schedule_date <= date_to)
+    return filters
+
+def _top_k_stmt(column, member_id: int, query_vector: list, k: int, filters: list):
+    distance = column.cosine_distance(query_vector)
+    return (
+        select(ScheduleEvent, distance.label("distance"))
+        .filter(ScheduleEvent.member_id == member_id, column.isnot(None), *filters)
+        .order_by(distance)
+        .limit(k)
+    )
+
+def _merge(candidates: list, limit: int) -> list:
+    """컬럼별 후보 [(일정, 거리)]에서 일정마다 더 가까운 거리로 정렬해 상위 limit개"""
+    best = {}
+    for event, distance in candidates:
+        current = best.get(event.event_id)
+        if current is None or distance < current[1]:
+            best[event.event_id] = (event, distance)
+
+    ranked = sorted(best.values(), key=lambda item: (item[1], item[0].event_id))
+    return [event for event, _ in ranked[:limit]]
+
+def vector_search_events(db: Session, member_id: int, query_vector: list, limit: int = 20,
+                         candidate_k: Optional[int] = None,
+                         date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    """
+    제목/설명 임베딩 중 더 가까운 쪽 거리 기준 상위 limit개 일정
+    (기존 least(title, coalesce(desc, 2.0)) 정렬과 같은 순서, 날짜 범위가 있으면 그 안에서만)
+    """
+    k = candidate_k or limit * VECTOR_CANDIDATE_FACTOR
+    filters = date_filters(date_from, date_to)
+    _configure_hnsw(db)
+
+    candidates = []
+    for column in _EMBEDDING_COLUMNS:
+        candidates += db.execute(_top_k_stmt(column, member_id, query_vector, k, filters)).all()
+    return _merge(candidates, limit)
+
+async def avector_search_events(db: AsyncSession, member_id: int, query_vector: list, limit: int = 20,
+                                candidate_k: Optional[int] = None,
+                                date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    """vector_search_events의 AsyncSession 버전"""
+    k = candidate_k or limit * VECTOR_CANDIDATE_FACTOR
+    filters = date_filters(date_from, date_to)
+    await _aconfigure_hnsw(db)
+
+    candidates = []
+    for column in _EMBEDDING_COLUMNS:
+        candidates += (await db.execute(_top_k_stmt(column, member_id, query_vector, k, filters))).all()
+    return _merge(candidates, limit)
@@ -0,0 +1,166 @@
+"""baseline schema
+
+create_tables()로 만들어진 기존 DB는 `alembic stamp 0001_baseline` 후 upgrade 한다.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    op.create_table(
+        "products",
+        sa.Column("product_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("type", sa.String(20), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("is_exposured", sa.Boolean(), server_default="true"),
+    )
+
+    op.create_table(
+        "seats",
+        sa.Column("seat_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("type", sa.String(10), nullable=False),
+        sa.Column("is_status", sa.Boolean(), server_default="true"),
+        sa.Column("near_window", sa.Boolean(), server_default="false"),
+        sa.Column("corner_seat", sa.Boolean(), server_default="false"),
+        sa.Column("aisle_seat", sa.Boolean(), server_default="false"),
+        sa.Column("isolated", sa.Boolean(), server_default="false"),
+        sa.Column("near_beverage_table", sa.Boolean(), server_default="false"),
+        sa.Column("is_center", sa.Boolean(), server_default="false"),
+    )
+
+    op.create_table(
+        "members",
+        sa.Column("member_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("login_id", sa.String(50), unique=True, nullable=True),
+        sa.Column("password", sa.String(255), nullable=True),
+        sa.Column("phone", sa.String(20), unique=True),
+        sa.Column("email", sa.String(100)),
+        sa.Column("birthday", sa.String(20), nullable=True),
+        sa.Column("pin_code", sa.Integer(), nullable=True),
+        sa.Column("social_type", sa.String(20), nullable=True),
+        sa.Column("total_mileage", sa.Integer(), server_default="0"),
+        sa.Column("saved_time_minute", sa.Integer(), server_default="0"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("is_deleted_at", sa.Boolean(), server_default="false"),
+        sa.Column("name", sa.String(30), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False, server_default="user"),
+        sa.Column("kakao_id", sa.String(255), unique=True),
+        sa.Column("naver_id", sa.String(255), unique=True),
+        sa.Column("google_id", sa.String(255), unique=True),
+    )
+
+    op.create_table(
+        "tokens",
+        sa.Column("token_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE")),
+        sa.Column("token", sa.String(512)),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("is_revoked", sa.Boolean(), server_default="false"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "orders",
+        sa.Column("order_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("product_id", sa.BigInteger(), sa.ForeignKey("products.product_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("buyer_phone", sa.String(20), nullable=True),
+        sa.Column("payment_amount", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("period_start_date", sa.DateTime(), nullable=True),
+        sa.Column("period_end_date", sa.DateTime(), nullable=True),
+        sa.Column("fixed_seat_id", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "seat_usage",
+        sa.Column("usage_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("order_id", sa.BigInteger(), sa.ForeignKey("orders.order_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("seat_id", sa.BigInteger(), sa.ForeignKey("seats.seat_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), nullable=True),
+        sa.Column("check_in_time", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("check_out_time", sa.DateTime(), nullable=True),
+        sa.Column("is_attended", sa.Boolean(), server_default="false"),
+        sa.Column("ticket_expired_time", sa.DateTime(), nullable=True),
+        sa.Column("total_in_time", sa.Integer(), nullable=True),
+    )
+
+    op.create_table(
+        "mileage_history",
+        sa.Column("history_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE")),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "todos",
+        sa.Column("todo_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("todo_type", sa.String(20)),
+        sa.Column("todo_title", sa.String(100)),
+        sa.Column("todo_content", sa.Text()),
+        sa.Column("todo_value", sa.Integer()),
+        sa.Column("betting_mileage", sa.Integer()),
+        sa.Column("payback_mileage_percent", sa.Integer()),
+        sa.Column("is_exposed", sa.Boolean(), server_default="true"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "user_todos",
+        sa.Column("user_todo_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("todo_id", sa.BigInteger(), sa.ForeignKey("todos.todo_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("is_achieved", sa.Boolean(), server_default="false"),
+        sa.Column("started_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("achieved_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "ai_chat_logs",
+        sa.Column("ai_chat_logs_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("role", sa.String(20)),
+        sa.Column("message", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "schedule_events",
+        sa.Column("event_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("ai_chat_log_id", sa.BigInteger(), sa.ForeignKey("ai_chat_logs.ai_chat_logs_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("schedule_date", sa.Date()),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("color", sa.String(20)),
+        sa.Column("title_embedding", Vector(768)),
+        sa.Column("description_embedding", Vector(768)),
+    )
+
+
+def downgrade():
+    for table in (
+        "schedule_events", "ai_chat_logs", "user_todos", "todos",
+        "mileage_history", "seat_usage", "orders", "tokens", "members", "seats", "products",
+    ):
+        op.drop_table(table)
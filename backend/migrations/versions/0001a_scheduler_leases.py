@@ -0,0 +1,49 @@
+"""scheduler leases and job run logs
+
+워커 간 스케줄러 작업 중복 실행 방지용 lease 테이블과 작업 실행 기록.
+이전 0001에 포함돼 있던 테이블이므로, 그 0001로 이미 만들어진 DB에서는 건너뛴다.
+
+Revision ID: 0001a_scheduler_leases
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001a_scheduler_leases"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "scheduler_leases" not in existing:
+        op.create_table(
+            "scheduler_leases",
+            sa.Column("job_name", sa.String(100), primary_key=True),
+            sa.Column("owner", sa.String(100)),
+            sa.Column("lease_until", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+
+    if "job_run_logs" not in existing:
+        op.create_table(
+            "job_run_logs",
+            sa.Column("run_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+            sa.Column("job_name", sa.String(100), nullable=False),
+            sa.Column("owner", sa.String(100)),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime()),
+            sa.Column("duration_ms", sa.Integer()),
+            sa.Column("error", sa.Text()),
+        )
+        op.create_index("ix_job_run_logs_job_name", "job_run_logs", ["job_name"])
+
+
+def downgrade():
+    op.drop_index("ix_job_run_logs_job_name", table_name="job_run_logs")
+    op.drop_table("job_run_logs")
+    op.drop_table("scheduler_leases")
@@ -0,0 +1,49 @@
+"""hot path indexes
+
+자주 실행되는 조회 조건(입실 중 좌석, 회원별 이용 기록, 유효 주문, 토큰 검증 등)에 맞춘 보조 인덱스.
+운영 중 테이블 잠금을 피하기 위해 CONCURRENTLY로 생성한다.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001a_scheduler_leases
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001a_scheduler_leases"
+branch_labels = None
+depends_on = None
+
+# (인덱스명, 테이블, 컬럼, 부분 인덱스 조건)
+INDEXES = [
+    ("ix_seat_usage_member_checkout", "seat_usage", ["member_id", "check_out_time"], None),
+    ("ix_seat_usage_member_checkin", "seat_usage", ["member_id", "check_in_time"], None),
+    ("ix_seat_usage_open_seat", "seat_usage", ["seat_id"], "check_out_time IS NULL"),
+    ("ix_seat_usage_open_expired", "seat_usage", ["ticket_expired_time"], "check_out_time IS NULL"),
+    ("ix_orders_fixed_seat_period", "orders", ["fixed_seat_id", "period_end_date"], "fixed_seat_id IS NOT NULL"),
+    ("ix_orders_member_period", "orders", ["member_id", "period_end_date"], None),
+    ("ix_orders_created_at", "orders", ["created_at"], None),
+    ("ix_user_todos_member_achieved", "user_todos", ["member_id", "is_achieved"], None),
+    ("ix_tokens_token", "tokens", ["token"], None),
+    ("ix_ai_chat_logs_member_created", "ai_chat_logs", ["member_id", "created_at"], None),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
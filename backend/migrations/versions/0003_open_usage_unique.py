@@ -0,0 +1,55 @@
+"""open seat usage unique indexes
+
+좌석당 / 회원당 입실 중(check_out_time IS NULL) 기록을 하나로 제한한다.
+비회원은 member_id 2를 공유하므로 회원 조건에서 제외.
+이미 중복된 입실 중 기록이 있으면 인덱스 생성이 실패하므로, 적용 전 아래 쿼리로 확인 후 정리한다.
+
+    SELECT seat_id, count(*) FROM seat_usage WHERE check_out_time IS NULL GROUP BY seat_id HAVING count(*) > 1;
+    SELECT member_id, count(*) FROM seat_usage WHERE check_out_time IS NULL AND member_id <> 2 GROUP BY member_id HAVING count(*) > 1;
+
+Revision ID: 0003_open_usage_unique
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_open_usage_unique"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_seat_usage_open_seat",
+            "seat_usage",
+            ["seat_id"],
+            unique=True,
+            postgresql_where=sa.text("check_out_time IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "uq_seat_usage_open_member",
+            "seat_usage",
+            ["member_id"],
+            unique=True,
+            postgresql_where=sa.text("check_out_time IS NULL AND member_id <> 2"),
+            postgresql_concurrently=True,
+        )
+        # 유니크 인덱스가 같은 조건을 처리하므로 기존 일반 부분 인덱스는 제거
+        op.drop_index("ix_seat_usage_open_seat", table_name="seat_usage", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_seat_usage_open_seat",
+            "seat_usage",
+            ["seat_id"],
+            postgresql_where=sa.text("check_out_time IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("uq_seat_usage_open_member", table_name="seat_usage", postgresql_concurrently=True)
+        op.drop_index("uq_seat_usage_open_seat", table_name="seat_usage", postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""user todo running totals
+
+도전별 누적 이용 시간/출석 일수 컬럼 추가 후 기존 이용 기록으로 채운다.
+
+Revision ID: 0004_user_todo_progress
+Revises: 0003_open_usage_unique
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_user_todo_progress"
+down_revision = "0003_open_usage_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("user_todos", sa.Column("progress_seconds", sa.BigInteger(), nullable=False, server_default="0"))
+    op.add_column("user_todos", sa.Column("attended_days", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute("""
+        UPDATE user_todos AS ut
+        SET progress_seconds = agg.progress_seconds,
+            attended_days = agg.attended_days
+        FROM (
+            SELECT ut.user_todo_id,
+                   COALESCE(SUM(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time))
+                            FILTER (WHERE su.check_out_time IS NOT NULL), 0)::bigint AS progress_seconds,
+                   COUNT(DISTINCT CAST(su.check_in_time AS date))
+                            FILTER (WHERE su.is_attended) AS attended_days
+            FROM user_todos ut
+            LEFT JOIN seat_usage su
+                   ON su.member_id = ut.member_id
+                  AND su.check_in_time >= ut.started_at
+            GROUP BY ut.user_todo_id
+        ) AS agg
+        WHERE ut.user_todo_id = agg.user_todo_id
+    """)
+
+
+def downgrade():
+    op.drop_column("user_todos", "attended_days")
+    op.drop_column("user_todos", "progress_seconds")
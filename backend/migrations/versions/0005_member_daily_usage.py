@@ -0,0 +1,99 @@
+"""member daily usage rollup
+
+회원별 일일 이용 집계 테이블(member_daily_usage) 생성 후 기존 이용 기록으로 채운다.
+통계 API(/api/statics)와 관리자 누적 이용 시간이 이 테이블을 읽는다.
+
+Revision ID: 0005_member_daily_usage
+Revises: 0004_user_todo_progress
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_member_daily_usage"
+down_revision = "0004_user_todo_progress"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "member_daily_usage",
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("usage_date", sa.Date(), primary_key=True),
+        sa.Column("session_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("usage_minutes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("focus_minutes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("best_focus_minutes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("attended", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("hour_focus", postgresql.ARRAY(sa.Float()), nullable=False,
+                  server_default=sa.text("array_fill(0::float8, ARRAY[24])")),
+        sa.Column("seat_type_counts", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    # 백필 (utils/usage_rollup.py의 rebuild_usage_rollup과 같은 집계)
+    op.execute("""
+        WITH s AS (
+            SELECT su.member_id,
+                   CAST(su.check_in_time AS date) AS d,
+                   EXTRACT(HOUR FROM su.check_in_time)::int AS h,
+                   GREATEST(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time) / 60.0, 0) AS usage_min,
+                   COALESCE(su.total_in_time, 0)::float8 AS focus,
+                   COALESCE(su.is_attended, false) AS is_attended,
+                   CASE
+                       WHEN st.near_window THEN '창가석'
+                       WHEN st.corner_seat THEN '코너석'
+                       WHEN st.aisle_seat THEN '통로석'
+                       WHEN st.isolated THEN '고립석'
+                       WHEN st.near_beverage_table THEN '음료바근처'
+                       WHEN st.is_center THEN '중앙석'
+                       ELSE '일반석'
+                   END AS seat_type
+            FROM seat_usage su
+            LEFT JOIN seats st ON st.seat_id = su.seat_id
+            WHERE su.check_out_time IS NOT NULL
+              AND su.member_id IS NOT NULL
+        ),
+        hourly AS (
+            SELECT member_id, d, h, SUM(focus) AS focus
+            FROM s
+            GROUP BY member_id, d, h
+        ),
+        hour_arrays AS (
+            SELECT k.member_id, k.d, array_agg(COALESCE(hourly.focus, 0) ORDER BY g.h) AS hour_focus
+            FROM (SELECT DISTINCT member_id, d FROM s) AS k
+            CROSS JOIN generate_series(0, 23) AS g(h)
+            LEFT JOIN hourly ON hourly.member_id = k.member_id AND hourly.d = k.d AND hourly.h = g.h
+            GROUP BY k.member_id, k.d
+        ),
+        seat_types AS (
+            SELECT member_id, d, jsonb_object_agg(seat_type, cnt) AS seat_type_counts
+            FROM (SELECT member_id, d, seat_type, COUNT(*) AS cnt FROM s GROUP BY member_id, d, seat_type) AS t
+            GROUP BY member_id, d
+        ),
+        daily AS (
+            SELECT member_id, d,
+                   COUNT(*) AS session_count,
+                   SUM(usage_min) AS usage_minutes,
+                   SUM(focus) AS focus_minutes,
+                   MAX(focus) AS best_focus_minutes,
+                   BOOL_OR(is_attended) AS attended
+            FROM s
+            GROUP BY member_id, d
+        )
+        INSERT INTO member_daily_usage (
+            member_id, usage_date, session_count, usage_minutes, focus_minutes, best_focus_minutes,
+            attended, hour_focus, seat_type_counts, updated_at
+        )
+        SELECT daily.member_id, daily.d, daily.session_count, daily.usage_minutes, daily.focus_minutes,
+               daily.best_focus_minutes, daily.attended, hour_arrays.hour_focus, seat_types.seat_type_counts, localtimestamp
+        FROM daily
+        JOIN hour_arrays ON hour_arrays.member_id = daily.member_id AND hour_arrays.d = daily.d
+        JOIN seat_types ON seat_types.member_id = daily.member_id AND seat_types.d = daily.d
+    """)
+
+
+def downgrade():
+    op.drop_table("member_daily_usage")
@@ -0,0 +1,48 @@
+"""daily sales cube
+
+일자 × 상품별 매출 집계 테이블(daily_sales) 생성 후 기존 주문으로 채운다.
+관리자 매출 통계(/api/admin/stats/daily, /stats/products)가 이 테이블을 기간 조건으로 읽는다.
+주문에 사용 마일리지(orders.used_mileage) 컬럼을 추가하며, 그 이전 주문의 백필 값은 (상품 가격 - 결제 금액)으로 추정한다.
+
+Revision ID: 0006_daily_sales
+Revises: 0005_member_daily_usage
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_daily_sales"
+down_revision = "0005_member_daily_usage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("orders", sa.Column("used_mileage", sa.Integer(), nullable=True))
+
+    op.create_table(
+        "daily_sales",
+        sa.Column("sales_date", sa.Date(), primary_key=True),
+        sa.Column("product_id", sa.BigInteger(), primary_key=True),
+        sa.Column("product_type", sa.String(20), nullable=False),
+        sa.Column("revenue", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("mileage_used", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    op.execute("""
+        INSERT INTO daily_sales (sales_date, product_id, product_type, revenue, order_count, mileage_used, updated_at)
+        SELECT CAST(o.created_at AS date), o.product_id, MAX(p.type),
+               COALESCE(SUM(o.payment_amount), 0), COUNT(*),
+               COALESCE(SUM(GREATEST(p.price - COALESCE(o.payment_amount, 0), 0)), 0),
+               localtimestamp
+        FROM orders o
+        JOIN products p ON p.product_id = o.product_id
+        GROUP BY CAST(o.created_at AS date), o.product_id
+    """)
+
+
+def downgrade():
+    op.drop_table("daily_sales")
+    op.drop_column("orders", "used_mileage")
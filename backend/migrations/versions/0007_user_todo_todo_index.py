@@ -0,0 +1,30 @@
+"""user todo per-challenge index
+
+관리자 TODO 목록/수정 시 TODO별 참가자·달성자 수 집계(todo_id, is_achieved)에 쓰는 인덱스.
+
+Revision ID: 0007_user_todo_todo_index
+Revises: 0006_daily_sales
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0007_user_todo_todo_index"
+down_revision = "0006_daily_sales"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_todos_todo_achieved",
+            "user_todos",
+            ["todo_id", "is_achieved"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_user_todos_todo_achieved", table_name="user_todos", postgresql_concurrently=True)
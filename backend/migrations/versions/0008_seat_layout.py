@@ -0,0 +1,74 @@
+"""seat layout tables
+
+좌석 구역(seat_zones)과 좌석별 배치 정보(seat_layouts: 구역, 층, 좌표, 카메라 매핑) 추가.
+기존 코드에 하드코딩되어 있던 구역 범위로 초기 데이터를 채운다.
+
+Revision ID: 0008_seat_layout
+Revises: 0007_user_todo_todo_index
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_seat_layout"
+down_revision = "0007_user_todo_todo_index"
+branch_labels = None
+depends_on = None
+
+# (zone_key, 표시명, 정렬 순서, 고정석 여부)
+ZONES = [
+    ("fix", "고정석 (Private)", 1, True),
+    ("view", "창가석 (View)", 2, False),
+    ("island", "중앙석 (Island)", 3, False),
+    ("corner", "독립석 (Corner)", 4, False),
+    ("easy", "음료대석 (Easy)", 5, False),
+    ("aisle", "일반석 (Aisle)", 6, False),
+]
+
+
+def upgrade():
+    zones = op.create_table(
+        "seat_zones",
+        sa.Column("zone_key", sa.String(20), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("floor", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("sort_order", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("is_fixed", sa.Boolean(), nullable=False, server_default="false"),
+    )
+    op.create_table(
+        "seat_layouts",
+        sa.Column("seat_id", sa.BigInteger(), sa.ForeignKey("seats.seat_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("zone_key", sa.String(20), sa.ForeignKey("seat_zones.zone_key"), nullable=False),
+        sa.Column("floor", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("pos_x", sa.Integer()),
+        sa.Column("pos_y", sa.Integer()),
+        sa.Column("camera_id", sa.String(50)),
+        sa.Column("camera_slot", sa.Integer()),
+    )
+    op.create_index("ix_seat_layouts_zone_key", "seat_layouts", ["zone_key"])
+
+    op.bulk_insert(zones, [
+        {"zone_key": key, "name": name, "floor": 1, "sort_order": order, "is_fixed": is_fixed}
+        for key, name, order, is_fixed in ZONES
+    ])
+
+    op.execute("""
+        INSERT INTO seat_layouts (seat_id, zone_key, floor)
+        SELECT seat_id,
+               CASE
+                   WHEN seat_id BETWEEN 1 AND 20 THEN 'fix'
+                   WHEN seat_id BETWEEN 21 AND 30 THEN 'view'
+                   WHEN seat_id BETWEEN 31 AND 50 OR seat_id BETWEEN 61 AND 70 THEN 'island'
+                   WHEN seat_id BETWEEN 51 AND 60 THEN 'corner'
+                   WHEN seat_id BETWEEN 71 AND 90 THEN 'easy'
+                   ELSE 'aisle'
+               END,
+               1
+        FROM seats
+    """)
+
+
+def downgrade():
+    op.drop_index("ix_seat_layouts_zone_key", table_name="seat_layouts")
+    op.drop_table("seat_layouts")
+    op.drop_table("seat_zones")
@@ -0,0 +1,109 @@
+"""member seat preference profile
+
+좌석 추천용 회원 프로필(member_seat_stats, member_seat_profiles)과
+추천 결과 기록(recommendation_logs) 테이블 추가 후 기존 이용 기록으로 프로필을 채운다.
+
+Revision ID: 0009_member_seat_profile
+Revises: 0008_seat_layout
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009_member_seat_profile"
+down_revision = "0008_seat_layout"
+branch_labels = None
+depends_on = None
+
+HALF_LIFE_DAYS = 30
+
+
+def upgrade():
+    op.create_table(
+        "member_seat_stats",
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("seat_id", sa.BigInteger(), primary_key=True),
+        sa.Column("use_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_minutes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("decayed_weight", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("last_used_at", sa.DateTime()),
+    )
+    op.create_table(
+        "member_seat_profiles",
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_uses", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attr_counts", postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column("attr_decayed", postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column("decayed_total", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("decay_ref_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "recommendation_logs",
+        sa.Column("log_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("member_id", sa.BigInteger(), sa.ForeignKey("members.member_id", ondelete="SET NULL"), nullable=True),
+        sa.Column("strategy", sa.String(20), nullable=False),
+        sa.Column("seat_ids", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("scores", postgresql.ARRAY(sa.Float()), nullable=True),
+        sa.Column("free_seat_count", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index("ix_recommendation_logs_member_created", "recommendation_logs", ["member_id", "created_at"])
+
+    # 백필 (utils/seat_profile.py의 rebuild_member_profiles와 같은 집계)
+    op.execute(f"""
+        WITH s AS (
+            SELECT su.member_id, su.seat_id, su.check_out_time,
+                   GREATEST(EXTRACT(EPOCH FROM su.check_out_time - su.check_in_time) / 60.0, 0) AS minutes,
+                   MAX(su.check_out_time) OVER (PARTITION BY su.member_id, su.seat_id) AS seat_last
+            FROM seat_usage su
+            WHERE su.check_out_time IS NOT NULL
+              AND su.seat_id IS NOT NULL
+              AND su.member_id IS NOT NULL
+              AND su.member_id NOT IN (1, 2)
+        )
+        INSERT INTO member_seat_stats (member_id, seat_id, use_count, total_minutes, decayed_weight, last_used_at)
+        SELECT member_id, seat_id, COUNT(*), SUM(minutes),
+               SUM(power(0.5, EXTRACT(EPOCH FROM seat_last - check_out_time) / 86400.0 / {HALF_LIFE_DAYS})),
+               MAX(check_out_time)
+        FROM s
+        GROUP BY member_id, seat_id
+    """)
+    op.execute(f"""
+        WITH s AS (
+            SELECT su.member_id, su.seat_id, su.check_out_time,
+                   MAX(su.check_out_time) OVER (PARTITION BY su.member_id) AS member_last
+            FROM seat_usage su
+            WHERE su.check_out_time IS NOT NULL
+              AND su.seat_id IS NOT NULL
+              AND su.member_id IS NOT NULL
+              AND su.member_id NOT IN (1, 2)
+        ),
+        w AS (
+            SELECT s.member_id, s.member_last,
+                   power(0.5, EXTRACT(EPOCH FROM s.member_last - s.check_out_time) / 86400.0 / {HALF_LIFE_DAYS}) AS w,
+                   COALESCE(st.near_window, false) AS f1, COALESCE(st.corner_seat, false) AS f2,
+                   COALESCE(st.aisle_seat, false) AS f3, COALESCE(st.isolated, false) AS f4,
+                   COALESCE(st.near_beverage_table, false) AS f5, COALESCE(st.is_center, false) AS f6
+            FROM s
+            LEFT JOIN seats st ON st.seat_id = s.seat_id
+        )
+        INSERT INTO member_seat_profiles (member_id, total_uses, attr_counts, attr_decayed, decayed_total, decay_ref_at, updated_at)
+        SELECT member_id, COUNT(*),
+               ARRAY[SUM(f1::int)::float8, SUM(f2::int)::float8, SUM(f3::int)::float8,
+                     SUM(f4::int)::float8, SUM(f5::int)::float8, SUM(f6::int)::float8],
+               ARRAY[SUM(CASE WHEN f1 THEN w ELSE 0 END)::float8, SUM(CASE WHEN f2 THEN w ELSE 0 END)::float8,
+                     SUM(CASE WHEN f3 THEN w ELSE 0 END)::float8, SUM(CASE WHEN f4 THEN w ELSE 0 END)::float8,
+                     SUM(CASE WHEN f5 THEN w ELSE 0 END)::float8, SUM(CASE WHEN f6 THEN w ELSE 0 END)::float8],
+               SUM(w), MAX(member_last), localtimestamp
+        FROM w
+        GROUP BY member_id
+    """)
+
+
+def downgrade():
+    op.drop_index("ix_recommendation_logs_member_created", table_name="recommendation_logs")
+    op.drop_table("recommendation_logs")
+    op.drop_table("member_seat_profiles")
+    op.drop_table("member_seat_stats")
@@ -0,0 +1,31 @@
+"""embedding cache
+
+모델 이름 + 정규화 텍스트 해시(sha256) → 임베딩 캐시 테이블(embedding_cache) 추가.
+일정 생성/수정 시 같은 문장은 다시 인코딩하지 않고 이 테이블에서 꺼내 쓴다.
+
+Revision ID: 0010_embedding_cache
+Revises: 0009_member_seat_profile
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+revision = "0010_embedding_cache"
+down_revision = "0009_member_seat_profile"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model_name", sa.String(100), primary_key=True),
+        sa.Column("text_hash", sa.String(64), primary_key=True),
+        sa.Column("embedding", Vector(768), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("embedding_cache")
@@ -0,0 +1,45 @@
+"""schedule event vector indexes
+
+일정 벡터 검색(plan.search_similar_events)용 HNSW 인덱스(코사인 거리)와 회원/날짜 인덱스.
+HNSW는 pgvector 0.5.0 이상 필요. 운영 중 테이블 잠금을 피하기 위해 CONCURRENTLY로 생성한다.
+
+Revision ID: 0011_schedule_event_vector_index
+Revises: 0010_embedding_cache
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0011_schedule_event_vector_index"
+down_revision = "0010_embedding_cache"
+branch_labels = None
+depends_on = None
+
+# (인덱스명, 컬럼) — m / ef_construction은 pgvector 기본값
+HNSW_INDEXES = [
+    ("ix_schedule_events_title_hnsw", "title_embedding"),
+    ("ix_schedule_events_desc_hnsw", "description_embedding"),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, column in HNSW_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON schedule_events "
+                f"USING hnsw ({column} vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+            )
+        op.create_index(
+            "ix_schedule_events_member_date",
+            "schedule_events",
+            ["member_id", "schedule_date"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_schedule_events_member_date", table_name="schedule_events",
+                      postgresql_concurrently=True, if_exists=True)
+        for name, _ in reversed(HNSW_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,36 @@
+"""schedule event trigram indexes
+
+플래너 하이브리드 검색(utils/hybrid_search.py)과 수정/삭제 대상 찾기(title LIKE '%...%')용
+pg_trgm GIN 인덱스. 운영 중 테이블 잠금을 피하기 위해 CONCURRENTLY로 생성한다.
+
+Revision ID: 0012_schedule_event_trgm
+Revises: 0011_schedule_event_vector_index
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0012_schedule_event_trgm"
+down_revision = "0011_schedule_event_vector_index"
+branch_labels = None
+depends_on = None
+
+TRGM_INDEXES = [
+    ("ix_schedule_events_title_trgm", "title"),
+    ("ix_schedule_events_desc_trgm", "description"),
+]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, column in TRGM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON schedule_events "
+                f"USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(TRGM_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
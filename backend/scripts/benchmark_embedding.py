@@ -0,0 +1,102 @@
+"""
+임베딩 백엔드 벤치마크 (로드 시간 / 메모리 / 인코딩 지연시간)
+
+백엔드마다 별도 프로세스에서 모델을 로드해 최대 RSS 증가량을 재고,
+배치 크기별 encode 지연시간(p50/p95)과 초당 문장 수를 출력한다.
+
+    cd backend && uv run python scripts/benchmark_embedding.py --backends torch int8 onnx --repeat 50
+"""
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+SAMPLE_TEXTS = [
+    "수학 공부", "영어 단어 암기", "토익 LC 모의고사", "알고리즘 문제 풀이",
+    "수학 공부 09:00~11:00 (2시간) 미적분 복습", "토익 RC 19:00~21:30 (2시간 30분) Part 7 집중",
+    "코딩 테스트 대비 20:00~23:59 (3시간 59분) DP", "자격증 실기 14:00~18:00 (4시간) 기출 3회분",
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # Linux: KB 단위
+
+
+def run_worker(backend: str, batch_sizes: list, repeat: int) -> dict:
+    """한 백엔드만 로드해서 측정 (부모 프로세스가 JSON 한 줄로 받는다)"""
+    from ai_models.embedding_backends import load_backend
+    from ai_models.sbert import EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_PATH
+
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    model = load_backend(backend, EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_PATH)
+    load_seconds = time.perf_counter() - start
+
+    model.encode(SAMPLE_TEXTS[:2])  # 워밍업
+    result = {"backend": backend, "load_seconds": round(load_seconds, 2), "batches": {}}
+    for batch_size in batch_sizes:
+        texts = (SAMPLE_TEXTS * (batch_size // len(SAMPLE_TEXTS) + 1))[:batch_size]
+        latencies = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            model.encode(texts, batch_size=batch_size)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        result["batches"][batch_size] = {
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "texts_per_sec": round(batch_size / (statistics.mean(latencies) / 1000), 1),
+        }
+    result["rss_mb"] = round(max_rss_mb() - rss_before, 1)
+    return result
+
+
+def main(backends: list, batch_sizes: list, repeat: int) -> int:
+    results = []
+    for backend in backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--repeat", str(repeat),
+             "--batch-sizes", *map(str, batch_sizes)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"[{backend}] 실패:\n{proc.stderr.strip()[-2000:]}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if not results:
+        return 1
+
+    print(f"{'backend':<8} {'load(s)':>8} {'RSS(MB)':>8}  " + "  ".join(f"b={b:<3} p50/p95(ms)  t/s" for b in batch_sizes))
+    for r in results:
+        cols = "  ".join(
+            f"{r['batches'][str(b)]['p50_ms']:>7.1f}/{r['batches'][str(b)]['p95_ms']:<7.1f}{r['batches'][str(b)]['texts_per_sec']:>7.0f}"
+            for b in batch_sizes
+        )
+        print(f"{r['backend']:<8} {r['load_seconds']:>8.2f} {r['rss_mb']:>8.1f}  {cols}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16, 64])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.batch_sizes, args.repeat)))
+        sys.exit(0)
+    sys.exit(main(args.backends, args.batch_sizes, args.repeat))
@@ -0,0 +1,151 @@
+"""
+일정 벡터 검색 벤치마크 (기존 least() 정렬 vs HNSW 인덱스 top-k 2회 + 병합)
+
+임시 테이블(bench_schedule_events)에 무작위 768차원 임베딩을 N건 만들고
+회원 수를 고정한 채 두 방식의 지연시간(p50/p95)과 기존 방식 대비 결과 일치율(recall)을 출력한다.
+기본 크기는 10k / 100k / 1M (1M은 생성과 인덱스 빌드에 수십 분이 걸릴 수 있음).
+벤치마크가 끝나면 임시 테이블은 삭제된다.
+
+    cd backend && uv run python scripts/benchmark_vector_search.py --sizes 10000 100000 1000000 --members 500
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from database import engine  # noqa: E402
+
+DIM = 768
+TABLE = "bench_schedule_events"
+
+# 기존 plan.search_similar_events 쿼리
+LEAST_SQL = f"""
+    SELECT event_id FROM {TABLE}
+    WHERE member_id = :member_id
+    ORDER BY least(title_embedding <=> CAST(:q AS vector),
+                   coalesce(description_embedding <=> CAST(:q AS vector), 2.0))
+    LIMIT :limit
+"""
+
+# utils/vector_search.py와 같은 컬럼별 top-k
+TOPK_SQL = f"""
+    SELECT event_id, {{column}} <=> CAST(:q AS vector) AS distance FROM {TABLE}
+    WHERE member_id = :member_id AND {{column}} IS NOT NULL
+    ORDER BY {{column}} <=> CAST(:q AS vector)
+    LIMIT :k
+"""
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def random_vector(rng) -> str:
+    v = rng.standard_normal(DIM).astype(np.float32)
+    return "[" + ",".join(f"{x:.5f}" for x in v / np.linalg.norm(v)) + "]"
+
+
+def build_table(conn, size: int, members: int):
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            event_id bigserial PRIMARY KEY,
+            member_id bigint NOT NULL,
+            title_embedding vector({DIM}),
+            description_embedding vector({DIM})
+        )
+    """))
+    # 행마다 다른 난수 벡터가 나오도록 서브쿼리가 바깥 행(g)을 참조하게 한다
+    conn.execute(text(f"""
+        INSERT INTO {TABLE} (member_id, title_embedding, description_embedding)
+        SELECT 3 + (g % :members),
+               (SELECT array_agg(random() - 0.5 + g * 0) FROM generate_series(1, {DIM}))::vector,
+               CASE WHEN g % 10 = 0 THEN NULL
+                    ELSE (SELECT array_agg(random() - 0.5 + g * 0) FROM generate_series(1, {DIM}))::vector END
+        FROM generate_series(1, :size) AS g
+    """), {"size": size, "members": members})
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (member_id)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def build_hnsw(conn):
+    for column in ("title_embedding", "description_embedding"):
+        conn.execute(text(
+            f"CREATE INDEX ON {TABLE} USING hnsw ({column} vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        ))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def run_least(conn, member_id: int, q: str, limit: int) -> list:
+    return [row[0] for row in conn.execute(text(LEAST_SQL), {"member_id": member_id, "q": q, "limit": limit})]
+
+
+def run_topk(conn, member_id: int, q: str, limit: int, ef_search: int) -> list:
+    conn.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+    best = {}
+    for column in ("title_embedding", "description_embedding"):
+        rows = conn.execute(text(TOPK_SQL.format(column=column)), {"member_id": member_id, "q": q, "k": limit * 2})
+        for event_id, distance in rows:
+            if event_id not in best or distance < best[event_id]:
+                best[event_id] = distance
+    return [event_id for event_id, _ in sorted(best.items(), key=lambda item: (item[1], item[0]))[:limit]]
+
+
+def measure(conn, fn, queries: list) -> tuple:
+    latencies, results = [], []
+    for args in queries:
+        with conn.begin():
+            start = time.perf_counter()
+            results.append(fn(conn, *args))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, results
+
+
+def main(sizes: list, members: int, queries: int, limit: int, ef_search: int) -> int:
+    rng = np.random.default_rng(42)
+    print(f"{'rows':>9} {'least p50/p95(ms)':>20} {'hnsw top-k p50/p95(ms)':>24} {'recall':>8}")
+    with engine.connect() as conn:
+        try:
+            for size in sizes:
+                with conn.begin():
+                    build_table(conn, size, members)
+
+                samples = [(3 + int(rng.integers(members)), random_vector(rng), limit) for _ in range(queries)]
+                # 인덱스가 없을 때의 기존 쿼리가 정답 기준 (정확 탐색)
+                base_lat, base_res = measure(conn, run_least, samples)
+
+                with conn.begin():
+                    build_hnsw(conn)
+                topk_lat, topk_res = measure(
+                    conn, lambda c, m, q, n: run_topk(c, m, q, n, ef_search), samples
+                )
+
+                recall = statistics.mean(
+                    len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(base_res, topk_res)
+                )
+                print(
+                    f"{size:>9} {statistics.median(base_lat):>9.1f}/{percentile(base_lat, 95):<10.1f}"
+                    f" {statistics.median(topk_lat):>11.1f}/{percentile(topk_lat, 95):<12.1f} {recall:>8.3f}"
+                )
+        finally:
+            with conn.begin():
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일정 벡터 검색 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--members", type=int, default=500, help="데이터를 나눌 회원 수")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--ef-search", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(main(args.sizes, args.members, args.queries, args.limit, args.ef_search))
@@ -0,0 +1,89 @@
+"""
+임베딩 백엔드 정확도 검사 (fp32 기준 모델과의 코사인 일치도)
+
+일정 제목 / Rich Text 샘플을 fp32(torch) 모델과 비교 대상 백엔드로 각각 인코딩해
+문장별 코사인 유사도와, 검색 결과(최근접 이웃 top-k)가 얼마나 같은지 출력한다.
+평균 코사인이 --min-cosine보다 낮으면 종료 코드 1.
+
+    cd backend && uv run python scripts/embedding_accuracy.py --backend int8
+    cd backend && uv run python scripts/embedding_accuracy.py --backend onnx --from-db 500
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+import numpy as np  # noqa: E402
+from ai_models.embedding_backends import load_backend, EMBEDDING_BACKENDS  # noqa: E402
+from ai_models.sbert import EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_PATH  # noqa: E402
+
+# 실제 일정에서 자주 쓰이는 형태의 고정 샘플 (DB 없이도 비교 가능하도록)
+SAMPLE_TEXTS = [
+    "수학 공부", "영어 단어 암기", "국어 문법 정리", "토익 LC 모의고사", "정보처리기사 필기",
+    "한국사 기출 풀이", "알고리즘 문제 풀이", "물리 2단원 복습", "화학 실험 보고서 작성", "독서 1시간",
+    "SQLD 요점 정리", "운동", "점심 시간", "스터디 모임", "프로젝트 회의",
+    "수학 공부 09:00~11:00 (2시간) 미적분 복습", "영어 단어 13:00~13:30 (30분) Day 12",
+    "토익 RC 19:00~21:30 (2시간 30분) Part 7 집중", "코딩 테스트 대비 20:00~23:59 (3시간 59분) DP",
+    "면접 준비 10:00~12:00 (2시간) 자기소개 연습", "자격증 실기 14:00~18:00 (4시간) 기출 3회분",
+]
+
+
+def load_db_texts(limit: int) -> list:
+    from database import SessionLocal
+    from models import ScheduleEvent
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ScheduleEvent.title).distinct().limit(limit).all()
+        return [title for (title,) in rows if title]
+    finally:
+        db.close()
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def main(backend: str, texts: list, top_k: int, min_cosine: float) -> int:
+    reference = normalize(np.asarray(load_backend("torch", EMBEDDING_MODEL_NAME).encode(texts), dtype=np.float32))
+    candidate = normalize(np.asarray(
+        load_backend(backend, EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_PATH).encode(texts), dtype=np.float32
+    ))
+
+    cosine = (reference * candidate).sum(axis=1)
+    print(f"[{backend}] 샘플 {len(texts)}개")
+    print(f"  코사인 유사도  mean={cosine.mean():.5f}  min={cosine.min():.5f}  p05={np.percentile(cosine, 5):.5f}")
+
+    # 검색 관점: 각 문장의 최근접 이웃 top-k가 fp32와 얼마나 겹치는지
+    k = min(top_k, len(texts) - 1)
+    if k > 0:
+        ref_sim = reference @ reference.T
+        cand_sim = candidate @ candidate.T
+        np.fill_diagonal(ref_sim, -np.inf)
+        np.fill_diagonal(cand_sim, -np.inf)
+        ref_top = np.argsort(-ref_sim, axis=1)[:, :k]
+        cand_top = np.argsort(-cand_sim, axis=1)[:, :k]
+        overlap = np.mean([len(set(r) & set(c)) / k for r, c in zip(ref_top, cand_top)])
+        top1 = np.mean(ref_top[:, 0] == cand_top[:, 0])
+        print(f"  이웃 일치율    top-1={top1:.4f}  top-{k} overlap={overlap:.4f}")
+
+    worst = np.argsort(cosine)[:3]
+    for i in worst:
+        print(f"  최저 {cosine[i]:.5f}: {texts[i]}")
+
+    return 0 if cosine.mean() >= min_cosine else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 정확도 검사")
+    parser.add_argument("--backend", choices=[b for b in EMBEDDING_BACKENDS if b != "torch"], required=True)
+    parser.add_argument("--from-db", type=int, default=0, help="schedule_events 제목을 최대 N개 추가로 사용")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    texts = list(SAMPLE_TEXTS)
+    if args.from_db:
+        texts += [t for t in load_db_texts(args.from_db) if t not in texts]
+    sys.exit(main(args.backend, texts, args.top_k, args.min_cosine))
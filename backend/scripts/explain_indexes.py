@@ -0,0 +1,128 @@
+"""
+핫패스 쿼리 인덱스 사용 회귀 검사 (EXPLAIN 기반)
+
+마이그레이션 적용 후 실행하면 주요 조회 쿼리의 실행 계획에 기대한 인덱스가 쓰이는지 확인한다.
+개발 DB는 데이터가 적어 플래너가 순차 스캔을 고르므로, enable_seqscan을 끄고
+"인덱스로 해당 조건을 처리할 수 있는가"를 검사한다. 실패한 항목이 있으면 종료 코드 1.
+
+    cd backend && uv run python scripts/explain_indexes.py
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from sqlalchemy import text  # noqa: E402
+from database import engine  # noqa: E402
+
+# (설명, 쿼리, 기대 인덱스)
+CHECKS = [
+    (
+        "좌석별 입실 중 기록 (kiosk.check_out, 좌석 목록)",
+        "SELECT * FROM seat_usage WHERE seat_id = 1 AND check_out_time IS NULL",
+        "uq_seat_usage_open_seat",
+    ),
+    (
+        "회원별 입실 중 기록 (kiosk.check_in)",
+        "SELECT * FROM seat_usage WHERE member_id = 3 AND check_out_time IS NULL",
+        "uq_seat_usage_open_member",
+    ),
+    (
+        "회원별 기간 이용 기록 (statics)",
+        "SELECT * FROM seat_usage WHERE member_id = 3 AND check_in_time >= now() - interval '30 days'",
+        "ix_seat_usage_member_checkin",
+    ),
+    (
+        "만료된 입실 기록 (auto_checkout_job)",
+        "SELECT * FROM seat_usage WHERE check_out_time IS NULL AND ticket_expired_time < localtimestamp",
+        "ix_seat_usage_open_expired",
+    ),
+    (
+        "좌석별 유효 고정석 주문",
+        "SELECT * FROM orders WHERE fixed_seat_id = 1 AND period_end_date > localtimestamp",
+        "ix_orders_fixed_seat_period",
+    ),
+    (
+        "회원별 유효 기간권 주문 (member_login)",
+        "SELECT * FROM orders WHERE member_id = 3 AND period_end_date > localtimestamp",
+        "ix_orders_member_period",
+    ),
+    (
+        "기간별 주문 (매출 통계)",
+        "SELECT * FROM orders WHERE created_at >= '2026-01-01' AND created_at < '2026-02-01'",
+        "ix_orders_created_at",
+    ),
+    (
+        "기간별 일일 매출 집계 (관리자 매출 통계)",
+        "SELECT * FROM daily_sales WHERE sales_date >= '2026-01-01' AND sales_date < '2026-02-01'",
+        "daily_sales_pkey",
+    ),
+    (
+        "회원별 진행 중 TODO",
+        "SELECT * FROM user_todos WHERE member_id = 3 AND is_achieved = false",
+        "ix_user_todos_member_achieved",
+    ),
+    (
+        "리프레시 토큰 검증",
+        "SELECT * FROM tokens WHERE token = 'x' AND is_revoked = false",
+        "ix_tokens_token",
+    ),
+    (
+        "최근 대화 기록 (planner)",
+        "SELECT * FROM ai_chat_logs WHERE member_id = 3 ORDER BY created_at DESC LIMIT 20",
+        "ix_ai_chat_logs_member_created",
+    ),
+    (
+        "일정 제목 벡터 검색 (planner)",
+        "SELECT event_id FROM schedule_events "
+        "ORDER BY title_embedding <=> array_fill(0.1::real, ARRAY[768])::vector LIMIT 40",
+        "ix_schedule_events_title_hnsw",
+    ),
+    (
+        "일정 설명 벡터 검색 (planner)",
+        "SELECT event_id FROM schedule_events "
+        "ORDER BY description_embedding <=> array_fill(0.1::real, ARRAY[768])::vector LIMIT 40",
+        "ix_schedule_events_desc_hnsw",
+    ),
+    (
+        "일정 제목 부분 일치 (planner 수정/삭제 대상)",
+        "SELECT * FROM schedule_events WHERE member_id = 3 AND title LIKE '%수학%'",
+        "ix_schedule_events_title_trgm",
+    ),
+    (
+        "일정 설명 트라이그램 검색 (planner 하이브리드 검색)",
+        "SELECT * FROM schedule_events WHERE description %> '영어 단어'",
+        "ix_schedule_events_desc_trgm",
+    ),
+]
+
+
+def used_indexes(plan: dict) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= used_indexes(child)
+    return names
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        for label, sql, expected in CHECKS:
+            with conn.begin():
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+                raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+                plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+
+            indexes = used_indexes(plan)
+            ok = expected in indexes
+            failures += 0 if ok else 1
+            print(f"[{'OK' if ok else 'FAIL'}] {label}: expected={expected} used={sorted(indexes) or '-'}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
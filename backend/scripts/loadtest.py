@@ -0,0 +1,73 @@
+"""
+간단한 HTTP 부하 테스트 (처리량 / 지연시간 비교용)
+
+동시 클라이언트 N개가 지정한 시간 동안 엔드포인트를 반복 호출하고
+초당 처리량(req/s)과 p50/p95/p99 지연시간을 출력한다.
+
+사용 예 (sync 버전과 async 버전을 각각 띄워 두고 같은 조건으로 비교):
+    uv run python scripts/loadtest.py --base-url http://localhost:8000 --clients 200 --duration 30 \
+        /api/kiosk/seats /api/kiosk/products /api/web/seat "/api/statics/times?member_id=3"
+
+쿠키 인증이 필요한 엔드포인트(/api/web/me)는 --cookie "access_token=..." 으로 전달한다.
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+import httpx
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+async def client_loop(client: httpx.AsyncClient, paths, deadline: float, latencies: list, errors: list):
+    for path in paths:
+        if time.perf_counter() >= deadline:
+            return
+        start = time.perf_counter()
+        try:
+            res = await client.get(path)
+            if res.status_code >= 400:
+                errors.append(res.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def run(base_url: str, paths: list, clients: int, duration: float, cookie: str = None):
+    headers = {"Cookie": cookie} if cookie else {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    latencies, errors = [], []
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            # 클라이언트마다 시작 엔드포인트를 다르게 해서 요청이 고르게 섞이도록 함
+            client_loop(client, itertools.islice(itertools.cycle(paths), i % len(paths), None), deadline, latencies, errors)
+            for i in range(clients)
+        ])
+        elapsed = time.perf_counter() - started
+
+    total = len(latencies)
+    print(f"clients={clients} duration={elapsed:.1f}s requests={total} errors={len(errors)}")
+    print(f"throughput: {total / elapsed:.1f} req/s")
+    if latencies:
+        print(
+            f"latency ms: mean={statistics.mean(latencies):.1f} "
+            f"p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} p99={percentile(latencies, 99):.1f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP 부하 테스트")
+    parser.add_argument("paths", nargs="+", help="호출할 경로 목록")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--cookie", default=None)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.base_url, args.paths, args.clients, args.duration, args.cookie))
@@ -0,0 +1,111 @@
+"""
+플래너 채팅 부하 중 키오스크 지연시간 비교
+
+1) 기준: 키오스크 클라이언트 N개가 --duration 동안 /api/kiosk/seats 를 반복 호출
+2) 부하: 같은 키오스크 트래픽 + 채팅 클라이언트 M개가 /api/web/plan/chat 을 계속 호출
+두 구간의 키오스크 p50/p95/p99와 채팅 처리 건수/지연시간을 출력한다.
+채팅이 이벤트 루프를 막지 않으면 두 구간의 키오스크 지연시간이 거의 같아야 한다.
+
+채팅 내용은 기본적으로 일정을 바꾸지 않는 질문이며 (AI 채팅 로그는 쌓인다),
+LLM 호출이 실제로 나가므로 테스트용 회원(--member-id)으로 실행한다.
+
+    cd backend && uv run python scripts/loadtest_planner.py --base-url http://localhost:8000 \
+        --kiosk-clients 50 --chat-clients 10 --duration 30 --member-id 3
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loadtest import percentile  # noqa: E402
+
+KIOSK_PATH = "/api/kiosk/seats"
+CHAT_PATH = "/api/web/plan/chat"
+DEFAULT_MESSAGES = ["지난주에 공부한 일정 알려줘", "안녕하세요", "가장 오래 공부한 날이 언제야?"]
+
+async def kiosk_loop(client: httpx.AsyncClient, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            res = await client.get(KIOSK_PATH)
+            if res.status_code >= 400:
+                errors.append(res.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def chat_loop(client: httpx.AsyncClient, deadline: float, member_id: int, messages: list,
+                    offset: int, latencies: list, errors: list):
+    i = offset
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            res = await client.post(CHAT_PATH, json={"member_id": member_id, "user_input": messages[i % len(messages)]})
+            if res.status_code >= 400:
+                errors.append(res.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - start) * 1000)
+        i += 1
+
+def summary(label: str, latencies: list, errors: list, elapsed: float) -> str:
+    if not latencies:
+        return f"{label:<14} requests=0 errors={len(errors)}"
+    return (
+        f"{label:<14} requests={len(latencies):>6} errors={len(errors):>4} "
+        f"rps={len(latencies) / elapsed:>7.1f} mean={statistics.mean(latencies):>8.1f} "
+        f"p50={percentile(latencies, 50):>8.1f} p95={percentile(latencies, 95):>8.1f} "
+        f"p99={percentile(latencies, 99):>8.1f}"
+    )
+
+async def phase(base_url: str, kiosk_clients: int, chat_clients: int, duration: float,
+                member_id: int, messages: list) -> tuple:
+    limits = httpx.Limits(max_connections=kiosk_clients + chat_clients,
+                          max_keepalive_connections=kiosk_clients + chat_clients)
+    kiosk_lat, kiosk_err, chat_lat, chat_err = [], [], [], []
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[kiosk_loop(client, deadline, kiosk_lat, kiosk_err) for _ in range(kiosk_clients)],
+            *[chat_loop(client, deadline, member_id, messages, i, chat_lat, chat_err) for i in range(chat_clients)],
+        )
+        elapsed = time.perf_counter() - started
+    return kiosk_lat, kiosk_err, chat_lat, chat_err, elapsed
+
+async def run(base_url: str, kiosk_clients: int, chat_clients: int, duration: float,
+              member_id: int, messages: list) -> int:
+    print(f"kiosk_clients={kiosk_clients} chat_clients={chat_clients} duration={duration:.0f}s (latency ms)")
+
+    kiosk_lat, kiosk_err, _, _, elapsed = await phase(base_url, kiosk_clients, 0, duration, member_id, messages)
+    print(summary("kiosk (base)", kiosk_lat, kiosk_err, elapsed))
+    base_p95 = percentile(kiosk_lat, 95)
+
+    kiosk_lat, kiosk_err, chat_lat, chat_err, elapsed = await phase(
+        base_url, kiosk_clients, chat_clients, duration, member_id, messages
+    )
+    print(summary("kiosk (+chat)", kiosk_lat, kiosk_err, elapsed))
+    print(summary("chat", chat_lat, chat_err, elapsed))
+
+    if base_p95:
+        print(f"kiosk p95 change under chat load: {percentile(kiosk_lat, 95) / base_p95:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="플래너 채팅 부하 중 키오스크 지연시간 비교")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--kiosk-clients", type=int, default=50)
+    parser.add_argument("--chat-clients", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--member-id", type=int, default=3)
+    parser.add_argument("--message", action="append", dest="messages", help="채팅 메시지 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.base_url, args.kiosk_clients, args.chat_clients, args.duration,
+                             args.member_id, args.messages or DEFAULT_MESSAGES)))
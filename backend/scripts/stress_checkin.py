@@ -0,0 +1,50 @@
+"""
+좌석 동시 입실 경합 스트레스 테스트
+
+여러 회원이 같은 좌석으로 동시에 입실을 요청했을 때 정확히 한 명만 성공하는지 확인한다.
+(시간제 잔여 시간이 있는 테스트 회원 전화번호가 필요, 자유석 seat_id 사용)
+종료 시 성공한 입실은 강제 퇴실 처리로 정리한다. 검증 실패 시 종료 코드 1.
+
+    uv run python scripts/stress_checkin.py --seat-id 35 --rounds 20 010-0000-0001 010-0000-0002 010-0000-0003
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter
+import httpx
+
+async def claim(client: httpx.AsyncClient, phone: str, seat_id: int):
+    res = await client.post("/api/kiosk/check-in", json={"phone": phone, "seat_id": seat_id})
+    return phone, res.status_code, res.json()
+
+async def run_round(client: httpx.AsyncClient, phones: list, seat_id: int) -> bool:
+    results = await asyncio.gather(*[claim(client, phone, seat_id) for phone in phones])
+    statuses = Counter(status for _, status, _ in results)
+    winners = [(phone, body) for phone, status, body in results if status == 200]
+
+    # 정리: 이긴 회원 강제 퇴실
+    for _, body in winners:
+        await client.post("/api/kiosk/check-out", json={"seat_id": body["seat_id"], "force": True})
+
+    ok = len(winners) == 1 and statuses[200] + statuses[400] + statuses[409] == len(phones)
+    print(f"[{'OK' if ok else 'FAIL'}] statuses={dict(statuses)} winner={winners[0][0] if winners else None}")
+    return ok
+
+async def main(base_url: str, phones: list, seat_id: int, rounds: int) -> int:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        failures = 0
+        for _ in range(rounds):
+            if not await run_round(client, phones, seat_id):
+                failures += 1
+    print(f"rounds={rounds} failures={failures}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="좌석 동시 입실 경합 테스트")
+    parser.add_argument("phones", nargs="+", help="테스트 회원 전화번호 (2개 이상)")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--seat-id", type=int, required=True)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.base_url, args.phones, args.seat_id, args.rounds)))
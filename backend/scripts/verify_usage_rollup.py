@@ -0,0 +1,83 @@
+"""
+일일 이용 집계(member_daily_usage) 정합성 검사
+
+원본 이용 기록을 컬럼 배열로 읽어 한 번에 다시 집계한 값과 집계 테이블을 비교한다.
+불일치한 (회원, 일자)가 있으면 출력하고 종료 코드 1. --fix를 주면 해당 범위를 재생성한다.
+
+    cd backend && uv run python scripts/verify_usage_rollup.py --days 30
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from models import MemberDailyUsage  # noqa: E402
+from utils.usage_rollup import load_session_columns, daily_rollup_from_columns, rebuild_usage_rollup  # noqa: E402
+
+FIELDS = ("session_count", "usage_minutes", "focus_minutes", "best_focus_minutes")
+
+
+def load_rollup(db, member_id, since) -> dict:
+    query = select(
+        MemberDailyUsage.member_id, MemberDailyUsage.usage_date, MemberDailyUsage.session_count,
+        MemberDailyUsage.usage_minutes, MemberDailyUsage.focus_minutes,
+        MemberDailyUsage.best_focus_minutes, MemberDailyUsage.hour_focus,
+    ).filter(MemberDailyUsage.usage_date >= since)
+    if member_id is not None:
+        query = query.filter(MemberDailyUsage.member_id == member_id)
+
+    result = {}
+    for mid, day, sessions, usage, focus, best, hours in db.execute(query):
+        result[(mid, day.toordinal())] = (sessions, usage, focus, best, np.array(hours, dtype=np.float64))
+    return result
+
+
+def main(days: int, member_id: int, fix: bool) -> int:
+    since = date.today() - timedelta(days=days)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        cols = load_session_columns(db, member_id=member_id, since=since)
+        expected = daily_rollup_from_columns(cols)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"원본 {cols['member_id'].size}건 → {expected['member_id'].size}개 (회원, 일자) 집계: {elapsed:.1f}ms")
+
+        actual = load_rollup(db, member_id, since)
+        mismatches = []
+        for i in range(expected["member_id"].size):
+            key = (int(expected["member_id"][i]), int(expected["day"][i]))
+            row = actual.pop(key, None)
+            values = tuple(expected[field][i] for field in FIELDS)
+            if row is None:
+                mismatches.append((key, "집계 없음"))
+            elif not (np.allclose(values, row[:4], atol=0.01) and np.allclose(expected["hour_focus"][i], row[4], atol=0.01)):
+                mismatches.append((key, f"expected={values} actual={row[:4]}"))
+        mismatches += [(key, "원본 없음") for key in actual]
+
+        for (mid, ordinal), reason in mismatches:
+            print(f"[FAIL] member_id={mid} date={date.fromordinal(ordinal)}: {reason}")
+        print(f"mismatches={len(mismatches)}")
+
+        if mismatches and fix:
+            rebuild_usage_rollup(db, member_id=member_id, since=since)
+            db.commit()
+            print("재생성 완료")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일일 이용 집계 정합성 검사")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--member-id", type=int, default=None)
+    parser.add_argument("--fix", action="store_true", help="불일치 시 해당 범위 재생성")
+    args = parser.parse_args()
+
+    sys.exit(main(args.days, args.member_id, args.fix))